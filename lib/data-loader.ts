@@ -14,6 +14,7 @@ export interface BenchmarkResult {
   description: string
   costPerTask?: number
   normalizedCost?: number
+  paretoDepth?: number
   scoreWeight: number
   costWeight: number
 }
@@ -134,6 +135,9 @@ export async function loadLLMData(): Promise<LLMData[]> {
           ...(hasCost ? { costPerTask: Number(result.cost) } : {}),
           ...(normalized !== undefined ? { normalizedCost: normalized } : {}),
           ...(normScore !== undefined ? { normalizedScore: normScore } : {}),
+          ...(result.pareto_depth !== undefined
+            ? { paretoDepth: result.pareto_depth }
+            : {}),
           scoreWeight: data.score_weight,
           costWeight: data.cost_weight,
         }
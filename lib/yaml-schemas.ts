@@ -25,6 +25,9 @@ export const BenchmarkFileSchema = z.object({
   model_name_mapping_file: z.string(),
   private_holdout: z.boolean(),
   cost_per_task: z.record(z.string(), z.number()).optional(),
+  normalization: z
+    .enum(["minmax", "percentile", "zscore", "robust", "elo"])
+    .optional(),
 })
 export type BenchmarkFile = z.infer<typeof BenchmarkFileSchema>
 
@@ -35,6 +38,7 @@ export const ProcessedBenchmarkFileSchema = z.record(
     normalized_score: z.number(),
     cost: z.number().optional(),
     normalized_cost: z.number().optional(),
+    pareto_depth: z.number().int().positive().optional(),
   }),
 )
 export type ProcessedBenchmarkFile = z.infer<
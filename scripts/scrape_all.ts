@@ -3,7 +3,7 @@ import { execSync } from "child_process"
 const scripts = [
   "scrape:livebench",
   "scrape:simplebench",
-  "scrape:lmarena-text",
+  "scrape:python",
   "scrape:arc-agi",
   "scrape:aider-polyglot",
   "scrape:hle",
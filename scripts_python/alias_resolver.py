@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+
+def _group_rows(keys: np.ndarray) -> Iterator[tuple[object, np.ndarray]]:
+    """Yield ``(key, row positions)`` for each distinct key, in first-seen order."""
+    codes, uniques = pd.factorize(keys)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    for i, key in enumerate(uniques):
+        yield key, order[bounds[i] : bounds[i + 1]]
+
+
+class AliasResolver:
+    """Hashed ``(mapping file, alias) -> slug`` index over all mapping files.
+
+    Built once from the frames returned by the mapping loaders (columns
+    ``alias``, ``slug`` and ``model_name_mapping_file``), it resolves whole
+    alias arrays with one vectorized hash lookup per mapping file instead of a
+    string merge per call. Mapping file names are used as given, so callers
+    must key benchmarks and mappings the same way (``process_data`` uses file
+    stems, ``update_mappings`` file names).
+    """
+
+    def __init__(self, mapping_df: pd.DataFrame) -> None:
+        mapping_df = mapping_df.drop_duplicates(
+            subset=["model_name_mapping_file", "alias"]
+        )
+        slugs = mapping_df["slug"].to_numpy(dtype=object)
+        # Unmapped entries (``null`` in YAML) resolve to ``None`` as well.
+        self.slugs = np.where(pd.isna(slugs), None, slugs)
+        aliases = mapping_df["alias"].to_numpy(dtype=object)
+        # One hashed alias index per mapping file, plus the position of each
+        # entry in ``self.slugs``.
+        self.files: Dict[object, tuple[pd.Index, np.ndarray]] = {
+            mapping_file: (pd.Index(aliases[rows]), rows)
+            for mapping_file, rows in _group_rows(
+                mapping_df["model_name_mapping_file"].to_numpy(dtype=object)
+            )
+        }
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[pd.DataFrame]) -> "AliasResolver":
+        frames = [df for df in frames if not df.empty]
+        if frames:
+            mapping_df = pd.concat(frames, ignore_index=True)
+        else:
+            mapping_df = pd.DataFrame(columns=["alias", "slug", "model_name_mapping_file"])
+        return cls(mapping_df)
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def positions(self, mapping_files: Iterable, aliases: Iterable) -> np.ndarray:
+        """Return the position of every pair in ``self.slugs``, ``-1`` if unknown."""
+        aliases = np.asarray(aliases, dtype=object)
+        pos = np.full(len(aliases), -1, dtype=np.intp)
+        for mapping_file, rows in _group_rows(np.asarray(mapping_files, dtype=object)):
+            if mapping_file not in self.files:
+                continue
+            index, entries = self.files[mapping_file]
+            found = index.get_indexer(aliases[rows])
+            pos[rows] = np.where(found >= 0, entries[found], -1)
+        return pos
+
+    def resolve(self, mapping_files: Iterable, aliases: Iterable) -> np.ndarray:
+        """Return the slug for every pair, ``None`` where unknown or unmapped."""
+        pos = self.positions(mapping_files, aliases)
+        out = np.full(len(pos), None, dtype=object)
+        found = pos >= 0
+        out[found] = self.slugs[pos[found]]
+        return out
+
+    def unmapped(self, mapping_files: Iterable, aliases: Iterable) -> Dict[str, List]:
+        """Return the aliases without a slug, grouped by mapping file."""
+        mapping_files = np.asarray(mapping_files, dtype=object)
+        aliases = np.asarray(aliases, dtype=object)
+        missing = pd.isna(self.resolve(mapping_files, aliases))
+        report: Dict[str, List] = {}
+        for mapping_file, alias in zip(mapping_files[missing], aliases[missing]):
+            report.setdefault(mapping_file, []).append(alias)
+        return report
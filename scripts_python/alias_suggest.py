@@ -0,0 +1,209 @@
+"""Slug suggestions for unmapped benchmark aliases.
+
+:class:`SlugIndex` is an inverted index from text features to the known names
+of every slug: the slug itself, its display name in ``data/config/models``
+and every alias already mapped to it. Features are character trigrams of the
+lowercased alphanumerics plus whole words (runs of letters or digits), so
+``claude-4-sonnet-20250514-thinking-64k`` still shares most of its features
+with ``claude-sonnet-4-thinking``. Each feature is weighted by its inverse
+document frequency, words twice as much as trigrams.
+
+A query looks up the posting list of each of its features and sums the
+matches per name with one ``np.bincount``. That gives the cosine similarity
+(0 to 1) of the feature vectors without comparing the alias to every known
+name. A slug scores as its best-matching name.
+
+Sibling models (``gpt-5`` and ``gpt-5-mini``, ``-thinking`` and
+``-nothinking``) are often nearly as similar as the right one, so the
+confidence of a suggestion is its lead over the runner-up slug rather than
+its similarity. An alias of a model missing from the configs can still
+lead clearly (``Qwen3-4B`` over ``qwen-3-235b-a22b``), so applied
+suggestions deserve a look in review.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from incremental import write_if_changed
+from yaml_io import dump_yaml, load_yaml
+
+LIMIT = 3
+WORD_WEIGHT = 2.0
+# Suggesting each mapped alias from all the others, about a third of them
+# reach this confidence and 98% of those get the right slug.
+MIN_CONFIDENCE = 0.35
+
+Ranked = List[tuple[str, float]]
+
+
+def features(text: str) -> List[str]:
+    """Return the distinct features of ``text``: trigrams and ``w:`` words.
+
+    Words are alphanumeric runs and their letter and digit parts, so ``30b``
+    matches neither ``235b`` nor ``4b`` but still shares ``b`` with both.
+    """
+    text = str(text).lower()
+    parts = re.findall(r"[a-z]+|\d+", text)
+    padded = "^" + "".join(parts) + "$"
+    grams = {padded[i : i + 3] for i in range(len(padded) - 2)}
+    words = set(parts) | set(re.findall(r"[a-z0-9]+", text))
+    return sorted(grams) + sorted(f"w:{word}" for word in words)
+
+
+def model_names(models_dir: Path) -> Dict[str, List[str]]:
+    """Return every slug in the model configs with its display name."""
+    names: Dict[str, List[str]] = {}
+    for path in sorted(models_dir.glob("*.yaml")):
+        efforts = (load_yaml(path) or {}).get("reasoning_efforts") or {}
+        for slug, display_name in efforts.items():
+            names.setdefault(slug, []).append(display_name)
+    return names
+
+
+class SlugIndex:
+    """Inverted feature index over the known names of each slug."""
+
+    def __init__(self, names: Dict[str, Iterable[str]]) -> None:
+        self.slugs = sorted(names)
+        docs: List[str] = []
+        doc_slugs: List[int] = []
+        for i, slug in enumerate(self.slugs):
+            for text in dict.fromkeys([slug, *names[slug]]):
+                if text:
+                    docs.append(text)
+                    doc_slugs.append(i)
+        self.doc_slugs = np.array(doc_slugs, dtype=np.intp)
+        # Names are grouped by slug, so a slug's best name is one reduceat.
+        self.slug_starts = np.searchsorted(self.doc_slugs, np.arange(len(self.slugs)))
+
+        doc_features = [features(text) for text in docs]
+        self.feature_ids: Dict[str, int] = {}
+        ids = np.array(
+            [
+                self.feature_ids.setdefault(f, len(self.feature_ids))
+                for feats in doc_features
+                for f in feats
+            ],
+            dtype=np.intp,
+        )
+        doc_ids = np.repeat(
+            np.arange(len(docs)), [len(feats) for feats in doc_features]
+        )
+        # Postings as one CSR array: documents of feature f are
+        # ``postings[starts[f]:starts[f + 1]]``.
+        order = np.argsort(ids, kind="stable")
+        self.postings = doc_ids[order]
+        counts = np.bincount(ids, minlength=len(self.feature_ids))
+        self.starts = np.concatenate([[0], np.cumsum(counts)])
+        # Smoothed IDF; a feature no name has gets the rarest possible weight.
+        self.idf = np.log1p(len(docs) / np.maximum(counts, 1))
+        self.idf[[f.startswith("w:") for f in self.feature_ids]] *= WORD_WEIGHT
+        self.unknown_idf = np.log1p(len(docs))
+        self.doc_norms = np.sqrt(
+            np.bincount(doc_ids, weights=self.idf[ids] ** 2, minlength=len(docs))
+        )
+
+    @classmethod
+    def build(
+        cls, models_dir: Path, mapping_frames: Iterable[pd.DataFrame]
+    ) -> "SlugIndex":
+        """Index the model configs and the mapped aliases of ``mapping_frames``."""
+        names = model_names(models_dir)
+        for df in mapping_frames:
+            mapped = df.dropna(subset=["slug"])
+            for slug, alias in zip(mapped["slug"], mapped["alias"]):
+                names.setdefault(slug, []).append(str(alias))
+        return cls(names)
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def suggest(self, alias: str, limit: int = LIMIT) -> Ranked:
+        """Return up to ``limit`` ``(slug, similarity)`` pairs, best first."""
+        if not self.slugs:
+            return []
+        known = []
+        unknown = 0
+        for f in features(alias):
+            fid = self.feature_ids.get(f)
+            if fid is None:
+                unknown += 1
+            else:
+                known.append(fid)
+        if not known:
+            return []
+        known = np.array(known, dtype=np.intp)
+        query_norm = np.sqrt(
+            (self.idf[known] ** 2).sum() + unknown * self.unknown_idf**2
+        )
+        lengths = self.starts[known + 1] - self.starts[known]
+        docs = np.concatenate(
+            [self.postings[self.starts[f] : self.starts[f + 1]] for f in known]
+        )
+        weights = np.repeat(self.idf[known] ** 2, lengths)
+        dots = np.bincount(docs, weights=weights, minlength=len(self.doc_norms))
+        scores = np.maximum.reduceat(dots / self.doc_norms, self.slug_starts)
+        scores /= query_norm
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.slugs[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+def confidence(ranked: Ranked) -> float:
+    """Return how far the top suggestion leads the runner-up."""
+    if not ranked:
+        return 0.0
+    return ranked[0][1] - (ranked[1][1] if len(ranked) > 1 else 0.0)
+
+
+def suggest_unmapped(
+    index: SlugIndex, unmapped: Dict[str, List], limit: int = LIMIT
+) -> Dict[str, Dict[str, Ranked]]:
+    """Return suggestions for ``unmapped`` aliases grouped by mapping file."""
+    return {
+        mapping_file: {alias: index.suggest(alias, limit) for alias in aliases}
+        for mapping_file, aliases in sorted(unmapped.items())
+    }
+
+
+def confident(
+    suggestions: Dict[str, Dict[str, Ranked]],
+    min_confidence: float = MIN_CONFIDENCE,
+) -> Dict[str, Dict[str, str]]:
+    """Return the top slug of every suggestion at or above ``min_confidence``."""
+    return {
+        mapping_file: {
+            alias: ranked[0][0]
+            for alias, ranked in by_alias.items()
+            if ranked and confidence(ranked) >= min_confidence
+        }
+        for mapping_file, by_alias in suggestions.items()
+    }
+
+
+def write_report(
+    path: Path,
+    suggestions: Dict[str, Dict[str, Ranked]],
+    applied: Optional[Dict[str, Dict[str, str]]] = None,
+) -> None:
+    """Write ``suggestions`` as YAML, noting the slugs that were ``applied``."""
+    applied = applied or {}
+    report = {}
+    for mapping_file, by_alias in suggestions.items():
+        entries = {}
+        for alias, ranked in by_alias.items():
+            entry = {
+                "confidence": round(confidence(ranked), 3),
+                "candidates": [
+                    {"slug": slug, "similarity": round(score, 3)}
+                    for slug, score in ranked
+                ],
+            }
+            if alias in applied.get(mapping_file, {}):
+                entry["applied"] = applied[mapping_file][alias]
+            entries[str(alias)] = entry
+        report[mapping_file] = entries
+    write_if_changed(path, dump_yaml(report, sort_keys=False))
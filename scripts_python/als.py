@@ -0,0 +1,280 @@
+"""Sparse, weighted alternating least squares over ``(row, col, value)`` triplets.
+
+Rows are benchmarks and columns model slugs: ``values[i] ≈ U[rows[i]] ·
+V[cols[i]]``. Each squared error is weighted by its row's weight. Every update
+is a few ``np.bincount`` calls over the observed triplets, so cost scales with
+the number of observations rather than with rows × columns.
+
+A factorization is only defined up to a scale per component (and, for rank
+above 1, a rotation). :func:`canonicalize` fixes that freedom, so a solve run
+to convergence gives the same factors whatever it started from. That is what
+makes :class:`AlsFactors` from a previous run a valid warm start.
+"""
+
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Ridge added to each rank-k normal equation, relative to the Gram trace. It
+# keeps slugs seen in fewer benchmarks than components solvable and lets
+# sparse rank-k solves converge instead of drifting along flat directions.
+RIDGE = 1e-3
+
+
+@dataclass
+class AlsFactors:
+    """Factors of a solve keyed by benchmark and slug, for warm starts.
+
+    ``benchmarks`` and ``slugs`` are frames with one column per component.
+    """
+
+    benchmarks: pd.DataFrame
+    slugs: pd.DataFrame
+
+    @property
+    def rank(self) -> int:
+        return self.benchmarks.shape[1]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["AlsFactors"]:
+        """Return the factors saved at ``path``, or ``None`` if unreadable."""
+        try:
+            factors = pickle.loads(path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        return factors if isinstance(factors, cls) else None
+
+
+@dataclass
+class AlsResult:
+    """Per-benchmark factors plus convergence diagnostics of the ALS solve."""
+
+    factors: pd.Series
+    iterations: int
+    residual: float
+    converged: bool
+    state: Optional[AlsFactors] = None
+
+
+def max_relative_change(new: np.ndarray, old: np.ndarray) -> float:
+    scale = np.maximum(np.abs(new), np.finfo(float).tiny)
+    return float(np.max(np.abs(new - old) / scale, initial=0.0))
+
+
+def als_rank1(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    values: np.ndarray,
+    row_weights: np.ndarray,
+    u: np.ndarray,
+    v: np.ndarray,
+    iterations: int,
+    tol: Optional[float],
+) -> tuple[np.ndarray, np.ndarray, int, bool]:
+    """Run weighted rank 1 ALS over COO triplets ``(rows, cols, values)``.
+
+    ``u`` and ``v`` are the starting factors and are updated in place. Entries
+    whose denominator vanishes keep their previous value, mirroring the dense
+    engine. Stops early once the largest relative change in ``u`` and ``v``
+    drops below ``tol``.
+    """
+
+    w = row_weights[rows]
+    wx = w * values
+    n_rows, n_cols = len(u), len(v)
+    done = 0
+    converged = False
+    for done in range(1, iterations + 1):
+        u_prev = u.copy()
+        v_prev = v.copy()
+
+        u_r = u[rows]
+        numerator_v = np.bincount(cols, weights=wx * u_r, minlength=n_cols)
+        denominator_v = np.bincount(cols, weights=w * u_r * u_r, minlength=n_cols)
+        np.divide(numerator_v, denominator_v, out=v, where=denominator_v != 0)
+
+        v_c = v[cols]
+        numerator_u = np.bincount(rows, weights=values * v_c, minlength=n_rows)
+        denominator_u = np.bincount(rows, weights=v_c * v_c, minlength=n_rows)
+        np.divide(numerator_u, denominator_u, out=u, where=denominator_u != 0)
+
+        if tol is not None:
+            if max_relative_change(u, u_prev) < tol and (
+                max_relative_change(v, v_prev) < tol
+            ):
+                converged = True
+                break
+    return u, v, done, converged
+
+
+def _solve(
+    targets: np.ndarray,
+    others: np.ndarray,
+    values: np.ndarray,
+    weights: np.ndarray,
+    other_factors: np.ndarray,
+    current: np.ndarray,
+    ridge: float = RIDGE,
+) -> np.ndarray:
+    """Solve the weighted least squares update for every target index.
+
+    Targets without any weighted observation keep their ``current`` value.
+    """
+
+    n, k = current.shape
+    b = other_factors[others]
+    wb = weights[:, None] * b
+    gram = np.empty((n, k, k))
+    for i in range(k):
+        for j in range(i, k):
+            gram[:, i, j] = gram[:, j, i] = np.bincount(
+                targets, weights=wb[:, i] * b[:, j], minlength=n
+            )
+    rhs = np.stack(
+        [np.bincount(targets, weights=wb[:, i] * values, minlength=n) for i in range(k)],
+        axis=1,
+    )
+    trace = np.trace(gram, axis1=1, axis2=2)
+    solvable = trace > 0
+    out = current.copy()
+    if solvable.any():
+        g = gram[solvable] + (ridge * trace[solvable] / k)[:, None, None] * np.eye(k)
+        out[solvable] = np.linalg.solve(g, rhs[solvable][..., None])[..., 0]
+    return out
+
+
+def als_rank_k(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    values: np.ndarray,
+    row_weights: np.ndarray,
+    u: np.ndarray,
+    v: np.ndarray,
+    iterations: int,
+    tol: Optional[float],
+) -> tuple[np.ndarray, np.ndarray, int, bool]:
+    """Rank-k counterpart of :func:`als_rank1` with ``(n, k)`` factor arrays.
+
+    Same objective: columns are solved with row-weighted errors, rows with
+    unweighted ones (a row's weight is constant across its own errors). The
+    factors themselves may drift by an invertible ``k × k`` transform without
+    changing the fit, so convergence is judged on the fitted values.
+    """
+
+    w = row_weights[rows]
+    ones = np.ones(len(values))
+    fitted = (u[rows] * v[cols]).sum(axis=1)
+    done = 0
+    converged = False
+    for done in range(1, iterations + 1):
+        v = _solve(cols, rows, values, w, u, v)
+        u = _solve(rows, cols, values, ones, v, u)
+        fitted_prev = fitted
+        fitted = (u[rows] * v[cols]).sum(axis=1)
+        if tol is not None and max_relative_change(fitted, fitted_prev) < tol:
+            converged = True
+            break
+    return u, v, done, converged
+
+
+def initial_factors(
+    row_keys: pd.Index,
+    col_keys: pd.Index,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    values: np.ndarray,
+    row_weights: np.ndarray,
+    rank: int = 1,
+    init: Optional[AlsFactors] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return starting ``(u, v)`` arrays of shape ``(n, rank)``.
+
+    Without ``init`` (or when its rank differs) this is the cold start: the
+    first component is 1.0, further components small fixed-seed noise to break
+    symmetry. Otherwise factors are looked up by benchmark and slug. New slugs
+    get one least squares update from the known benchmarks they appear in,
+    then new benchmarks one update from their (now known) slugs; anything
+    still unknown starts at the median of the known factors.
+    """
+
+    n, m = len(row_keys), len(col_keys)
+    rng = np.random.default_rng(0)
+    u = np.ones((n, rank))
+    v = np.ones((m, rank))
+    if rank > 1:
+        u[:, 1:] = 0.1 * rng.standard_normal((n, rank - 1))
+        v[:, 1:] = 0.1 * rng.standard_normal((m, rank - 1))
+    if init is None or init.rank != rank:
+        return u, v
+
+    u_prev = init.benchmarks.reindex(row_keys).to_numpy(dtype=float)
+    v_prev = init.slugs.reindex(col_keys).to_numpy(dtype=float)
+    known_u = ~np.isnan(u_prev).any(axis=1)
+    known_v = ~np.isnan(v_prev).any(axis=1)
+    if not known_u.any() and not known_v.any():
+        return u, v
+
+    w = row_weights[rows]
+    sel = known_u[rows] & ~known_v[cols]
+    filled = _solve(cols[sel], rows[sel], values[sel], w[sel], u_prev, v_prev)
+    known_v |= ~np.isnan(filled).any(axis=1)
+    v_prev = filled
+
+    sel = ~known_u[rows] & known_v[cols]
+    filled = _solve(
+        rows[sel], cols[sel], values[sel], np.ones(sel.sum()), v_prev, u_prev
+    )
+    known_u |= ~np.isnan(filled).any(axis=1)
+    u_prev = filled
+
+    for prev, known, default in ((u_prev, known_u, u), (v_prev, known_v, v)):
+        if known.any():
+            prev[~known] = np.median(prev[known], axis=0)
+        else:
+            prev[:] = default
+    return u_prev, v_prev
+
+
+def canonicalize(
+    u: np.ndarray, v: np.ndarray, row_weights: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fix the scale (and rotation) freedom of ``u @ v.T``.
+
+    For rank above 1 the components are rotated to orthogonal directions
+    ordered by strength, as in an SVD. Each component is then scaled so the
+    row-weighted geometric mean of ``|u|`` is 1, with the sign chosen so its
+    column factors sum to a positive value.
+    """
+
+    if u.shape[1] > 1:
+        qu, ru = np.linalg.qr(u)
+        qv, rv = np.linalg.qr(v)
+        p, s, qt = np.linalg.svd(ru @ rv.T)
+        u = qu @ p * s
+        v = qv @ qt.T
+
+    u = u.copy()
+    v = v.copy()
+    for j in range(u.shape[1]):
+        mag = np.abs(u[:, j])
+        keep = (mag > 0) & (row_weights > 0)
+        if keep.any():
+            scale = np.exp(np.average(np.log(mag[keep]), weights=row_weights[keep]))
+        else:
+            scale = 1.0
+        if v[:, j].sum() < 0:
+            scale = -scale
+        u[:, j] /= scale
+        v[:, j] *= scale
+    return u, v
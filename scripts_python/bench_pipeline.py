@@ -0,0 +1,191 @@
+"""Benchmark the data pipeline stages on synthetic corpora.
+
+Each run generates a corpus with :func:`synthetic_corpus.generate_corpus`,
+runs ``process_data.main`` on it with a :class:`StageTimer` in place of its
+profiler, so every stage it times is the real one, and then
+``update_mappings.update_all_mappings``. The YAML parse cache is disabled
+meanwhile, so every stage parses its files cold. Wall time and peak traced
+memory per stage are reported as JSON::
+
+    uv run bench_pipeline.py --size 100:1000 --size 1000:10000 -o bench.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import pandas as pd
+
+import process_data
+from benchmark_table import BenchmarkTable
+from profiling import Stage
+from synthetic_corpus import generate_corpus
+from update_mappings import update_all_mappings
+
+
+def _count_rows(result: Any) -> Optional[int]:
+    if isinstance(result, (pd.DataFrame, BenchmarkTable)):
+        return len(result)
+    if isinstance(result, list) and all(isinstance(f, pd.DataFrame) for f in result):
+        return sum(len(f) for f in result)
+    return None
+
+
+class StageTimer:
+    """Records the stages of a :class:`profiling.Profiler` run into ``stages``.
+
+    Tracing allocations slows pure-Python code down noticeably, so wall times
+    taken with ``trace_memory`` are only comparable with each other.
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Stage]:
+        handle = Stage()
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield handle
+        finally:
+            wall = time.perf_counter() - start
+            record: Dict[str, float] = {"wall_s": round(wall, 6)}
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                record["peak_mb"] = round(peak / 2**20, 3)
+            if handle.rows is not None:
+                record["rows"] = int(handle.rows)
+            self.stages[name] = record
+
+    def measure(self, name: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` as stage ``name`` and return its result."""
+        with self.stage(name) as stage:
+            result = fn()
+            stage.rows = _count_rows(result)
+        return result
+
+    def write(self) -> None:
+        """Nothing to write; the caller reads ``stages``."""
+
+
+@contextmanager
+def _environ(**overrides: str) -> Iterator[None]:
+    """Set environment variables for the duration of the block."""
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_pipeline(root: Path, trace_memory: bool = True) -> Dict[str, Dict[str, float]]:
+    """Time every pipeline stage against the corpus under ``root``."""
+
+    timer = StageTimer(trace_memory)
+    process_data.main(
+        root=root,
+        profiler=timer,
+        history_db=root / "data" / "history" / "scores.sqlite",
+    )
+    timer.measure(
+        "update_all_mappings",
+        lambda: update_all_mappings(
+            root / "data" / "raw" / "benchmarks", root / "data" / "config" / "mappings"
+        ),
+    )
+    return timer.stages
+
+
+def run_size(
+    n_benchmarks: int,
+    n_aliases: int,
+    seed: int = 0,
+    workdir: Optional[Path] = None,
+    trace_memory: bool = True,
+) -> Dict[str, Any]:
+    # Without the parse cache, update_all_mappings does not read the files
+    # process_data just cached, and the corpus adds no entries to it.
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp, _environ(YAML_CACHE_DIR=""):
+        root = Path(tmp)
+        start = time.perf_counter()
+        generate_corpus(root, n_benchmarks, n_aliases, seed=seed)
+        generate_s = time.perf_counter() - start
+        stages = run_pipeline(root, trace_memory)
+    return {
+        "benchmarks": n_benchmarks,
+        "aliases": n_aliases,
+        "seed": seed,
+        "generate_s": round(generate_s, 6),
+        "total_s": round(sum(s["wall_s"] for s in stages.values()), 6),
+        "stages": stages,
+    }
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    try:
+        benchmarks, aliases = value.split(":")
+        return int(benchmarks), int(aliases)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected BENCHMARKS:ALIASES, got {value!r}"
+        ) from None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        action="append",
+        help="corpus size as BENCHMARKS:ALIASES (repeatable, default 100:1000)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workdir", type=Path, help="where to create the temporary corpora"
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip tracemalloc so wall times are not inflated by tracing",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write the JSON report here instead of stdout"
+    )
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "runs": [
+            run_size(b, a, args.seed, args.workdir, not args.no_memory)
+            for b, a in (args.size or [(100, 1000)])
+        ],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
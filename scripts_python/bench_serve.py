@@ -0,0 +1,197 @@
+"""Load-test the query server in ``serve.py``.
+
+Starts a :class:`serve.QueryServer` over the repository's data on a free port
+(or targets ``--url``), sends a mix of typical queries over keep-alive
+connections and reports latency percentiles as JSON::
+
+    uv run bench_serve.py --requests 20000
+
+The mix cycles through every benchmark's top 10, its top 10 below the median
+``normalized_cost``, every model profile and every provider. One request in
+four revalidates with ``If-None-Match``. A first pass over all queries,
+reported as ``cold``, fills the server's response cache. The process exits
+with status 1 when the p99 of the measured requests exceeds ``--max-p99-ms``.
+
+In-process clients share the interpreter lock with the server, so with
+``--clients`` above 1 run ``serve.py`` separately and pass ``--url``.
+"""
+
+import argparse
+import http.client
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote, urlsplit
+
+from serve import DataIndex, QueryServer
+
+MAX_P99_MS = 1.0
+REVALIDATE_EVERY = 4
+
+
+def _get(conn: http.client.HTTPConnection, target: str) -> Any:
+    conn.request("GET", target)
+    response = conn.getresponse()
+    body = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"GET {target} returned {response.status}")
+    return json.loads(body)
+
+
+def query_mix(conn: http.client.HTTPConnection) -> List[str]:
+    """Return the request targets of one pass, discovered from the server."""
+    targets = []
+    slugs = set()
+    for name in _get(conn, "/benchmarks"):
+        path = f"/benchmarks/{quote(name)}"
+        rows = _get(conn, path)
+        slugs.update(row["slug"] for row in rows)
+        targets.append(f"{path}?top=10")
+        costs = [row["normalized_cost"] for row in rows if "normalized_cost" in row]
+        if costs:
+            targets.append(f"{path}?top=10&max_cost={statistics.median(costs):g}")
+    providers = set()
+    for slug in sorted(slugs):
+        targets.append(f"/models/{quote(slug)}")
+        providers.add(_get(conn, targets[-1]).get("provider"))
+    targets.extend(f"/providers/{quote(p)}" for p in sorted(providers - {None}))
+    return targets
+
+
+def run_client(
+    host: str, port: int, targets: List[str], start: int, count: int
+) -> List[float]:
+    """Send ``count`` requests cycling through ``targets``; return latencies (s)."""
+    conn = http.client.HTTPConnection(host, port)
+    etags: Dict[str, str] = {}
+    latencies = []
+    try:
+        for i in range(start, start + count):
+            target = targets[i % len(targets)]
+            headers = {}
+            if i % REVALIDATE_EVERY == 0 and target in etags:
+                headers["If-None-Match"] = etags[target]
+            begin = time.perf_counter()
+            conn.request("GET", target, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - begin)
+            if response.status not in (200, 304):
+                raise RuntimeError(f"GET {target} returned {response.status}")
+            etags[target] = response.getheader("ETag")
+    finally:
+        conn.close()
+    return latencies
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Return latency percentiles in milliseconds."""
+    ms = sorted(x * 1000 for x in latencies)
+
+    def pct(q: float) -> float:
+        return round(ms[min(len(ms) - 1, int(q * len(ms)))], 4)
+
+    return {
+        "requests": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def run(host: str, port: int, requests: int, clients: int) -> Dict[str, Any]:
+    """Measure a cold pass and then ``requests`` requests from ``clients`` threads."""
+    conn = http.client.HTTPConnection(host, port)
+    try:
+        targets = query_mix(conn)
+    finally:
+        conn.close()
+    cold = run_client(host, port, targets, 1, len(targets))
+
+    per_client = -(-requests // clients)
+    results: List[List[float]] = [[] for _ in range(clients)]
+
+    def client(i: int) -> None:
+        results[i] = run_client(host, port, targets, i * per_client, per_client)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = [x for r in results for x in r]
+    return {
+        "queries": len(targets),
+        "clients": clients,
+        "cold": summarize(cold),
+        "warm": {
+            **summarize(latencies),
+            "requests_per_s": round(len(latencies) / elapsed, 1),
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(__file__).resolve().parents[1],
+        help="repository checkout to serve (default: this one)",
+    )
+    parser.add_argument(
+        "--url", help="benchmark a running server instead, e.g. http://127.0.0.1:8765"
+    )
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument(
+        "--max-p99-ms",
+        type=float,
+        default=MAX_P99_MS,
+        help="fail when the p99 latency exceeds this (default %(default)s)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write the JSON report here instead of stdout"
+    )
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        index = DataIndex(args.root)
+        index.load()
+        server = QueryServer(index, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address[:2]
+    try:
+        report = {
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            **run(host, port, args.requests, args.clients),
+        }
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 1 if report["warm"]["p99_ms"] > args.max_p99_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Compact in-memory model of the raw benchmark files.
+
+A raw benchmark file holds per-model scores and costs plus a few constants
+(its mapping file and weights). :class:`BenchmarkData` keeps one file's values
+as float64 arrays and its constants once, instead of repeating them on every
+row. :class:`BenchmarkTable` stacks all files into ``rows``. That frame has
+one row per (benchmark, model), categorical ``benchmark`` and ``alias`` (or,
+once resolved, ``slug``) columns, and float64 ``score`` and ``cost``. The
+constants go in ``meta``, with one row per benchmark.
+
+Categorical columns store small integer codes into one shared array of
+names, so the frame stays a fraction of the size of its object-dtype
+equivalent. Grouping, sorting and factorizing also run on integers. Name
+categories are sorted, so sorting by codes orders rows exactly like sorting
+the strings.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from alias_resolver import AliasResolver
+from normalization import DEFAULT_METHOD, check_method
+from yaml_io import load_yaml
+
+META_COLUMNS = [
+    "model_name_mapping_file",
+    "score_weight",
+    "cost_weight",
+    "normalization",
+]
+
+
+def _weight(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _values(values: dict, aliases: List) -> np.ndarray:
+    """Return ``values`` as floats aligned to ``aliases``, NaN where absent.
+
+    Non-numeric values become NaN, like ``pd.to_numeric(errors="coerce")``.
+    """
+    out = np.full(len(aliases), np.nan)
+    if values:
+        numeric = pd.to_numeric(pd.Series(list(values.values())), errors="coerce")
+        position = {alias: i for i, alias in enumerate(aliases)}
+        out[[position[alias] for alias in values]] = numeric.to_numpy(dtype=float)
+    return out
+
+
+@dataclass
+class BenchmarkData:
+    """One raw benchmark file."""
+
+    name: str
+    model_name_mapping_file: str
+    score_weight: float
+    cost_weight: float
+    alias: np.ndarray
+    score: np.ndarray
+    cost: np.ndarray
+    normalization: str = DEFAULT_METHOD
+
+    def __len__(self) -> int:
+        return len(self.alias)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the file as one flat frame with the constants on every row."""
+        return pd.DataFrame(
+            {
+                "alias": self.alias,
+                "score": self.score,
+                "cost": self.cost,
+                "benchmark": self.name,
+                "cost_weight": self.cost_weight,
+                "score_weight": self.score_weight,
+                "model_name_mapping_file": self.model_name_mapping_file,
+            }
+        )
+
+
+def read_benchmark(file_path: Path) -> BenchmarkData:
+    """Parse a raw benchmark file.
+
+    Models are the union of the ``results`` and ``cost_per_task`` keys,
+    sorted by name, with NaN for a missing or non-numeric score or cost. An
+    unknown ``normalization`` (see :mod:`normalization`) raises ``ValueError``.
+    """
+    data = load_yaml(file_path)
+
+    if "model_name_mapping_file" not in data:
+        raise ValueError(f"model_name_mapping_file not found in {file_path}")
+
+    results = data.get("results", {})
+    cost_per_task = data.get("cost_per_task", {})
+    keys = set(results) | set(cost_per_task)
+    try:
+        aliases = sorted(keys)
+    except TypeError:
+        # Mixed key types, e.g. a model named by a bare YAML number.
+        aliases = sorted(keys, key=str)
+
+    return BenchmarkData(
+        name=file_path.stem,
+        model_name_mapping_file=Path(data["model_name_mapping_file"]).stem,
+        score_weight=_weight(data.get("score_weight", 1.0)),
+        cost_weight=_weight(data.get("cost_weight", 1.0)),
+        alias=np.array(aliases, dtype=object),
+        score=_values(results, aliases),
+        cost=_values(cost_per_task, aliases),
+        normalization=check_method(data.get("normalization", DEFAULT_METHOD)),
+    )
+
+
+@dataclass
+class BenchmarkTable:
+    """Rows of every benchmark plus per-benchmark ``meta``.
+
+    ``meta`` is indexed by ``benchmark`` (sorted) with :data:`META_COLUMNS`.
+    ``rows`` keeps input order and has ``benchmark``, ``alias`` or ``slug``,
+    ``score`` and ``cost`` columns.
+    """
+
+    meta: pd.DataFrame
+    rows: pd.DataFrame
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_benchmarks(cls, benchmarks: Iterable[BenchmarkData]) -> "BenchmarkTable":
+        """Stack ``benchmarks`` in the given order."""
+        benchmarks = list(benchmarks)
+        meta = pd.DataFrame(
+            [[getattr(b, col) for col in META_COLUMNS] for b in benchmarks],
+            index=pd.Index([b.name for b in benchmarks], name="benchmark"),
+            columns=META_COLUMNS,
+        ).sort_index()
+        lengths = [len(b) for b in benchmarks]
+        bench_codes = np.repeat(
+            meta.index.get_indexer([b.name for b in benchmarks]), lengths
+        )
+
+        def stack(column: str, dtype) -> np.ndarray:
+            if not benchmarks:
+                return np.empty(0, dtype=dtype)
+            return np.concatenate([getattr(b, column) for b in benchmarks])
+
+        alias_codes, aliases = pd.factorize(stack("alias", object))
+        rows = pd.DataFrame(
+            {
+                "benchmark": pd.Categorical.from_codes(bench_codes, meta.index),
+                "alias": pd.Categorical.from_codes(alias_codes, aliases),
+                "score": stack("score", float),
+                "cost": stack("cost", float),
+            }
+        )
+        return cls(meta, rows)
+
+    def resolve(self, resolver: AliasResolver) -> "BenchmarkTable":
+        """Replace aliases by their slugs, dropping rows without one.
+
+        Aliases are looked up in their benchmark's mapping file (by stem).
+        """
+        bench_codes = self.rows["benchmark"].cat.codes.to_numpy()
+        mapping_files = self.meta["model_name_mapping_file"].to_numpy(dtype=object)
+        pos = resolver.positions(
+            mapping_files[bench_codes], self.rows["alias"].to_numpy(dtype=object)
+        )
+        # Unmapped entries (``None``) get code -1 and are dropped with misses.
+        slug_codes, slugs = pd.factorize(resolver.slugs, sort=True)
+        codes = np.full(len(pos), -1, dtype=slug_codes.dtype)
+        found = pos >= 0
+        codes[found] = slug_codes[pos[found]]
+        keep = codes >= 0
+        rows = pd.DataFrame(
+            {
+                "benchmark": self.rows["benchmark"][keep].reset_index(drop=True),
+                "slug": pd.Categorical.from_codes(codes[keep], slugs),
+                "score": self.rows["score"].to_numpy()[keep],
+                "cost": self.rows["cost"].to_numpy()[keep],
+            }
+        )
+        return BenchmarkTable(self.meta, rows)
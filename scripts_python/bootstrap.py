@@ -0,0 +1,266 @@
+"""Bootstrap confidence intervals for the overall ranking.
+
+A model's overall score is a weighted mean over the benchmarks it was scored
+on (see :mod:`leaderboard`), so most of its uncertainty comes from which
+benchmarks happen to be in the suite. Each resample draws the benchmarks
+with replacement and recomputes every model's score and rank.
+
+Scores are normalized within a benchmark, so resampling whole benchmarks
+leaves them unchanged. A resample is just a vector of per-benchmark draw
+counts, and a chunk of resamples is one multinomial draw. The chunk's scores
+are then two matrix products with the dense slug × benchmark matrix,
+instead of a pandas pass per resample. Chunks can run in worker processes.
+Every chunk seeds its own generator from :class:`numpy.random.SeedSequence`,
+so results depend only on ``seed`` and not on how many workers ran them.
+
+Intervals are percentile intervals, and only the ends of each model's
+resample distribution decide them. A chunk is therefore cut down to its
+:func:`tail_size` lowest and highest scores and ranks per model, about
+``(1 - confidence) / 2`` of all resamples, and folded into the running
+:class:`Tails` as it arrives. Memory is proportional to the number of models
+times the chunk size plus twice the tail size, rather than times
+``resamples``, and the quantiles are still exact. A model none of whose benchmarks was
+drawn has no score in that resample and ranks below every scored model in
+it. Tied models share the better rank.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from parallel import parallel_imap
+
+RESAMPLES = 10_000
+CHUNK_SIZE = 1_000
+CONFIDENCE = 0.95
+SEED = 0
+
+
+@dataclass
+class ScoreMatrix:
+    """Dense slug × benchmark scores with a mask of the observed cells.
+
+    ``scores`` is 0 where ``observed`` is 0; ``weights`` holds each
+    benchmark's ``score_weight``.
+    """
+
+    slugs: pd.Index
+    scores: np.ndarray
+    observed: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_long(
+        cls,
+        long_df: pd.DataFrame,
+        score_weights: pd.Series,
+        full: Optional[np.ndarray] = None,
+    ) -> "ScoreMatrix":
+        """Build the matrix from the long output table.
+
+        Slugs and benchmarks are in sorted order. With ``full`` (an imputed
+        matrix in that order, see :func:`leaderboard.impute_scores`) every
+        cell counts as observed.
+        """
+        values = long_df["normalized_score"].to_numpy(dtype=float)
+        slug_codes, slugs = pd.factorize(long_df["slug"], sort=True)
+        bench_codes, benchmarks = pd.factorize(long_df["benchmark"], sort=True)
+        weights = score_weights.reindex(benchmarks).astype(float).fillna(1.0)
+        if full is not None:
+            return cls(pd.Index(slugs), full, np.ones_like(full), weights.to_numpy())
+        has = ~np.isnan(values)
+        shape = (len(slugs), len(benchmarks))
+        scores = np.zeros(shape)
+        observed = np.zeros(shape)
+        scores[slug_codes[has], bench_codes[has]] = values[has]
+        observed[slug_codes[has], bench_codes[has]] = 1.0
+        return cls(pd.Index(slugs), scores, observed, weights.to_numpy())
+
+
+def rank_rows(estimates: np.ndarray) -> np.ndarray:
+    """Rank each row's entries from 1 (highest), NaN last.
+
+    Equal entries share the best of their ranks, so the (unstable, much
+    faster) sort's order among ties does not matter.
+    """
+    keys = np.where(np.isnan(estimates), np.inf, -estimates)
+    order = np.argsort(keys, axis=1)
+    ordered = np.take_along_axis(keys, order, axis=1)
+    positions = np.broadcast_to(
+        np.arange(estimates.shape[1], dtype=np.int32), order.shape
+    )
+    # Position of the first entry of each run of equal keys.
+    first = np.where(
+        np.concatenate(
+            [np.ones((len(keys), 1), dtype=bool), ordered[:, 1:] != ordered[:, :-1]],
+            axis=1,
+        ),
+        positions,
+        0,
+    )
+    ranks = np.empty(estimates.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, np.maximum.accumulate(first, axis=1) + 1, axis=1)
+    return ranks
+
+
+def resample_chunk(
+    task: tuple[ScoreMatrix, np.random.SeedSequence, int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the scores and ranks of ``size`` resamples of ``matrix``.
+
+    ``task`` is ``(matrix, seed, size)``, bundled for
+    :func:`chunk_tails`. Both arrays have one row per resample.
+    """
+    matrix, seed, size = task
+    n_bench = len(matrix.weights)
+    counts = np.random.default_rng(seed).multinomial(
+        n_bench, np.full(n_bench, 1.0 / n_bench), size=size
+    )
+    drawn = counts * matrix.weights
+    total = drawn @ matrix.observed.T
+    sums = drawn @ (matrix.scores * matrix.observed).T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        estimates = np.where(total > 0, sums / total, np.nan)
+    return estimates, rank_rows(estimates)
+
+
+def tail_size(resamples: int, confidence: float = CONFIDENCE) -> int:
+    """Return how many resamples at either end decide a ``confidence`` interval.
+
+    A quantile interpolates between two neighbouring order statistics, so
+    this is one more than the index of the outer one.
+    """
+    alpha = (1 - confidence) / 2
+    return min(resamples, int(alpha * resamples) + 2)
+
+
+@dataclass
+class Tails:
+    """The ``size`` lowest and highest values of each column, NaN left out.
+
+    ``low`` and ``high`` have up to ``size`` rows in no particular order;
+    missing values pad ``low`` with ``inf`` and ``high`` with ``-inf``.
+    ``count`` is the number of values in each column.
+    """
+
+    low: np.ndarray
+    high: np.ndarray
+    count: np.ndarray
+
+    @classmethod
+    def of(cls, values: np.ndarray, size: int) -> "Tails":
+        """Return the tails of a resample × slug array."""
+        missing = np.isnan(values)
+        tails = cls(
+            np.where(missing, np.inf, values),
+            np.where(missing, -np.inf, values),
+            len(values) - missing.sum(axis=0),
+        )
+        return tails.trim(size)
+
+    def trim(self, size: int) -> "Tails":
+        """Return these tails cut down to ``size`` rows."""
+        if len(self.low) <= size:
+            return self
+        return Tails(
+            np.partition(self.low, size - 1, axis=0)[:size],
+            np.partition(self.high, -size, axis=0)[-size:],
+            self.count,
+        )
+
+    def merge(self, other: "Tails", size: int) -> "Tails":
+        """Return the tails of both sets of values together."""
+        return Tails(
+            np.concatenate([self.low, other.low]),
+            np.concatenate([self.high, other.high]),
+            self.count + other.count,
+        ).trim(size)
+
+    def quantile(self, q: float, method: str = "linear") -> np.ndarray:
+        """Return the ``q`` quantile of each column as :func:`numpy.nanquantile`.
+
+        ``method`` is ``"linear"``, ``"lower"`` or ``"higher"``. The order
+        statistics involved must lie in the tails, as they do for the ends of
+        the interval :func:`tail_size` was computed for.
+        """
+        if q <= 0.5:
+            values, offset = np.sort(self.low, axis=0), 0
+        else:
+            values, offset = np.sort(self.high, axis=0), len(self.high) - self.count
+        index = (self.count - 1) * q
+        below, above = np.floor(index), np.ceil(index)
+        columns = np.arange(values.shape[1])
+        last = len(values) - 1
+        a = values[np.clip(below + offset, 0, last).astype(np.intp), columns]
+        b = values[np.clip(above + offset, 0, last).astype(np.intp), columns]
+        if method == "lower":
+            result = a
+        elif method == "higher":
+            result = b
+        else:
+            t = index - below
+            with np.errstate(invalid="ignore"):
+                # Interpolated from the nearer end, as numpy does.
+                result = np.where(t < 0.5, a + (b - a) * t, b - (b - a) * (1 - t))
+        # Models never scored in any resample have no quantile.
+        return np.where(self.count > 0, result, np.nan)
+
+
+def chunk_tails(
+    task: tuple[ScoreMatrix, np.random.SeedSequence, int, int],
+) -> tuple[Tails, Tails]:
+    """Return the score and rank :class:`Tails` of one :func:`resample_chunk`.
+
+    ``task`` is ``(matrix, seed, size, tail_size)``, bundled for
+    :func:`parallel.parallel_imap`.
+    """
+    matrix, seed, size, keep = task
+    estimates, ranks = resample_chunk((matrix, seed, size))
+    return Tails.of(estimates, keep), Tails.of(ranks, keep)
+
+
+def bootstrap_intervals(
+    matrix: ScoreMatrix,
+    resamples: int = RESAMPLES,
+    confidence: float = CONFIDENCE,
+    seed: int = SEED,
+    jobs: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Return per-slug score and rank intervals.
+
+    The frame is indexed by slug with ``score_low``, ``score_high``,
+    ``rank_low`` and ``rank_high``. ``chunk_size`` resamples are drawn at a
+    time, ``jobs`` chunks in parallel (``0`` for one per CPU).
+    """
+    # Without benchmarks there is nothing to resample.
+    n_chunks = -(-resamples // chunk_size) if len(matrix.weights) else 0
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [min(chunk_size, resamples - i * chunk_size) for i in range(n_chunks)]
+    keep = tail_size(resamples, confidence)
+    tasks = zip([matrix] * n_chunks, seeds, sizes, [keep] * n_chunks)
+    scores = ranks = None
+    for chunk_scores, chunk_ranks in parallel_imap(chunk_tails, tasks, jobs):
+        if scores is None:
+            scores, ranks = chunk_scores, chunk_ranks
+        else:
+            scores = scores.merge(chunk_scores, keep)
+            ranks = ranks.merge(chunk_ranks, keep)
+
+    alpha = (1 - confidence) / 2
+    columns = {}
+    if scores is not None:
+        columns = {
+            "score_low": scores.quantile(alpha),
+            "score_high": scores.quantile(1 - alpha),
+            # Ranks are integers; keep interval ends on observed ranks.
+            "rank_low": ranks.quantile(alpha, "lower").astype(np.int32),
+            "rank_high": ranks.quantile(1 - alpha, "higher").astype(np.int32),
+        }
+    return pd.DataFrame(
+        columns,
+        index=matrix.slugs,
+        columns=["score_low", "score_high", "rank_low", "rank_high"],
+    )
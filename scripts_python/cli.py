@@ -0,0 +1,335 @@
+"""Single entry point for the Python pipeline scripts.
+
+Run from ``scripts_python``::
+
+    python -m cli process [--force] [-j N] [--parquet] [--als-warm-start]
+    python -m cli update-mappings [-j N]
+    python -m cli scrape [NAME ...] [--per-host N]
+    python -m cli scrape-lmarena
+    python -m cli check [FILE ...]
+
+Only the standard library is imported up front; pandas, numpy and the script
+modules are imported by the subcommand that needs them. ``process`` always
+keeps the incremental input manifest under ``.cache/process_data`` and, unless
+``--force`` is given, first compares the inputs and the options that shape the
+outputs against it. When nothing changed since the last run it exits before
+importing pandas. ``check`` runs the same comparison, without the options, and
+exits with status 1 when processed outputs are stale, or validates the given
+raw benchmark and mapping files without processing them.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from profiling import add_profile_arguments, profiler_from_args
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def input_paths(root: Path) -> Dict[str, List[Path]]:
+    """Return the files ``process_data`` reads, keyed like its frame cache."""
+    return {
+        "benchmarks": sorted((root / "data" / "raw" / "benchmarks").glob("*.yaml")),
+        "mappings": sorted((root / "data" / "config" / "mappings").glob("*.yaml")),
+        "models": sorted((root / "data" / "config" / "models").glob("*.yaml")),
+    }
+
+
+def stale_outputs(root: Path, settings: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Return why processed outputs are out of date; empty when they are not.
+
+    Inputs are compared with the manifest of the last incremental
+    ``process_data`` run, and so are ``settings`` (see
+    :func:`incremental.output_settings`) when given. Outputs are stale too
+    when one is missing or when a pipeline module changed after that run.
+    """
+    from incremental import stale_inputs, stale_settings
+
+    cache_dir = root / ".cache" / "process_data"
+    inputs = input_paths(root)
+    stale = stale_inputs(cache_dir, inputs)
+    if settings is not None:
+        stale.extend(stale_settings(cache_dir, settings))
+
+    out_dir = root / "data" / "processed" / "benchmarks"
+    expected = [out_dir / f"{path.stem}.yaml" for path in inputs["benchmarks"]]
+    expected.append(out_dir.parent / "snapshot.json")
+    expected.append(out_dir.parent / "leaderboard.json")
+    expected.append(out_dir.parent / "families.json")
+    if settings is not None and settings.get("parquet"):
+        expected.append(out_dir.parent / "snapshot.parquet")
+    stale.extend(
+        f"processed/{path.relative_to(out_dir.parent)}"
+        for path in expected
+        if not path.exists()
+    )
+
+    manifest = cache_dir / "manifest.json"
+    if manifest.exists():
+        built = manifest.stat().st_mtime_ns
+        stale.extend(
+            f"code/{path.name}"
+            for path in sorted(Path(__file__).resolve().parent.glob("*.py"))
+            if path.stat().st_mtime_ns > built
+        )
+    return stale
+
+
+def validate_file(path: Path, root: Path) -> List[str]:
+    """Return problems with a raw benchmark or mapping file, if any."""
+    from normalization import DEFAULT_METHOD, METHODS
+    from yaml_io import load_yaml
+
+    try:
+        data = load_yaml(path)
+    except Exception as e:
+        return [f"{path}: cannot parse YAML: {e}"]
+    if not isinstance(data, dict):
+        return [f"{path}: expected a mapping at the top level"]
+
+    errors = []
+    if "model_name_mapping_file" in data or path.parent.name == "benchmarks":
+        mapping_file = data.get("model_name_mapping_file")
+        if mapping_file is None:
+            errors.append(f"{path}: model_name_mapping_file not found")
+        elif not (root / "data" / "config" / "mappings" / mapping_file).exists():
+            errors.append(f"{path}: mapping file {mapping_file} does not exist")
+        if data.get("normalization", DEFAULT_METHOD) not in METHODS:
+            errors.append(
+                f"{path}: unknown normalization {data['normalization']!r}, "
+                f"expected one of {', '.join(METHODS)}"
+            )
+        for key in ("results", "cost_per_task"):
+            values = data.get(key, {})
+            if not isinstance(values, dict):
+                errors.append(f"{path}: {key} must be a mapping")
+                continue
+            bad = [
+                alias
+                for alias, value in values.items()
+                if value is not None
+                and (isinstance(value, bool) or not isinstance(value, (int, float)))
+            ]
+            if bad:
+                names = ", ".join(map(str, bad))
+                errors.append(f"{path}: non-numeric {key} for {names}")
+    else:
+        bad = [
+            alias
+            for alias, slug in data.items()
+            if slug is not None and not isinstance(slug, str)
+        ]
+        if bad:
+            names = ", ".join(map(str, bad))
+            errors.append(f"{path}: slugs must be strings or null: {names}")
+    return errors
+
+
+def cmd_process(args: argparse.Namespace) -> int:
+    from incremental import output_settings
+
+    if not args.force:
+        settings = output_settings(
+            args.impute_rank, args.bootstrap, args.parquet, args.als_warm_start
+        )
+        stale = stale_outputs(args.root, settings)
+        if not stale:
+            print("Processed outputs are up to date")
+            return 0
+        more = " ..." if len(stale) > 5 else ""
+        print(f"{len(stale)} stale inputs or outputs: {', '.join(stale[:5])}{more}")
+
+    import process_data
+
+    process_data.main(
+        incremental=True,
+        jobs=args.jobs,
+        parquet=args.parquet,
+        profiler=profiler_from_args("process_data", args),
+        als_warm_start=args.als_warm_start,
+        root=args.root,
+        history=not args.no_history,
+        history_db=args.history_db,
+        impute_rank=args.impute_rank,
+        resamples=args.bootstrap,
+    )
+    return 0
+
+
+def cmd_update_mappings(args: argparse.Namespace) -> int:
+    import update_mappings
+    from alias_suggest import MIN_CONFIDENCE
+
+    min_confidence = args.apply_suggestions
+    if min_confidence is True:
+        min_confidence = MIN_CONFIDENCE
+    update_mappings.main(
+        jobs=args.jobs,
+        profiler=profiler_from_args("update_mappings", args),
+        root=args.root,
+        min_confidence=min_confidence,
+    )
+    return 0
+
+
+def cmd_scrape(args: argparse.Namespace) -> int:
+    import scrape_runner
+
+    failed = scrape_runner.main(
+        args.names or None,
+        per_host=args.per_host,
+        profiler=profiler_from_args("scrape_runner", args),
+        root=args.root,
+    )
+    return 1 if failed else 0
+
+
+def cmd_scrape_lmarena(args: argparse.Namespace) -> int:
+    import scrape_lmarena_text
+
+    scrape_lmarena_text.main(
+        profiler=profiler_from_args("scrape_lmarena_text", args), root=args.root
+    )
+    return 0
+
+
+def cmd_check(args: argparse.Namespace) -> int:
+    if args.files:
+        errors = [
+            error for path in args.files for error in validate_file(path, args.root)
+        ]
+        for error in errors:
+            print(error)
+        if not errors:
+            print(f"{len(args.files)} files OK")
+        return 1 if errors else 0
+
+    stale = stale_outputs(args.root)
+    for item in stale:
+        print(f"stale: {item}")
+    if not stale:
+        print("Processed outputs are up to date")
+    return 1 if stale else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=ROOT,
+        help="repository checkout to operate on (default: this one)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    process = sub.add_parser(
+        "process", help="convert raw benchmarks into processed outputs"
+    )
+    process.add_argument(
+        "--force",
+        action="store_true",
+        help="process even when inputs are unchanged since the last run",
+    )
+    process.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for parsing and writing files (0: one per CPU)",
+    )
+    process.add_argument(
+        "--parquet",
+        action="store_true",
+        help="also write data/processed/snapshot.parquet (requires pyarrow)",
+    )
+    process.add_argument(
+        "--als-warm-start",
+        action="store_true",
+        help="solve cost factors to convergence, starting from the cached factors",
+    )
+    process.add_argument(
+        "--no-history",
+        action="store_true",
+        help="do not append this run to the score history",
+    )
+    process.add_argument(
+        "--history-db",
+        type=Path,
+        metavar="PATH",
+        help="score history database (default: $HISTORY_DB or "
+        "data/history/scores.sqlite)",
+    )
+    process.add_argument(
+        "--impute-rank",
+        type=int,
+        default=0,
+        metavar="K",
+        help="rank the leaderboard with missing scores imputed by a rank-K fit",
+    )
+    # Defaults taken from bootstrap and alias_suggest are resolved where they
+    # are used: importing those modules here would pull pandas into the
+    # up-to-date check.
+    process.add_argument(
+        "--bootstrap",
+        type=int,
+        metavar="N",
+        help="bootstrap resamples for leaderboard intervals, 0 to skip "
+        "(default bootstrap.RESAMPLES)",
+    )
+    add_profile_arguments(process)
+    process.set_defaults(func=cmd_process)
+
+    mappings = sub.add_parser(
+        "update-mappings", help="sync mapping files with the aliases used by benchmarks"
+    )
+    mappings.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for parsing and writing files (0: one per CPU)",
+    )
+    mappings.add_argument(
+        "--apply-suggestions",
+        type=float,
+        nargs="?",
+        const=True,
+        metavar="MIN",
+        help="map unmapped aliases to suggested slugs at least MIN confident "
+        "(default alias_suggest.MIN_CONFIDENCE)",
+    )
+    add_profile_arguments(mappings)
+    mappings.set_defaults(func=cmd_update_mappings)
+
+    scrape = sub.add_parser("scrape", help="run the Python scrapers concurrently")
+    scrape.add_argument("names", nargs="*", metavar="NAME", help="default: all")
+    scrape.add_argument(
+        "--per-host", type=int, default=4, help="concurrent requests per host"
+    )
+    add_profile_arguments(scrape)
+    scrape.set_defaults(func=cmd_scrape)
+
+    lmarena = sub.add_parser("scrape-lmarena", help="scrape LMArena text ratings")
+    add_profile_arguments(lmarena)
+    lmarena.set_defaults(func=cmd_scrape_lmarena)
+
+    check = sub.add_parser(
+        "check", help="exit 1 if processed outputs are stale, or validate FILEs"
+    )
+    check.add_argument("files", nargs="*", type=Path, metavar="FILE")
+    check.set_defaults(func=cmd_check)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.root = args.root.resolve()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
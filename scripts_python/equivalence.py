@@ -0,0 +1,429 @@
+"""Differential equivalence and performance-regression harness for process_data.
+
+``record`` runs a reference implementation of ``process_data`` and stores its
+complete ``data/processed/benchmarks`` output, with its wall time and peak
+memory, under ``.cache/equivalence``. ``check`` runs the working tree's
+implementation on the same inputs, diffs the outputs and compares the cost
+against the stored baseline::
+
+    uv run equivalence.py record --reference HEAD --corpus 500:20000
+    # ... optimize ...
+    uv run equivalence.py check
+
+The reference is the working tree or, with ``--reference``, any git revision
+(its ``scripts_python`` is extracted with ``git archive``). Inputs are the
+repository's ``data`` or, with ``--corpus``, a synthetic corpus (see
+:mod:`synthetic_corpus`) that ``check`` regenerates from the recorded size
+and seed. Every run copies the scripts and inputs into a fresh temporary
+root and runs ``process_data.py`` there in its own process, so the reference
+and the candidate do the same work from cold caches and the child's peak RSS
+is its own.
+
+Values are compared after rounding both sides to the four significant
+figures the processed files publish. Published values may differ by up to
+``--tolerance`` units of the fourth significant figure (default 1), so that
+float noise pushing a value across a rounding boundary is reported but not
+fatal. Anything else fails the check: a missing or extra benchmark, slug or
+field, a changed row order or a larger difference. The check also fails when
+the best wall time of ``--repeat`` runs is more than ``--max-slowdown``
+slower than the baseline, or when peak memory grows more than
+``--max-memory-growth``.
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from math import floor, log10
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from process_data import round_sig
+from yaml_io import parse_yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_DIR = Path(__file__).resolve().parent
+SNAPSHOT_DIR = ROOT / ".cache" / "equivalence"
+INPUT_DIRS = ["data/raw/benchmarks", "data/config/mappings", "data/config/models"]
+# Not passed on to the process_data.py runs.
+CHILD_ENV_DROPPED = ("YAML_CACHE_DIR", "PIPELINE_PROFILE", "PIPELINE_PROFILE_PSTATS")
+SIG_FIGS = 4
+TOLERANCE = 1.0
+MAX_SLOWDOWN = 0.25
+MAX_MEMORY_GROWTH = 0.10
+# Differences listed in the report; all of them are counted.
+MAX_REPORTED = 50
+
+Outputs = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def digit_difference(a: float, b: float, sig: int = SIG_FIGS) -> float:
+    """Return ``|a - b|`` in units of the last published digit of ``a``/``b``.
+
+    Both values are rounded to ``sig`` significant figures first.
+    """
+    a, b = round_sig(a, sig), round_sig(b, sig)
+    if a == b:
+        return 0.0
+    unit = 10.0 ** (floor(log10(max(abs(a), abs(b)))) - (sig - 1))
+    return abs(a - b) / unit
+
+
+def load_outputs(out_dir: Path) -> Outputs:
+    """Return every processed benchmark file in ``out_dir``, rows in file order."""
+    return {
+        path.stem: parse_yaml(path.read_text()) or {}
+        for path in sorted(out_dir.glob("*.yaml"))
+    }
+
+
+def compare_outputs(
+    reference: Outputs, candidate: Outputs, tolerance: float = TOLERANCE
+) -> Dict[str, Any]:
+    """Diff ``candidate`` against ``reference``.
+
+    The report counts compared ``rows`` and ``values``, the values that
+    differ ``within_tolerance``, and lists (up to :data:`MAX_REPORTED`)
+    ``differences``, each with ``benchmark``, ``slug``, ``field``, ``kind``
+    and both sides. ``equivalent`` is whether there were none.
+    """
+    differences: List[Dict[str, Any]] = []
+    counts = {"rows": 0, "values": 0, "within_tolerance": 0, "total_differences": 0}
+
+    def differ(kind: str, benchmark: str, slug=None, field=None, ref=None, cand=None):
+        counts["total_differences"] += 1
+        if len(differences) < MAX_REPORTED:
+            entry = {"kind": kind, "benchmark": benchmark}
+            if slug is not None:
+                entry["slug"] = slug
+            if field is not None:
+                entry["field"] = field
+            differences.append({**entry, "reference": ref, "candidate": cand})
+
+    for name in sorted(reference.keys() | candidate.keys()):
+        if name not in candidate:
+            differ("missing benchmark", name)
+            continue
+        if name not in reference:
+            differ("extra benchmark", name)
+            continue
+        ref_rows, cand_rows = reference[name], candidate[name]
+        shared = [slug for slug in ref_rows if slug in cand_rows]
+        cand_order = [slug for slug in cand_rows if slug in ref_rows]
+        if shared != cand_order:
+            # Report the first position where the row order diverges.
+            i = next(i for i, (a, b) in enumerate(zip(shared, cand_order)) if a != b)
+            differ("order", name, ref=shared[i], cand=cand_order[i])
+        for slug in sorted(ref_rows.keys() - cand_rows.keys()):
+            differ("missing row", name, slug)
+        for slug in sorted(cand_rows.keys() - ref_rows.keys()):
+            differ("extra row", name, slug)
+        for slug in shared:
+            counts["rows"] += 1
+            ref_values, cand_values = ref_rows[slug], cand_rows[slug]
+            for field in sorted(ref_values.keys() | cand_values.keys()):
+                ref, cand = ref_values.get(field), cand_values.get(field)
+                if field not in cand_values:
+                    differ("missing value", name, slug, field, ref, cand)
+                    continue
+                if field not in ref_values:
+                    differ("extra value", name, slug, field, ref, cand)
+                    continue
+                counts["values"] += 1
+                diff = digit_difference(float(ref), float(cand))
+                if diff == 0:
+                    continue
+                # Round-off can leave e.g. 2.0000000001 units; allow for it.
+                if diff <= tolerance + 1e-6:
+                    counts["within_tolerance"] += 1
+                else:
+                    differ("value", name, slug, field, ref, cand)
+    return {
+        "equivalent": counts["total_differences"] == 0,
+        **counts,
+        "differences": differences,
+    }
+
+
+def extract_scripts(dest: Path, revision: Optional[str] = None) -> None:
+    """Copy ``scripts_python`` into ``dest``, from ``revision`` if given."""
+    if revision is None:
+        shutil.copytree(
+            SCRIPT_DIR,
+            dest / "scripts_python",
+            ignore=shutil.ignore_patterns("__pycache__", "tests", ".venv"),
+        )
+        return
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", revision, "scripts_python"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    ).stdout
+    # Extraction filters only exist from Python 3.11.4 on.
+    kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest, **kwargs)
+
+
+def prepare_inputs(dest: Path, corpus: Optional[Dict[str, int]] = None) -> None:
+    """Write the pipeline inputs under ``dest``: repository data or a corpus."""
+    if corpus is not None:
+        from synthetic_corpus import generate_corpus
+
+        generate_corpus(
+            dest, corpus["benchmarks"], corpus["aliases"], seed=corpus["seed"]
+        )
+    else:
+        for rel in INPUT_DIRS:
+            if (ROOT / rel).is_dir():
+                shutil.copytree(ROOT / rel, dest / rel)
+    (dest / "data" / "processed" / "benchmarks").mkdir(parents=True, exist_ok=True)
+
+
+def _max_rss_mb(usage: resource.struct_rusage) -> float:
+    # ``ru_maxrss`` is in bytes on macOS and in kilobytes elsewhere.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_maxrss * scale / 2**20
+
+
+def run_once(
+    inputs: Path, scripts: Path, args: List[str]
+) -> tuple[float, float, Outputs]:
+    """Run ``process_data.py`` on a fresh copy of ``inputs``.
+
+    Returns the wall time in seconds, the peak RSS in MiB and the outputs.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        shutil.copytree(inputs / "data", root / "data")
+        shutil.copytree(scripts / "scripts_python", root / "scripts_python")
+        # Parse caches go under the temporary root, so every run starts cold,
+        # and so does the score history rather than the caller's database.
+        # Profiling would slow the child down and inflate its memory.
+        env = {
+            k: v
+            for k, v in os.environ.items()
+            if k not in CHILD_ENV_DROPPED
+        }
+        env["HISTORY_DB"] = str(root / "history.sqlite")
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "process_data.py", *args],
+            cwd=root / "scripts_python",
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        with proc.stderr:
+            stderr = proc.stderr.read()
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"process_data.py exited with {proc.returncode}:\n"
+                + stderr.decode(errors="replace")
+            )
+        outputs = load_outputs(root / "data" / "processed" / "benchmarks")
+    return wall, _max_rss_mb(usage), outputs
+
+
+def run_pipeline(
+    revision: Optional[str],
+    corpus: Optional[Dict[str, int]],
+    args: List[str],
+    repeat: int = 1,
+) -> Dict[str, Any]:
+    """Run the pipeline ``repeat`` times; return outputs and cost.
+
+    Wall time is the best of the runs, memory the largest peak RSS. The
+    outputs must not differ between runs.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs, scripts = Path(tmp) / "inputs", Path(tmp) / "scripts"
+        prepare_inputs(inputs, corpus)
+        extract_scripts(scripts, revision)
+        walls, rss = [], []
+        outputs = None
+        for _ in range(repeat):
+            wall, peak, run_outputs = run_once(inputs, scripts, args)
+            if outputs is not None and run_outputs != outputs:
+                raise RuntimeError("process_data.py output differs between runs")
+            outputs = run_outputs
+            walls.append(wall)
+            rss.append(peak)
+    return {
+        "outputs": outputs,
+        "wall_s": round(min(walls), 4),
+        "max_rss_mb": round(max(rss), 1),
+        "runs": repeat,
+    }
+
+
+def record(
+    snapshot_dir: Path,
+    revision: Optional[str] = None,
+    corpus: Optional[Dict[str, int]] = None,
+    args: Optional[List[str]] = None,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """Run the reference and store its outputs and baseline in ``snapshot_dir``."""
+    args = list(args or [])
+    result = run_pipeline(revision, corpus, args, repeat)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    (snapshot_dir / "outputs.json").write_text(
+        json.dumps(result["outputs"], indent=1) + "\n"
+    )
+    baseline = {
+        "reference": revision or "working tree",
+        "corpus": corpus,
+        "args": args,
+        "wall_s": result["wall_s"],
+        "max_rss_mb": result["max_rss_mb"],
+        "runs": result["runs"],
+    }
+    (snapshot_dir / "baseline.json").write_text(json.dumps(baseline, indent=2) + "\n")
+    return baseline
+
+
+def check(
+    snapshot_dir: Path,
+    tolerance: float = TOLERANCE,
+    max_slowdown: float = MAX_SLOWDOWN,
+    max_memory_growth: float = MAX_MEMORY_GROWTH,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """Run the working tree on the recorded inputs and compare with the snapshot.
+
+    ``passed`` in the returned report is whether the outputs are equivalent
+    and neither wall time nor memory regressed beyond the thresholds.
+    """
+    baseline = json.loads((snapshot_dir / "baseline.json").read_text())
+    reference = json.loads((snapshot_dir / "outputs.json").read_text())
+    result = run_pipeline(None, baseline["corpus"], baseline["args"], repeat)
+
+    slowdown = result["wall_s"] / baseline["wall_s"] - 1
+    growth = result["max_rss_mb"] / baseline["max_rss_mb"] - 1
+    outputs = compare_outputs(reference, result["outputs"], tolerance)
+    performance = {
+        "wall_s": result["wall_s"],
+        "baseline_wall_s": baseline["wall_s"],
+        "slowdown": round(slowdown, 4),
+        "max_rss_mb": result["max_rss_mb"],
+        "baseline_max_rss_mb": baseline["max_rss_mb"],
+        "memory_growth": round(growth, 4),
+        "time_regressed": slowdown > max_slowdown,
+        "memory_regressed": growth > max_memory_growth,
+    }
+    return {
+        "passed": outputs["equivalent"]
+        and not performance["time_regressed"]
+        and not performance["memory_regressed"],
+        "reference": baseline["reference"],
+        "corpus": baseline["corpus"],
+        "outputs": outputs,
+        "performance": performance,
+    }
+
+
+def parse_corpus(value: str) -> Dict[str, int]:
+    try:
+        benchmarks, aliases = value.split(":")
+        return {"benchmarks": int(benchmarks), "aliases": int(aliases)}
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected BENCHMARKS:ALIASES, got {value!r}"
+        ) from None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        default=SNAPSHOT_DIR,
+        help="where reference outputs and baselines live (default %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="pipeline runs to time; the fastest counts (default %(default)s)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="snapshot a reference implementation")
+    rec.add_argument(
+        "--reference", metavar="REV", help="git revision to run (default: working tree)"
+    )
+    rec.add_argument(
+        "--corpus",
+        type=parse_corpus,
+        metavar="BENCHMARKS:ALIASES",
+        help="run on a synthetic corpus of this size instead of the repository data",
+    )
+    rec.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    rec.add_argument(
+        "--args",
+        default="",
+        help="extra process_data.py arguments, e.g. '--bootstrap 0'; "
+        "check reuses them",
+    )
+
+    chk = sub.add_parser("check", help="diff the working tree against the snapshot")
+    chk.add_argument(
+        "--tolerance",
+        type=float,
+        default=TOLERANCE,
+        help="allowed difference in units of the last published digit "
+        "(default %(default)s)",
+    )
+    chk.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=MAX_SLOWDOWN,
+        help="fail above this relative wall-time increase (default %(default)s)",
+    )
+    chk.add_argument(
+        "--max-memory-growth",
+        type=float,
+        default=MAX_MEMORY_GROWTH,
+        help="fail above this relative peak-RSS increase (default %(default)s)",
+    )
+    chk.add_argument(
+        "-o", "--output", type=Path, help="write the JSON report here too"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        corpus = args.corpus and {**args.corpus, "seed": args.seed}
+        baseline = record(
+            args.snapshot_dir, args.reference, corpus, args.args.split(), args.repeat
+        )
+        print(json.dumps(baseline, indent=2))
+        return 0
+
+    report = check(
+        args.snapshot_dir,
+        args.tolerance,
+        args.max_slowdown,
+        args.max_memory_growth,
+        args.repeat,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
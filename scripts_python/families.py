@@ -0,0 +1,239 @@
+"""Reasoning-effort variants grouped into model families.
+
+A model config in ``data/config/models`` lists the slugs of one model at
+different reasoning efforts (``gpt-5-minimal`` ... ``gpt-5-high``), a
+*family* named after the file. :func:`read_model_config` turns each file into
+index rows with the slug's family, provider and effort. Efforts are ranked
+from 0 within the family by their slug suffix, from ``nothinking`` (or no
+suffix) through ``minimal``, ``low``, ``medium`` and ``high`` to
+``thinking``. If any suffix is not one of those, the family is ranked in
+file order instead.
+
+:func:`family_rollups` summarizes every family with more than one variant,
+per benchmark or overall, with a few grouped pandas operations over all rows
+instead of one lookup per model:
+
+``best`` / ``best_score``
+    The highest-scoring variant; the lower effort wins a tie.
+``cheapest`` / ``cheapest_score`` / ``cheapest_cost``
+    The cheapest variant with a cost among those scoring at least
+    ``near_best`` (95%) of ``best_score``.
+``effort_slope``
+    Least-squares slope of score over effort rank, i.e. the score gained
+    per step up in effort. Only with at least two scored efforts.
+``variants``
+    How many variants have a score.
+
+``process_data`` writes them to ``data/processed/families.json``.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+import pandas as pd
+
+from incremental import write_if_changed
+from yaml_io import load_yaml
+
+NEAR_BEST = 0.95
+SIG_FIGS = 4
+EFFORT_LEVELS = {
+    "": 0,
+    "nothinking": 0,
+    "minimal": 1,
+    "low": 2,
+    "medium": 3,
+    "high": 4,
+    "thinking": 5,
+}
+INDEX_COLUMNS = ["slug", "model", "provider", "effort", "effort_rank"]
+
+
+def read_model_config(path: Path) -> pd.DataFrame:
+    """Return one index row per reasoning-effort variant in a model config."""
+    data = load_yaml(path) or {}
+    slugs = list(data.get("reasoning_efforts") or {})
+    prefix = f"{path.stem}-"
+    efforts = [
+        slug[len(prefix) :] if slug.startswith(prefix) else "" for slug in slugs
+    ]
+    if all(e in EFFORT_LEVELS for e in efforts):
+        levels = [EFFORT_LEVELS[e] for e in efforts]
+    else:
+        levels = list(range(len(slugs)))
+    return pd.DataFrame(
+        {
+            "slug": slugs,
+            "model": path.stem,
+            "provider": data.get("provider"),
+            "effort": efforts,
+            # Dense rank, so a step is always one effort level up.
+            "effort_rank": pd.Series(levels, dtype=float).rank(method="dense") - 1,
+        },
+        columns=INDEX_COLUMNS,
+    ).astype({"effort_rank": int})
+
+
+def model_index(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate :func:`read_model_config` frames, sorted by family and effort."""
+    if not frames:
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    index = pd.concat(frames, ignore_index=True)
+    return index.sort_values(["model", "effort_rank", "slug"], ignore_index=True)
+
+
+def family_rollups(
+    df: pd.DataFrame,
+    index: pd.DataFrame,
+    score: str = "normalized_score",
+    cost: str = "normalized_cost",
+    by: Sequence[str] = ("benchmark",),
+    near_best: float = NEAR_BEST,
+) -> pd.DataFrame:
+    """Return the rollups of every multi-variant family.
+
+    The frame is indexed by ``model`` and the ``by`` columns. ``df`` holds
+    one row per slug (and ``by`` group) with ``score`` and ``cost`` columns,
+    e.g. the long output table, or the leaderboard with ``by=()``. Slugs not
+    in ``index`` are ignored.
+    """
+    keys = ["model", *by]
+    sizes = index["model"].value_counts()
+    families = index[index["model"].map(sizes) > 1]
+    rows = (
+        df[[*by, "slug", score, cost]]
+        .astype({col: object for col in [*by, "slug"]})
+        .rename(columns={score: "score", cost: "cost"})
+        .merge(families[["slug", "model", "effort_rank"]], on="slug")
+        .dropna(subset=["score"])
+    )
+
+    best = rows.sort_values(
+        [*keys, "score", "effort_rank"], ascending=[*[True] * len(keys), False, True]
+    ).drop_duplicates(keys)
+    top = rows.groupby(keys)["score"].transform("max")
+    eligible = rows[(rows["score"] >= near_best * top) & rows["cost"].notna()]
+    cheapest = eligible.sort_values(
+        [*keys, "cost", "score"], ascending=[*[True] * len(keys), True, False]
+    ).drop_duplicates(keys)
+
+    x = rows["effort_rank"].to_numpy(dtype=float)
+    y = rows["score"].to_numpy(dtype=float)
+    sums = (
+        rows[keys]
+        .assign(n=1.0, x=x, y=y, xx=x * x, xy=x * y)
+        .groupby(keys)[["n", "x", "y", "xx", "xy"]]
+        .sum()
+    )
+    # Effort ranks are small integers, so the denominator is exact.
+    denom = sums["n"] * sums["xx"] - sums["x"] ** 2
+    slope = (sums["n"] * sums["xy"] - sums["x"] * sums["y"]) / denom.where(denom > 0)
+
+    best = best.set_index(keys)
+    cheapest = cheapest.set_index(keys).reindex(sums.index)
+    return pd.DataFrame(
+        {
+            "best": best["slug"],
+            "best_score": best["score"],
+            "cheapest": cheapest["slug"],
+            "cheapest_score": cheapest["score"],
+            "cheapest_cost": cheapest["cost"],
+            "effort_slope": slope,
+            "variants": sums["n"].astype(int),
+        },
+        index=sums.index,
+    )
+
+
+def board_rollups(
+    board: pd.DataFrame, index: pd.DataFrame, near_best: float = NEAR_BEST
+) -> pd.DataFrame:
+    """Return overall rollups from a leaderboard, scored like its ranking.
+
+    ``board`` comes from :func:`leaderboard.aggregate_leaderboard`.
+    """
+    score = "imputed_score" if "imputed_score" in board else "average_score"
+    return family_rollups(board, index, score=score, by=(), near_best=near_best)
+
+
+def _records(rollups: pd.DataFrame) -> Dict[Any, Dict[str, Any]]:
+    # Imported here: process_data imports this module.
+    from process_data import round_sig_array
+
+    columns = {}
+    for col in rollups.columns:
+        values = rollups[col].to_numpy()
+        if values.dtype.kind == "f":
+            values = round_sig_array(values, SIG_FIGS)
+        columns[col] = values.tolist()
+    names = list(columns)
+    return {
+        key: {
+            # Missing values (NaN or None) are dropped.
+            k: v
+            for k, v in zip(names, values)
+            if v is not None and v == v
+        }
+        for key, values in zip(rollups.index, zip(*columns.values()))
+    }
+
+
+def families_bundle(
+    index: pd.DataFrame,
+    per_benchmark: pd.DataFrame,
+    overall: pd.DataFrame,
+    near_best: float = NEAR_BEST,
+) -> Dict[str, Any]:
+    """Return the JSON document for the rollups of :func:`family_rollups`.
+
+    ``per_benchmark`` is indexed by (model, benchmark), ``overall`` by model.
+    """
+    benchmarks: Dict[str, Dict[str, Any]] = {}
+    for (model, benchmark), record in _records(per_benchmark).items():
+        benchmarks.setdefault(model, {})[benchmark] = record
+    overall_records = _records(overall)
+
+    families = {}
+    for model, group in index.groupby("model", sort=True):
+        if len(group) < 2:
+            continue
+        family = {
+            "provider": group["provider"].iloc[0],
+            "variants": dict(zip(group["slug"], group["effort"])),
+        }
+        if model in overall_records:
+            family["overall"] = overall_records[model]
+        family["benchmarks"] = dict(sorted(benchmarks.get(model, {}).items()))
+        families[model] = {k: v for k, v in family.items() if v is not None}
+    return {"near_best": near_best, "families": families}
+
+
+def write_families(
+    bundle: Dict[str, Any], out_dir: Path, skip_unchanged: bool = False
+) -> bool:
+    """Write ``families.json`` to ``out_dir``; return whether it was written."""
+    text = json.dumps(bundle, indent=1, allow_nan=False) + "\n"
+    path = out_dir / "families.json"
+    if skip_unchanged:
+        return write_if_changed(path, text)
+    path.write_text(text)
+    return True
+
+
+def write_family_rollups(
+    long_df: pd.DataFrame,
+    board: pd.DataFrame,
+    index: pd.DataFrame,
+    out_dir: Path,
+    skip_unchanged: bool = False,
+    near_best: float = NEAR_BEST,
+) -> bool:
+    """Compute the per-benchmark and overall rollups and write them."""
+    bundle = families_bundle(
+        index,
+        family_rollups(long_df, index, near_best=near_best),
+        board_rollups(board, index, near_best),
+        near_best,
+    )
+    return write_families(bundle, out_dir, skip_unchanged)
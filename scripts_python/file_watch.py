@@ -0,0 +1,137 @@
+"""Change notification for directories of ``*.yaml`` files.
+
+:func:`create_watcher` returns an :class:`InotifyWatcher`, which reads Linux
+``inotify`` events through ``ctypes``, or where that is unavailable a
+:class:`PollingWatcher` comparing ``stat`` results. Both report changed paths
+from ``poll(timeout)``. Used by :mod:`watch` and :mod:`serve`; the module
+only needs the standard library, so the query server starts without loading
+the pipeline.
+"""
+
+import ctypes
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Set
+
+# Seconds of quiet after a change before a burst counts as finished.
+DEBOUNCE = 0.05
+POLL_INTERVAL = 0.2
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Report ``*.yaml`` files whose ``stat`` changed between directory scans."""
+
+    def __init__(self, dirs: Iterable[Path], interval: float = POLL_INTERVAL) -> None:
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self) -> Dict[Path, tuple[int, int]]:
+        state = {}
+        for directory in self.dirs:
+            for path in directory.glob("*.yaml"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self, timeout: float) -> Set[Path]:
+        """Return paths changed within ``timeout`` seconds (possibly none)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            changed = {
+                path
+                for path in state.keys() | self.state.keys()
+                if state.get(path) != self.state.get(path)
+            }
+            self.state = state
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Report ``*.yaml`` files written, moved or deleted, via Linux inotify."""
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+    def __init__(self, dirs: Iterable[Path]) -> None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        # Raises AttributeError on platforms without inotify.
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        self.fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+        for directory in dirs:
+            wd = add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, f"inotify_add_watch failed for {directory}")
+            self.dirs[wd] = Path(directory)
+
+    def poll(self, timeout: float) -> Set[Path]:
+        """Return paths changed within ``timeout`` seconds (possibly none)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        changed: Set[Path] = set()
+        if not ready:
+            return changed
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            changed |= self.parse(data)
+
+    def parse(self, data: bytes) -> Set[Path]:
+        """Return the paths named by a buffer of inotify events.
+
+        When the kernel's event queue overflowed (``IN_Q_OVERFLOW``, on
+        watch descriptor -1), events were lost, so every ``*.yaml`` file in
+        the watched directories is reported instead.
+        """
+        changed: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                for directory in self.dirs.values():
+                    changed.update(directory.glob("*.yaml"))
+            elif wd in self.dirs and name.endswith(b".yaml"):
+                changed.add(self.dirs[wd] / os.fsdecode(name))
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(dirs: Iterable[Path], polling: bool = False):
+    """Return an :class:`InotifyWatcher`, falling back to :class:`PollingWatcher`."""
+    dirs = list(dirs)
+    if not polling:
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(dirs)
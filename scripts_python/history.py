@@ -0,0 +1,259 @@
+"""Append-only history of processed scores.
+
+Every ``process_data`` run appends its long-format output (see
+:func:`process_data.build_long_output`) to a SQLite database, by default
+``data/history/scores.sqlite`` or the path in ``HISTORY_DB``. That directory
+is not committed, so a fresh checkout (e.g. in CI) should point
+``HISTORY_DB`` or ``--history-db`` at a persistent location. Only rows whose
+values changed since the latest recorded state of their ``(benchmark, slug)``
+pair are stored. A pair that disappears gets a tombstone row, so daily runs
+over mostly unchanged data add almost nothing. The table's primary key
+``(benchmark, slug, recorded_at)`` and an index on ``(slug, recorded_at)``
+serve the queries:
+
+``latest``
+    Current (or as-of) value of every pair.
+``delta_since``
+    Pairs added, removed or changed between a date and now.
+``trajectory``
+    Every recorded value of one slug, oldest first.
+
+Run ``python history.py {latest,delta,trajectory} ...`` for a CSV view.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from snapshot import VALUE_COLUMNS
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scores (
+    benchmark TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    {", ".join(f"{col} REAL" for col in VALUE_COLUMNS)},
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (benchmark, slug, recorded_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scores_slug ON scores (slug, recorded_at);
+"""
+
+Timestamp = Union[str, datetime]
+
+
+def default_path(root: Path = ROOT) -> Path:
+    """Return ``$HISTORY_DB`` if set, else the default database under ``root``."""
+    env = os.environ.get("HISTORY_DB")
+    if env:
+        return Path(env)
+    return root / "data" / "history" / "scores.sqlite"
+
+
+def format_timestamp(value: Optional[Timestamp] = None) -> str:
+    """Return ``value`` (default: now) as a sortable UTC ``...Z`` string.
+
+    Strings are parsed with :meth:`datetime.fromisoformat`, so plain dates
+    mean midnight UTC. Stamps have microseconds, so runs within the same
+    second do not overwrite each other's rows.
+    """
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class HistoryStore:
+    """SQLite-backed history of ``(benchmark, slug)`` values over time."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        if path is None:
+            path = default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            with self.conn:
+                # Stamps used to have whole seconds; give them microseconds
+                # so they keep sorting before later ones.
+                self.conn.execute(
+                    "UPDATE scores SET recorded_at = substr(recorded_at, 1, 19) "
+                    "|| '.000000Z' WHERE length(recorded_at) = 20"
+                )
+                self.conn.execute("PRAGMA user_version = 1")
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _query(self, sql: str, params=()) -> pd.DataFrame:
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        for col in VALUE_COLUMNS:
+            df[col] = df[col].astype(float)
+        return df
+
+    def append(self, df: pd.DataFrame, recorded_at: Optional[Timestamp] = None) -> int:
+        """Record the full current state in ``df`` and return the rows stored.
+
+        ``df`` has ``benchmark``, ``slug`` and the value columns. Pairs whose
+        values equal their latest recorded ones are skipped; pairs recorded
+        before but missing from ``df`` are marked removed.
+        """
+        stamp = format_timestamp(recorded_at)
+        current = df[["benchmark", "slug", *VALUE_COLUMNS]].drop_duplicates(
+            subset=["benchmark", "slug"]
+        )
+        previous = self.latest()
+        merged = current.merge(
+            previous[["benchmark", "slug", *VALUE_COLUMNS]],
+            on=["benchmark", "slug"],
+            how="outer",
+            suffixes=("", "_prev"),
+            indicator=True,
+        )
+
+        new = merged["_merge"] == "left_only"
+        gone = merged["_merge"] == "right_only"
+        now = merged[VALUE_COLUMNS].to_numpy(dtype=float)
+        before = merged[[f"{col}_prev" for col in VALUE_COLUMNS]].to_numpy(dtype=float)
+        same = (now == before) | (np.isnan(now) & np.isnan(before))
+        changed = (merged["_merge"] == "both") & ~same.all(axis=1)
+
+        keep = (new | changed | gone).to_numpy()
+        rows = merged[keep]
+        values = np.where(np.isnan(now), None, now)[keep]
+        records = [
+            (benchmark, slug, stamp, *vals, int(removed))
+            for benchmark, slug, vals, removed in zip(
+                rows["benchmark"], rows["slug"], values.tolist(), gone[keep]
+            )
+        ]
+        placeholders = ", ".join("?" * (len(VALUE_COLUMNS) + 4))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO scores VALUES ({placeholders})", records
+            )
+        return len(records)
+
+    def latest(
+        self, benchmark: Optional[str] = None, as_of: Optional[Timestamp] = None
+    ) -> pd.DataFrame:
+        """Return the latest value of every live pair, optionally as of a time."""
+        where = ["1"]
+        params: list = []
+        if as_of is not None:
+            where.append("recorded_at <= ?")
+            params.append(format_timestamp(as_of))
+        if benchmark is not None:
+            where.append("benchmark = ?")
+            params.append(benchmark)
+        return self._query(
+            f"""
+            SELECT s.benchmark, s.slug, s.recorded_at, {", ".join(VALUE_COLUMNS)}
+            FROM scores AS s
+            JOIN (
+                SELECT benchmark, slug, MAX(recorded_at) AS recorded_at
+                FROM scores
+                WHERE {" AND ".join(where)}
+                GROUP BY benchmark, slug
+            ) USING (benchmark, slug, recorded_at)
+            WHERE NOT s.removed
+            ORDER BY s.benchmark, s.slug
+            """,
+            params,
+        )
+
+    def delta_since(
+        self, since: Timestamp, benchmark: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Return pairs whose latest values differ from those as of ``since``.
+
+        One row per pair with ``<col>_before``/``<col>_after`` and
+        ``<col>_delta`` columns and a ``status`` of ``added``, ``removed`` or
+        ``changed``.
+        """
+        before = self.latest(benchmark, as_of=since)
+        after = self.latest(benchmark)
+        merged = before.drop(columns="recorded_at").merge(
+            after.drop(columns="recorded_at"),
+            on=["benchmark", "slug"],
+            how="outer",
+            suffixes=("_before", "_after"),
+            indicator=True,
+        )
+        b = merged[[f"{col}_before" for col in VALUE_COLUMNS]].to_numpy(dtype=float)
+        a = merged[[f"{col}_after" for col in VALUE_COLUMNS]].to_numpy(dtype=float)
+        same = ((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=1)
+        for i, col in enumerate(VALUE_COLUMNS):
+            merged[f"{col}_delta"] = a[:, i] - b[:, i]
+        merged["status"] = np.select(
+            [merged["_merge"] == "right_only", merged["_merge"] == "left_only"],
+            ["added", "removed"],
+            "changed",
+        )
+        merged = merged[~same | (merged["_merge"] != "both")].drop(columns="_merge")
+        return merged.sort_values(["benchmark", "slug"]).reset_index(drop=True)
+
+    def trajectory(self, slug: str, benchmark: Optional[str] = None) -> pd.DataFrame:
+        """Return every recorded value of ``slug``, oldest first per benchmark.
+
+        Removals show up as rows with ``removed`` set and no values.
+        """
+        sql = "SELECT * FROM scores WHERE slug = ?"
+        params: list = [slug]
+        if benchmark is not None:
+            sql += " AND benchmark = ?"
+            params.append(benchmark)
+        df = self._query(sql + " ORDER BY recorded_at, benchmark", params)
+        df["removed"] = df["removed"].astype(bool)
+        return df
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the processed score history.")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help="history database (default: $HISTORY_DB or data/history/scores.sqlite)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    latest = sub.add_parser("latest", help="latest value of every pair")
+    latest.add_argument("--benchmark")
+    latest.add_argument("--as-of", help="ISO date or time")
+    delta = sub.add_parser("delta", help="pairs changed since a date")
+    delta.add_argument("since", help="ISO date or time")
+    delta.add_argument("--benchmark")
+    trajectory = sub.add_parser("trajectory", help="history of one slug")
+    trajectory.add_argument("slug")
+    trajectory.add_argument("--benchmark")
+    args = parser.parse_args(argv)
+
+    with HistoryStore(args.db) as store:
+        if args.command == "latest":
+            df = store.latest(args.benchmark, args.as_of)
+        elif args.command == "delta":
+            df = store.delta_since(args.since, args.benchmark)
+        else:
+            df = store.trajectory(args.slug, args.benchmark)
+    df.to_csv(sys.stdout, index=False)
+
+
+if __name__ == "__main__":
+    main()
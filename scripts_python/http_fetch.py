@@ -0,0 +1,293 @@
+"""Shared asyncio HTTP fetching for the Python scrapers.
+
+:class:`AsyncFetcher` issues GET requests over pooled keep-alive
+``http.client`` connections. The blocking socket work runs in worker threads,
+so requests to different hosts (and up to ``per_host`` to the same host)
+overlap. Every successful response body is streamed into an on-disk cache,
+together with its ``ETag`` and ``Last-Modified`` validators. Later requests
+for the same URL are made conditional on them, and a ``304 Not Modified``
+reuses the cached body without downloading it again.
+
+Connection errors, ``429`` and ``5xx`` responses are retried with
+exponential backoff; redirects are followed. Every scraper caches into
+:func:`default_cache_dir`, so a URL is stored, and revalidated, once.
+"""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+TIMEOUT = 60
+RETRIES = 3
+BACKOFF = 0.5
+PER_HOST = 4
+CHUNK_SIZE = 1 << 20
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "all-the-benchmarks-scraper"
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def default_cache_dir(root: Path = ROOT) -> Path:
+    """Return the HTTP cache directory shared by the scrapers under ``root``."""
+    return root / ".cache" / "http"
+
+
+class FetchError(RuntimeError):
+    """A request failed with a non-success status after all retries."""
+
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"GET {url} failed with HTTP {status}")
+        self.url = url
+        self.status = status
+
+
+@dataclass
+class Response:
+    """A successful response whose body lives in the cache at ``path``."""
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    path: Path
+    from_cache: bool = False
+
+    def read(self) -> bytes:
+        return self.path.read_bytes()
+
+    def text(self) -> str:
+        return self.read().decode()
+
+    def json(self) -> Any:
+        return json.loads(self.read())
+
+
+class HttpCache:
+    """Response bodies and their validators stored under ``directory``.
+
+    Entries are named after the URL's hash unless the caller picks a name.
+    The body lives in ``<name>`` and its headers in ``<name>.headers.json``.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def paths(self, url: str, name: Optional[str] = None) -> Tuple[Path, Path]:
+        if name is None:
+            name = hashlib.sha256(url.encode()).hexdigest()[:32]
+        body = self.directory / name
+        return body, body.with_name(f"{name}.headers.json")
+
+    def lookup(self, url: str, name: Optional[str] = None) -> Optional[Response]:
+        """Return the cached response for ``url``, if a complete one exists."""
+        body, meta = self.paths(url, name)
+        if not body.exists():
+            return None
+        try:
+            headers = json.loads(meta.read_text())
+        except (OSError, ValueError):
+            return None
+        return Response(url, 200, headers, body, from_cache=True)
+
+    def validators(self, cached: Optional[Response]) -> Dict[str, str]:
+        """Return conditional request headers for a cached response."""
+        if cached is None:
+            return {}
+        headers = {}
+        if "etag" in cached.headers:
+            headers["If-None-Match"] = cached.headers["etag"]
+        if "last-modified" in cached.headers:
+            headers["If-Modified-Since"] = cached.headers["last-modified"]
+        return headers
+
+    def temp_path(self, url: str, name: Optional[str] = None) -> Path:
+        """Return a fresh file to download ``url`` into before :meth:`store`."""
+        body, _ = self.paths(url, name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(
+            prefix=f"{body.name}.", suffix=".part", dir=body.parent
+        )
+        os.close(fd)
+        return Path(tmp)
+
+    def store(
+        self, url: str, headers: Dict[str, str], tmp: Path, name: Optional[str] = None
+    ) -> Response:
+        """Move the downloaded body at ``tmp`` into place for ``url``."""
+        body, meta = self.paths(url, name)
+        os.replace(tmp, body)
+        meta.write_text(json.dumps(headers, indent=2, sort_keys=True))
+        return Response(url, 200, headers, body)
+
+
+class _HostPool:
+    """Idle keep-alive connections to one ``scheme://host:port``."""
+
+    def __init__(self, scheme: str, netloc: str, limit: int, timeout: float) -> None:
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.limit = asyncio.Semaphore(limit)
+        self.idle: List[http.client.HTTPConnection] = []
+
+    def acquire(self) -> http.client.HTTPConnection:
+        if self.idle:
+            return self.idle.pop()
+        cls = (
+            http.client.HTTPSConnection
+            if self.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        return cls(self.netloc, timeout=self.timeout)
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self) -> None:
+        for conn in self.idle:
+            conn.close()
+        self.idle.clear()
+
+
+def _exchange(
+    conn: http.client.HTTPConnection,
+    target: str,
+    headers: Dict[str, str],
+    tmp: Path,
+) -> Tuple[int, Dict[str, str], bool]:
+    """Send one GET on ``conn``; stream a ``200`` body into ``tmp``.
+
+    Any other body is read and dropped so the connection can be reused.
+    Returns the status, lower-cased headers and whether the connection is
+    still usable.
+    """
+    conn.request("GET", target, headers=headers)
+    resp = conn.getresponse()
+    if resp.status == 200:
+        with tmp.open("wb") as out:
+            shutil.copyfileobj(resp, out, CHUNK_SIZE)
+    else:
+        resp.read()
+    resp_headers = {key.lower(): value for key, value in resp.getheaders()}
+    return resp.status, resp_headers, not resp.will_close
+
+
+class AsyncFetcher:
+    """Pooled, cached GET requests; use as ``async with AsyncFetcher(dir)``.
+
+    At most ``per_host`` requests to one host run at a time, each on its own
+    connection; idle connections are kept open for reuse until the fetcher
+    is closed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        per_host: int = PER_HOST,
+        timeout: float = TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+    ) -> None:
+        self.cache = HttpCache(cache_dir)
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pools: Dict[Tuple[str, str], _HostPool] = {}
+        self.requests: Dict[str, int] = defaultdict(int)
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for pool in self.pools.values():
+            pool.close()
+
+    def _pool(self, scheme: str, netloc: str) -> _HostPool:
+        key = (scheme, netloc)
+        if key not in self.pools:
+            self.pools[key] = _HostPool(scheme, netloc, self.per_host, self.timeout)
+        return self.pools[key]
+
+    async def _get(
+        self, url: str, headers: Dict[str, str], tmp: Path
+    ) -> Tuple[int, Dict[str, str]]:
+        """GET ``url`` once through the pool, retrying on transient failures."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        pool = self._pool(parts.scheme, parts.netloc)
+        headers = {"User-Agent": USER_AGENT, **headers}
+
+        attempt = 0
+        while True:
+            async with pool.limit:
+                reused = bool(pool.idle)
+                conn = pool.acquire()
+                self.requests[parts.netloc] += 1
+                try:
+                    status, resp_headers, reusable = await asyncio.to_thread(
+                        _exchange, conn, target, headers, tmp
+                    )
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    if reused:
+                        # The server dropped an idle keep-alive connection.
+                        continue
+                    if attempt == self.retries:
+                        raise
+                    retry_after = ""
+                else:
+                    pool.release(conn, reusable)
+                    if status not in RETRY_STATUSES or attempt == self.retries:
+                        return status, resp_headers
+                    retry_after = resp_headers.get("retry-after", "")
+            delay = self.backoff * 2**attempt
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def fetch(self, url: str, name: Optional[str] = None) -> Response:
+        """Return the response for ``url``, revalidating any cached copy.
+
+        ``name`` picks the cache file name; by default it is derived from the
+        URL. Raises :class:`FetchError` on a final non-success status.
+        """
+        cached = self.cache.lookup(url, name)
+        headers = self.cache.validators(cached)
+        tmp = self.cache.temp_path(url, name)
+        target = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, resp_headers = await self._get(target, headers, tmp)
+                if status in REDIRECT_STATUSES and "location" in resp_headers:
+                    target = urljoin(target, resp_headers["location"])
+                    continue
+                break
+            if status == 304 and cached is not None:
+                return cached
+            if status != 200:
+                raise FetchError(url, status)
+            return self.cache.store(url, resp_headers, tmp, name)
+        finally:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,220 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from parallel import parallel_map
+
+MANIFEST_VERSION = 3
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of ``path``'s contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` to ``path`` unless the file already holds those bytes.
+
+    Returns ``True`` when the file was (re)written.
+    """
+    data = text.encode()
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def _load_manifest(manifest_path: Path) -> Dict[str, Any]:
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def read_manifest(manifest_path: Path) -> Dict[str, Dict]:
+    """Return the ``inputs`` of a :class:`FrameCache` manifest, ``{}`` if absent."""
+    return _load_manifest(manifest_path).get("inputs", {})
+
+
+def output_settings(
+    impute_rank: int = 0,
+    resamples: Optional[int] = None,
+    parquet: bool = False,
+    als_warm_start: bool = False,
+) -> Dict[str, Any]:
+    """Return the ``process_data`` options that change what it writes.
+
+    ``resamples`` is ``None`` for the default (``bootstrap.RESAMPLES``), so
+    this needs no import of the pipeline modules; a changed default shows up
+    as changed code instead.
+    """
+    return {
+        "impute_rank": impute_rank,
+        "resamples": resamples,
+        "parquet": parquet,
+        "als_warm_start": als_warm_start,
+    }
+
+
+def stale_settings(cache_dir: Path, settings: Dict[str, Any]) -> List[str]:
+    """Return ``settings/<name>`` for each of ``settings`` that the manifest
+    in ``cache_dir`` records differently, i.e. that the last run did not use.
+    """
+    previous = _load_manifest(cache_dir / "manifest.json").get("settings", {})
+    return [
+        f"settings/{name}"
+        for name, value in settings.items()
+        if name not in previous or previous[name] != value
+    ]
+
+
+def stale_inputs(cache_dir: Path, inputs: Dict[str, List[Path]]) -> List[str]:
+    """Return input keys that changed since the manifest in ``cache_dir``.
+
+    ``inputs`` maps each kind (as passed to :meth:`FrameCache.load`) to its
+    current files. New, removed and modified files are reported; files whose
+    stat differs but whose contents do not are not. Only the standard library
+    is used, so this is cheap enough to run before deciding to do any work.
+    """
+    previous = read_manifest(cache_dir / "manifest.json")
+    stale = []
+    current = set()
+    for kind, paths in inputs.items():
+        for path in paths:
+            key = f"{kind}/{path.name}"
+            current.add(key)
+            entry = previous.get(key)
+            if entry is None:
+                stale.append(key)
+                continue
+            stat = path.stat()
+            if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+            if file_digest(path) != entry["digest"]:
+                stale.append(key)
+    stale.extend(key for key in previous if key not in current)
+    return sorted(stale)
+
+
+class FrameCache:
+    """Content-hashed cache of parsed input frames.
+
+    A manifest in ``cache_dir`` records, for every input file seen on the last
+    run, its ``mtime``/``size`` and the SHA-256 of its contents. Files whose
+    stat matches the manifest are not even re-read; files whose contents hash
+    to a known digest reuse the pickled frame produced from those bytes.
+    Loaders may return any picklable object, not just frames.
+    """
+
+    def __init__(
+        self, cache_dir: Path, settings: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.cache_dir = cache_dir
+        # Stored with the manifest, see :func:`output_settings`.
+        self.settings = settings or {}
+        self.frame_dir = cache_dir / "frames"
+        self.manifest_path = cache_dir / "manifest.json"
+        self.previous: Dict[str, Dict] = read_manifest(self.manifest_path)
+        self.current: Dict[str, Dict] = {}
+        self.parsed: list[str] = []
+
+    def _digest(self, key: str, path: Path) -> str:
+        stat = path.stat()
+        entry = self.previous.get(key)
+        if (
+            entry is not None
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            digest = entry["digest"]
+        else:
+            digest = file_digest(path)
+        self.current[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": digest,
+        }
+        return digest
+
+    def _frame_path(self, key: str, digest: str) -> Path:
+        # Frames embed the file stem, so the key must cover name and content,
+        # and the version so that a change of loader output is not reused.
+        frame_key = hashlib.sha256(
+            f"{MANIFEST_VERSION}\0{key}\0{digest}".encode()
+        ).hexdigest()
+        return self.frame_dir / f"{frame_key}.pkl"
+
+    def load(
+        self, kind: str, path: Path, loader: Callable[[Path], Any]
+    ) -> Any:
+        """Return ``loader(path)``, reusing a cached frame when possible.
+
+        ``kind`` namespaces the cache (e.g. ``"benchmarks"``) so the same file
+        loaded by different loaders never shares an entry.
+        """
+        return self.load_many(kind, [path], loader)[0]
+
+    def load_many(
+        self,
+        kind: str,
+        paths: List[Path],
+        loader: Callable[[Path], Any],
+        jobs: int = 1,
+    ) -> List[Any]:
+        """Like :meth:`load` for several files, parsing misses with ``jobs`` workers."""
+        import pandas as pd
+
+        frame_paths = []
+        for path in paths:
+            key = f"{kind}/{path.name}"
+            frame_path = self._frame_path(key, self._digest(key, path))
+            self.current[key]["frame"] = frame_path.name
+            frame_paths.append(frame_path)
+
+        misses = [i for i, frame in enumerate(frame_paths) if not frame.exists()]
+        parsed = parallel_map(loader, [paths[i] for i in misses], jobs)
+        if misses:
+            self.frame_dir.mkdir(parents=True, exist_ok=True)
+        frames: Dict[int, Any] = {}
+        for i, df in zip(misses, parsed):
+            pd.to_pickle(df, frame_paths[i])
+            self.parsed.append(f"{kind}/{paths[i].name}")
+            frames[i] = df
+        return [
+            frames[i] if i in frames else pd.read_pickle(frame_path)
+            for i, frame_path in enumerate(frame_paths)
+        ]
+
+    def changed(self) -> list[str]:
+        """Return input keys that are new, modified or removed since last run."""
+        keys = set(self.previous) | set(self.current)
+        return sorted(
+            key
+            for key in keys
+            if self.previous.get(key, {}).get("digest")
+            != self.current.get(key, {}).get("digest")
+        )
+
+    def save(self) -> None:
+        """Persist the manifest and drop frames no longer referenced."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path.write_text(
+            json.dumps(
+                {
+                    "version": MANIFEST_VERSION,
+                    "inputs": self.current,
+                    "settings": self.settings,
+                },
+                indent=2,
+                sort_keys=True,
+            )
+        )
+        live = {entry["frame"] for entry in self.current.values() if "frame" in entry}
+        if self.frame_dir.exists():
+            for frame in self.frame_dir.glob("*.pkl"):
+                if frame.name not in live:
+                    frame.unlink()
@@ -0,0 +1,220 @@
+"""Precomputed overall leaderboard.
+
+``process_data`` writes the overall ranking to
+``data/processed/leaderboard.json``, so consumers do not have to average
+every model's benchmark results themselves. Scores come from
+:func:`process_data.build_long_output`, i.e. the rounded values in the
+processed files, and are averaged like the site's ``computeAverageScores``:
+
+``average_score``
+    Mean ``normalized_score`` over the benchmarks a model was scored on,
+    weighted by each benchmark's ``score_weight``; 0 without any score.
+``benchmarks`` / ``coverage``
+    How many benchmarks scored the model, and their share of the total
+    ``score_weight``.
+``normalized_cost`` / ``cost_benchmarks``
+    ``normalized_cost`` averaged with ``cost_weight``, and how many benchmarks
+    reported a cost.
+``imputed_score``
+    Only with ``impute_rank``: the weighted mean over *all* benchmarks, with
+    the missing scores predicted by a rank-k ALS fit (see :mod:`als`) of the
+    slug × benchmark score matrix and clipped to 0–100.
+``score_low`` / ``score_high`` / ``rank_low`` / ``rank_high``
+    Only with ``resamples``: bootstrap intervals of the ranking score and of
+    the rank, resampling benchmarks (see :mod:`bootstrap`).
+``pareto_depth``
+    Layer of the model's (``normalized_cost``, ranking score) point, 1 on the
+    cost–score Pareto frontier (see :mod:`pareto`); only for models with a
+    cost.
+
+Models are ranked by ``imputed_score`` when present, else ``average_score``,
+ties broken by slug. Everything is a handful of ``np.bincount`` calls over the
+long table, so the cost grows with the number of rows, not with a Python loop
+per model.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from als import als_rank_k, initial_factors
+from bootstrap import CONFIDENCE, SEED, ScoreMatrix, bootstrap_intervals
+from incremental import write_if_changed
+from pareto import depth_list, pareto_depth
+
+IMPUTE_ITERATIONS = 200
+IMPUTE_TOL = 1e-6
+SIG_FIGS = 4
+
+
+def _round_sig(values: np.ndarray) -> np.ndarray:
+    # Imported here: process_data imports this module.
+    from process_data import round_sig_array
+
+    return round_sig_array(values, SIG_FIGS)
+
+
+def _benchmark_weights(weights: pd.Series, benchmarks: pd.Index) -> np.ndarray:
+    # Benchmarks without a weight count once, as in the raw file default.
+    return weights.reindex(benchmarks).astype(float).fillna(1.0).to_numpy()
+
+
+def impute_scores(
+    bench_codes: np.ndarray,
+    slug_codes: np.ndarray,
+    scores: np.ndarray,
+    weights: np.ndarray,
+    n_slugs: int,
+    rank: int,
+) -> np.ndarray:
+    """Return the full ``(n_slugs, n_benchmarks)`` score matrix.
+
+    Observed cells keep their score; the others get the prediction of a
+    cold-started rank-``rank`` ALS fit, clipped to 0–100. Errors are weighted
+    by benchmark ``weights``, like the averages.
+    """
+    n_bench = len(weights)
+    rows = bench_codes.astype(np.intp)
+    cols = slug_codes.astype(np.intp)
+    u, v = initial_factors(
+        pd.RangeIndex(n_bench),
+        pd.RangeIndex(n_slugs),
+        rows,
+        cols,
+        scores,
+        weights,
+        rank=rank,
+    )
+    u, v, _, _ = als_rank_k(
+        rows, cols, scores, weights, u, v, IMPUTE_ITERATIONS, IMPUTE_TOL
+    )
+    full = np.clip(v @ u.T, 0.0, 100.0)
+    full[cols, rows] = scores
+    return full
+
+
+def aggregate_leaderboard(
+    long_df: pd.DataFrame,
+    score_weights: pd.Series,
+    cost_weights: pd.Series,
+    impute_rank: int = 0,
+    resamples: int = 0,
+    seed: int = SEED,
+    jobs: int = 1,
+) -> pd.DataFrame:
+    """Return one row per slug, in rank order.
+
+    ``long_df`` is the long-format output table; ``score_weights`` and
+    ``cost_weights`` are indexed by benchmark. Columns are ``slug``, ``rank``,
+    ``average_score``, ``benchmarks``, ``coverage``, ``normalized_cost``,
+    ``cost_benchmarks``, with ``impute_rank`` ``imputed_score`` and with
+    ``resamples`` the bootstrap interval columns, drawn from ``seed`` over
+    ``jobs`` processes, and last ``pareto_depth``. Values are not rounded.
+    """
+    slug_codes, slugs = pd.factorize(long_df["slug"], sort=True)
+    bench_codes, benchmarks = pd.factorize(long_df["benchmark"], sort=True)
+    n = len(slugs)
+    score_w = _benchmark_weights(score_weights, benchmarks)
+    cost_w = _benchmark_weights(cost_weights, benchmarks)
+
+    def weighted_mean(column: str, w: np.ndarray) -> tuple[np.ndarray, ...]:
+        values = long_df[column].to_numpy(dtype=float)
+        has = ~np.isnan(values)
+        codes = slug_codes[has]
+        row_w = w[bench_codes[has]]
+        total = np.bincount(codes, weights=row_w, minlength=n)
+        sums = np.bincount(codes, weights=row_w * values[has], minlength=n)
+        count = np.bincount(codes, minlength=n)
+        return sums / np.where(total != 0, total, 1.0), total, count
+
+    average, total, count = weighted_mean("normalized_score", score_w)
+    cost, _, cost_count = weighted_mean("normalized_cost", cost_w)
+    weight_sum = score_w.sum()
+    out = pd.DataFrame(
+        {
+            "slug": np.asarray(slugs, dtype=object),
+            "average_score": average,
+            "benchmarks": count,
+            "coverage": total / weight_sum if weight_sum else np.zeros(n),
+            "normalized_cost": np.where(cost_count > 0, cost, np.nan),
+            "cost_benchmarks": cost_count,
+        }
+    )
+    key = "average_score"
+    full = None
+    if impute_rank > 0:
+        scores = long_df["normalized_score"].to_numpy(dtype=float)
+        has = ~np.isnan(scores)
+        full = impute_scores(
+            bench_codes[has], slug_codes[has], scores[has], score_w, n, impute_rank
+        )
+        out["imputed_score"] = full @ score_w / (weight_sum or 1.0)
+        key = "imputed_score"
+    if resamples > 0:
+        matrix = ScoreMatrix.from_long(long_df, score_weights, full)
+        intervals = bootstrap_intervals(matrix, resamples, seed=seed, jobs=jobs)
+        for col in intervals.columns:
+            out[col] = intervals[col].to_numpy()
+    out["pareto_depth"] = pareto_depth(
+        out["normalized_cost"].to_numpy(), out[key].to_numpy()
+    )
+
+    # Stable sort of the slug-ordered frame: ties keep slug order.
+    out = out.sort_values(key, ascending=False, kind="stable", ignore_index=True)
+    out.insert(1, "rank", np.arange(1, n + 1))
+    return out
+
+
+def leaderboard_settings(
+    impute_rank: int = 0, resamples: int = 0, seed: int = SEED
+) -> Dict[str, Any]:
+    """Return the settings stored with a leaderboard built with these arguments."""
+    settings: Dict[str, Any] = {"impute_rank": impute_rank, "resamples": resamples}
+    if resamples > 0:
+        settings.update(confidence=CONFIDENCE, seed=seed)
+    return settings
+
+
+def leaderboard_bundle(
+    board: pd.DataFrame, settings: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Return ``board`` as the JSON document, rounding scores and costs.
+
+    ``settings`` (e.g. ``impute_rank``) are stored ahead of the models.
+    """
+    columns = {}
+    for col in board.columns:
+        values = board[col].to_numpy()
+        if col == "pareto_depth":
+            columns[col] = depth_list(values)
+            continue
+        if values.dtype.kind == "f":
+            values = _round_sig(values)
+        columns[col] = values.tolist()
+    names = list(columns)
+    models = [
+        # ``v == v`` is False only for NaN, which is dropped like in the YAML.
+        {k: v for k, v in zip(names, values) if v == v}
+        for values in zip(*(columns[name] for name in names))
+    ]
+    return {**(settings or {}), "models": models}
+
+
+def write_leaderboard(
+    board: pd.DataFrame,
+    out_dir: Path,
+    settings: Optional[Dict[str, Any]] = None,
+    skip_unchanged: bool = False,
+) -> bool:
+    """Write ``leaderboard.json`` to ``out_dir``; return whether it was written."""
+    bundle = leaderboard_bundle(board, settings)
+    text = json.dumps(bundle, indent=1, allow_nan=False) + "\n"
+    path = out_dir / "leaderboard.json"
+    if skip_unchanged:
+        return write_if_changed(path, text)
+    path.write_text(text)
+    return True
+
@@ -0,0 +1,237 @@
+"""Per-benchmark score normalization strategies.
+
+Every strategy maps a benchmark's raw scores onto 0–100, higher is better.
+A raw benchmark file picks one with its ``normalization`` key:
+
+``minmax`` (default)
+    Linear from the lowest (0) to the highest (100) score.
+``percentile``
+    Percentile rank: ``(rank - 1) / (n - 1) * 100`` with ties sharing their
+    average rank.
+``zscore``
+    ``100 * Phi((score - mean) / std)``, the normal CDF of the z-score, so an
+    outlier only saturates near 0 or 100 instead of squeezing everyone else.
+``robust``
+    Like ``zscore``, but centred on the median and scaled by the IQR (over
+    the IQR of a standard normal, so normally distributed scores map as with
+    ``zscore``).
+``elo``
+    Expected win probability against the benchmark's median model,
+    ``100 / (1 + 10 ** ((median - score) / 400))``, for Elo ratings such as
+    ``lmarena-text``.
+
+A benchmark whose scores are all equal gets 100 throughout, as min-max
+always did. Missing scores stay missing. :func:`normalize_scores` sorts all
+rows once by (benchmark, score). Quantiles and ranks of every benchmark come
+from that sort, extremes from ``np.fmin.reduceat`` and means from
+``np.bincount``, so the cost does not depend on how many benchmarks there
+are.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+METHODS = ("minmax", "percentile", "zscore", "robust", "elo")
+DEFAULT_METHOD = "minmax"
+ELO_SCALE = 400.0
+# Interquartile range of the standard normal distribution.
+NORMAL_IQR = 1.3489795003921634
+
+
+def check_method(method: str) -> str:
+    """Return ``method`` if it names a strategy, else raise ``ValueError``."""
+    if method not in METHODS:
+        raise ValueError(
+            f"Unknown normalization {method!r}; expected one of {', '.join(METHODS)}"
+        )
+    return method
+
+
+def normal_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF, accurate to about 1e-7.
+
+    Uses the Abramowitz and Stegun 7.1.26 approximation of ``erf``, which
+    avoids a per-element Python call to :func:`math.erf`.
+    """
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (
+        0.254829592
+        + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+class _Groups:
+    """Per-group statistics of ``scores`` grouped by ``codes``.
+
+    Only used with at least one row. The (group, score) sort behind
+    quantiles and ranks is made on first use, since min-max does not need it.
+    """
+
+    def __init__(self, codes: np.ndarray, scores: np.ndarray, n_groups: int) -> None:
+        self.codes = codes
+        self.scores = scores
+        # numpy radix-sorts 8 and 16 bit integers, far faster than timsort.
+        for dtype in (np.uint8, np.uint16):
+            if n_groups <= np.iinfo(dtype).max + 1:
+                self.keys = codes.astype(dtype)
+                break
+        else:
+            self.keys = codes
+        self.sizes = np.bincount(codes, minlength=n_groups)
+        self.start = np.cumsum(self.sizes) - self.sizes
+        self.count = np.bincount(codes[~np.isnan(scores)], minlength=n_groups)
+        self._order: Optional[np.ndarray] = None
+
+    @property
+    def order(self) -> np.ndarray:
+        """Rows sorted by group, then score, with NaN last within each group."""
+        if self._order is None:
+            # Two passes are much faster than ``np.lexsort`` on large inputs.
+            # The order among equal scores does not affect any statistic.
+            by_score = np.argsort(self.scores)
+            self._order = by_score[np.argsort(self.keys[by_score], kind="stable")]
+            self.sorted = self.scores[self._order]
+        return self._order
+
+    def extremes(self) -> tuple[np.ndarray, np.ndarray]:
+        """Per-group minimum and maximum, NaN for groups without scores."""
+        order = self._order
+        if order is None:
+            order = np.argsort(self.keys, kind="stable")
+        x = self.scores[order]
+        nonempty = self.sizes > 0
+        lo = np.full(len(self.sizes), np.nan)
+        hi = np.full(len(self.sizes), np.nan)
+        lo[nonempty] = np.fmin.reduceat(x, self.start[nonempty])
+        hi[nonempty] = np.fmax.reduceat(x, self.start[nonempty])
+        return lo, hi
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Per-group quantile with linear interpolation, NaN for empty groups."""
+        self.order
+        pos = q * np.maximum(self.count - 1, 0)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        # Empty groups may point past the end; their result is masked below.
+        last = len(self.sorted) - 1
+        low = self.sorted[np.minimum(self.start + lo, last)]
+        high = self.sorted[np.minimum(self.start + hi, last)]
+        with np.errstate(invalid="ignore"):
+            out = np.where(hi > lo, low + (high - low) * (pos - lo), low)
+        return np.where(self.count > 0, out, np.nan)
+
+    def mean_std(self) -> tuple[np.ndarray, np.ndarray]:
+        """Per-group mean and population standard deviation."""
+        valid = ~np.isnan(self.scores)
+        codes = self.codes[valid]
+        x = self.scores[valid]
+        n = len(self.count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(codes, weights=x, minlength=n) / self.count
+            dev = x - mean[codes]
+            var = np.bincount(codes, weights=dev * dev, minlength=n) / self.count
+        return mean, np.sqrt(var)
+
+    def average_rank(self) -> np.ndarray:
+        """Zero-based rank of each score within its group, ties averaged."""
+        order = self.order
+        codes = self.codes[order]
+        n = len(codes)
+        # Runs of equal scores; a new group always starts a new run.
+        new_run = np.ones(n, dtype=bool)
+        new_run[1:] = (codes[1:] != codes[:-1]) | (self.sorted[1:] != self.sorted[:-1])
+        starts = np.flatnonzero(new_run)
+        ends = np.append(starts[1:], n) - 1
+        average = (starts + ends) / 2.0 - self.start[codes[starts]]
+        ranks = np.empty(n)
+        ranks[order] = average[np.cumsum(new_run) - 1]
+        ranks[np.isnan(self.scores)] = np.nan
+        return ranks
+
+
+def normalize_scores(
+    codes: np.ndarray, scores: np.ndarray, methods: Sequence[str]
+) -> np.ndarray:
+    """Normalize ``scores`` within groups.
+
+    ``codes`` gives each row's group (``0 <= code < len(methods)``) and
+    ``methods`` the strategy per group.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    scores = np.asarray(scores, dtype=float)
+    method_codes = np.array(
+        [METHODS.index(check_method(m)) for m in methods], dtype=np.intp
+    )
+    out = np.full(len(scores), np.nan)
+    if not len(scores):
+        return out
+    groups = _Groups(codes, scores, len(method_codes))
+    row_method = method_codes[codes]
+    used = {METHODS[m] for m in np.unique(row_method)}
+
+    lo, hi = groups.extremes()
+    constant = (hi == lo)[codes]
+
+    def fill(method: str, values) -> None:
+        # Skip the row mask in the common case of a single strategy.
+        rows = slice(None) if len(used) == 1 else row_method == METHODS.index(method)
+        out[rows] = values(rows)
+
+    if "minmax" in used:
+        # Exactly the historical formula; a missing score in an all-equal
+        # benchmark also gets 100.
+        def minmax(rows):
+            low, high = lo[codes[rows]], hi[codes[rows]]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scaled = (scores[rows] - low) / (high - low) * 100
+            return np.where(high != low, scaled, 100.0)
+
+        fill("minmax", minmax)
+
+    if "percentile" in used:
+        ranks = groups.average_rank()
+        span = np.maximum(groups.count - 1, 1)[codes]
+        fill("percentile", lambda rows: ranks[rows] / span[rows] * 100)
+
+    if "zscore" in used:
+        mean, std = groups.mean_std()
+
+        def zscore(rows):
+            c = codes[rows]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                z = (scores[rows] - mean[c]) / std[c]
+            return 100 * normal_cdf(z)
+
+        fill("zscore", zscore)
+
+    if "robust" in used:
+        median = groups.quantile(0.5)
+        scale = (groups.quantile(0.75) - groups.quantile(0.25)) / NORMAL_IQR
+        # Fall back to the standard deviation when over half the scores tie.
+        scale = np.where(scale > 0, scale, groups.mean_std()[1])
+
+        def robust(rows):
+            c = codes[rows]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                z = (scores[rows] - median[c]) / scale[c]
+            return 100 * normal_cdf(z)
+
+        fill("robust", robust)
+
+    if "elo" in used:
+        median = groups.quantile(0.5)
+
+        def elo(rows):
+            diff = median[codes[rows]] - scores[rows]
+            return 100 / (1 + np.power(10.0, diff / ELO_SCALE))
+
+        fill("elo", elo)
+
+    # All-equal benchmarks score 100 whatever the strategy.
+    others = (row_method != METHODS.index("minmax")) & constant & ~np.isnan(scores)
+    out[others] = 100.0
+    return out
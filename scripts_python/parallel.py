@@ -0,0 +1,41 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Return the worker count for ``jobs``, where ``0`` means one per CPU."""
+    if jobs < 0:
+        raise ValueError(f"jobs must be >= 0, got {jobs}")
+    return jobs or os.cpu_count() or 1
+
+
+def parallel_imap(
+    fn: Callable[[T], R], items: Iterable[T], jobs: int = 1
+) -> Iterator[R]:
+    """Yield ``fn(item)`` for each item in order, optionally across processes.
+
+    Like :func:`parallel_map`, but results are handed over as they come in,
+    so a caller folding them need not hold them all at once.
+    """
+    items = list(items)
+    workers = min(resolve_jobs(jobs), len(items))
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, items, chunksize=chunksize)
+
+
+def parallel_map(fn: Callable[[T], R], items: Iterable[T], jobs: int = 1) -> List[R]:
+    """Return ``[fn(item) for item in items]``, optionally across processes.
+
+    Results keep the order of ``items`` regardless of which worker finishes
+    first, so callers get the same output as the serial path. ``fn`` must be
+    a module-level function so it can be pickled.
+    """
+    return list(parallel_imap(fn, items, jobs))
@@ -0,0 +1,64 @@
+"""Cost–score Pareto layers.
+
+A point dominates another when it costs no more and scores no less, and is
+strictly better in one of the two. The *depth* of a point is 1 on the Pareto
+frontier (no point dominates it) and otherwise one more than the deepest
+point dominating it, so peeling off the frontier repeatedly removes depth 1,
+then depth 2, and so on. Equal points share their depth.
+
+:func:`pareto_depth` sorts by cost and sweeps once, keeping the best score
+seen in each layer. Those scores decrease from layer to layer, so a point's
+layer is one binary search, and all layers take ``O(n log n)`` instead of
+comparing every pair of points.
+"""
+
+from bisect import bisect_right
+from typing import List, Optional
+
+import numpy as np
+
+
+def pareto_depth(
+    cost: np.ndarray, score: np.ndarray, groups: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Return the Pareto depth of each (``cost``, ``score``) point.
+
+    Lower cost and higher score are better. With ``groups`` (e.g. benchmark
+    codes) depths are computed within each group. Points missing a cost or
+    a score get NaN.
+    """
+    cost = np.asarray(cost, dtype=float)
+    score = np.asarray(score, dtype=float)
+    if groups is None:
+        groups = np.zeros(len(cost), dtype=np.intp)
+    depth = np.full(len(cost), np.nan)
+    rows = np.flatnonzero(~np.isnan(cost) & ~np.isnan(score))
+    # By group, then cost, best score first, so every point comes after all
+    # the points that dominate it.
+    rows = rows[np.lexsort((-score[rows], cost[rows], np.asarray(groups)[rows]))]
+
+    # Negated best score of each layer, increasing.
+    tails: List[float] = []
+    previous = None
+    for i in rows.tolist():
+        key = (groups[i], cost[i], score[i])
+        if previous is not None and key[0] != previous[0]:
+            tails = []
+        if key == previous:
+            depth[i] = layer + 1
+            continue
+        # The first layer whose best score is below this one does not
+        # dominate the point.
+        layer = bisect_right(tails, -score[i])
+        if layer == len(tails):
+            tails.append(-score[i])
+        else:
+            tails[layer] = -score[i]
+        depth[i] = layer + 1
+        previous = key
+    return depth
+
+
+def depth_list(depth: np.ndarray) -> list:
+    """Return ``depth`` as a list of ints, NaN where a point has none."""
+    return [d if d != d else int(d) for d in depth.tolist()]
@@ -1,48 +1,182 @@
+import argparse
+
 import pandas as pd
-import yaml
+from dataclasses import dataclass
 from pathlib import Path
 from math import log10, floor
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List
 
 import numpy as np
 
+from alias_resolver import AliasResolver
+from als import (
+    AlsFactors,
+    AlsResult,
+    als_rank1,
+    als_rank_k,
+    canonicalize,
+    initial_factors,
+)
+from benchmark_table import BenchmarkTable, read_benchmark
+from bootstrap import RESAMPLES
+from families import model_index, read_model_config, write_family_rollups
+from history import HistoryStore, default_path
+from incremental import FrameCache, output_settings, write_if_changed
+from leaderboard import aggregate_leaderboard, leaderboard_settings, write_leaderboard
+from normalization import DEFAULT_METHOD, normalize_scores
+from parallel import parallel_map
+from pareto import depth_list, pareto_depth
+from profiling import Profiler, add_profile_arguments, profiler_from_args
+from snapshot import write_snapshot
+from yaml_io import dump_yaml, load_yaml
+
+# Iteration cap and relative tolerance for converged (warm-start) ALS solves.
+ALS_MAX_ITERATIONS = 1000
+ALS_TOL = 1e-9
+
 def round_sig(x: float, sig: int) -> float:
     if x == 0:
         return 0
     return round(x, sig - 1 - floor(log10(abs(x))))
 
-def load_benchmark(file_path: Path) -> pd.DataFrame:
-    data = yaml.safe_load(file_path.read_text())
 
-    if "model_name_mapping_file" not in data:
-        raise ValueError(f"model_name_mapping_file not found in {file_path}")
+def round_sig_array(values: np.ndarray, sig: int) -> np.ndarray:
+    """Vectorized :func:`round_sig` returning bit-identical floats.
 
-    results = data.get("results", {})
-    results_df = pd.DataFrame(list(results.items()), columns=["alias", "score"])
-    results_df["score"] = pd.to_numeric(results_df["score"], errors="coerce")
-    cost_per_task = data.get("cost_per_task", {})
-    cost_df = pd.DataFrame(list(cost_per_task.items()), columns=["alias", "cost"])
-    cost_df["cost"] = pd.to_numeric(cost_df["cost"], errors="coerce")
+    Values are bucketed by decimal exponent and rounded with ``np.round`` per
+    bucket. ``np.round`` scales by a power of ten first, which can pick the
+    wrong side of a tie, so values that land within a hair of a rounding tie
+    or of a power of ten fall back to the exact scalar implementation. NaN and
+    infinities pass through unchanged.
+    """
 
-    df = pd.merge(results_df, cost_df, on="alias", how="outer")
-    df = df.drop_duplicates(subset=["alias"])
-    df["benchmark"] = file_path.stem
-    df["cost_weight"] = data.get("cost_weight", 1.0)
-    df["score_weight"] = data.get("score_weight", 1.0)
-    df["model_name_mapping_file"] = Path(data["model_name_mapping_file"]).stem
+    x = np.array(values, dtype=float)
+    x[x == 0] = 0.0  # like ``round_sig``, -0.0 becomes 0
+    todo = np.flatnonzero(np.isfinite(x) & (x != 0))
+    if not len(todo):
+        return x
+
+    xs = x[todo]
+    log = np.log10(np.abs(xs))
+    digits = sig - 1 - np.floor(log).astype(int)
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = np.abs(xs) * np.power(10.0, digits)
+        exact = (
+            (np.abs(log - np.round(log)) < 1e-9)
+            | (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+            | (np.abs(digits) > 22)
+        )
 
-    return df
+    rounded = np.empty_like(xs)
+    fast = ~exact
+    for d in np.unique(digits[fast]):
+        sel = fast & (digits == d)
+        rounded[sel] = np.round(xs[sel], d)
+    for i in np.flatnonzero(exact):
+        rounded[i] = round_sig(float(xs[i]), sig)
+    x[todo] = rounded
+    return x
+
+def load_benchmark(file_path: Path) -> pd.DataFrame:
+    """Return a raw benchmark file as one flat frame (see :func:`read_benchmark`)."""
+    return read_benchmark(file_path).to_frame()
 
 def load_mapping_file(file_path: Path) -> pd.DataFrame:
-    data = yaml.safe_load(file_path.read_text())
+    data = load_yaml(file_path)
     df = pd.DataFrame(list(data.items()), columns=["alias", "slug"])
     df["model_name_mapping_file"] = file_path.stem
     return df
 
+def compute_normalization_factors_sparse(
+    costs: pd.DataFrame,
+    weights: Optional[pd.Series] = None,
+    iterations: int = 20,
+    tol: Optional[float] = None,
+    rank: int = 1,
+    init: Optional[AlsFactors] = None,
+    canonical: bool = False,
+) -> AlsResult:
+    """Sparse counterpart of :func:`compute_normalization_factors`.
+
+    ``costs`` is a long frame with ``benchmark``, ``slug`` and ``cost`` columns
+    holding only observed cells. Benchmark and slug codes are computed once and
+    every iteration is a handful of ``np.bincount`` calls over the triplets, so
+    memory and time scale with the number of observations rather than with
+    benchmarks × slugs. With ``tol`` set, iteration stops once factors change
+    by less than ``tol`` (relative) and ``iterations`` becomes an upper bound.
+
+    ``init`` warm-starts the solve from a previous result's ``state`` (see
+    :func:`als.initial_factors` for how new benchmarks and slugs are seeded).
+    ``rank`` above 1 fits that many components with the same objective, mainly
+    to predict missing costs from ``state``; the factor is then taken from the
+    leading canonical component. ``canonical`` fixes the scale of the solution
+    (see :func:`als.canonicalize`) so that solves run to ``tol`` agree
+    regardless of their starting point. The defaults reproduce the published
+    numbers, which come from a cold start without it.
+    """
+
+    costs = costs.dropna(subset=["cost"])
+    if costs.empty:
+        return AlsResult(pd.Series(dtype=float), 0, 0.0, True)
+    if rank < 1:
+        raise ValueError(f"ALS rank must be at least 1, got {rank}")
+
+    # Categorical columns factorize from their codes; the names are plain.
+    row_codes, benchmarks = pd.factorize(costs["benchmark"], sort=True)
+    col_codes, slugs = pd.factorize(costs["slug"], sort=True)
+    benchmarks = np.asarray(benchmarks, dtype=object)
+    slugs = np.asarray(slugs, dtype=object)
+    values = costs["cost"].to_numpy(dtype=float)
+    if weights is None:
+        row_weights = np.ones(len(benchmarks))
+    else:
+        row_weights = weights.reindex(benchmarks).fillna(1.0).to_numpy(dtype=float)
+
+    u, v = initial_factors(
+        benchmarks, slugs, row_codes, col_codes, values, row_weights, rank, init
+    )
+    if rank == 1:
+        u1, v1, done, converged = als_rank1(
+            row_codes, col_codes, values, row_weights, u[:, 0], v[:, 0], iterations, tol
+        )
+        u, v = u1[:, None], v1[:, None]
+    else:
+        u, v, done, converged = als_rank_k(
+            row_codes, col_codes, values, row_weights, u, v, iterations, tol
+        )
+    bench_index = pd.Index(benchmarks, name="benchmark")
+    # The raw factors are kept as the warm-start state: canonicalizing moves
+    # rank-k factors off the ridge-regularized solution.
+    state = AlsFactors(
+        pd.DataFrame(u, index=bench_index),
+        pd.DataFrame(v, index=pd.Index(slugs, name="slug")),
+    )
+    if canonical:
+        u, v = canonicalize(u, v, row_weights)
+
+    error = values - (u[row_codes] * v[col_codes]).sum(axis=1)
+    w = row_weights[row_codes]
+    total_weight = w.sum()
+    residual = (
+        float(np.sqrt((w * error * error).sum() / total_weight))
+        if total_weight
+        else 0.0
+    )
+
+    lead = u[:, 0]
+    with np.errstate(divide="ignore"):
+        factors = np.where(lead != 0, 1.0 / lead, np.nan)
+    return AlsResult(
+        pd.Series(factors, index=bench_index), done, residual, converged, state
+    )
+
+
 def compute_normalization_factors(
     cost_df: pd.DataFrame,
     weights: Optional[pd.Series] = None,
     iterations: int = 20,
+    engine: str = "dense",
+    tol: Optional[float] = None,
 ) -> pd.Series:
     """Return per-benchmark factors using rank 1 SVD via ALS.
 
@@ -50,11 +184,25 @@ def compute_normalization_factors(
     ``weights`` is an optional Series indexed by benchmark controlling each
     benchmark's contribution to the least squares objective. Benchmarks that
     lack cost information receive ``NaN`` in the resulting Series.
+
+    ``engine="sparse"`` solves on the observed cells only via
+    :func:`compute_normalization_factors_sparse`, honouring ``tol``.
     """
 
     if cost_df.empty:
         return pd.Series(dtype=float)
 
+    if engine == "sparse":
+        costs = cost_df.rename_axis(index="benchmark", columns="slug").stack()
+        result = compute_normalization_factors_sparse(
+            costs.rename("cost").reset_index(), weights, iterations, tol
+        )
+        factors = result.factors.reindex(cost_df.index)
+        # Benchmarks without any cost keep u == 1, as in the dense engine.
+        return factors.where(factors.index.isin(result.factors.index), 1.0)
+    if engine != "dense":
+        raise ValueError(f"Unknown ALS engine: {engine}")
+
     cost_df = cost_df.astype(float)
     if weights is None:
         weights = pd.Series(1.0, index=cost_df.index)
@@ -80,46 +228,293 @@ def compute_normalization_factors(
     return factors
 
 
-def normalize_benchmark_scores(df: pd.DataFrame) -> pd.DataFrame:
-    """Add a ``normalized_score`` column per benchmark."""
+def normalize_benchmark_scores(
+    df: pd.DataFrame, methods: Optional[pd.Series] = None
+) -> pd.DataFrame:
+    """Add a ``normalized_score`` column per benchmark.
+
+    ``methods`` maps benchmarks to a strategy from :mod:`normalization`
+    (``minmax`` for any benchmark it does not list or when omitted).
+    """
 
     df = df.copy()
     df["cost"] = df["cost"].replace(0, np.nan)
 
-    grouped = df.groupby("benchmark")
-    min_scores = grouped["score"].transform("min")
-    max_scores = grouped["score"].transform("max")
-    df["normalized_score"] = np.where(
-        max_scores != min_scores,
-        (df["score"] - min_scores) / (max_scores - min_scores) * 100,
-        100.0,
+    codes, benchmarks = pd.factorize(df["benchmark"])
+    if methods is None:
+        group_methods = [DEFAULT_METHOD] * len(benchmarks)
+    else:
+        group_methods = (
+            methods.reindex(np.asarray(benchmarks, dtype=object))
+            .fillna(DEFAULT_METHOD)
+            .tolist()
+        )
+    df["normalized_score"] = normalize_scores(
+        codes, df["score"].to_numpy(dtype=float), group_methods
     )
     return df
 
 
-
 def build_output(df: pd.DataFrame, factor: Optional[float]) -> Dict[str, Dict[str, float]]:
-    """Return a mapping ready for YAML serialization."""
+    """Return a mapping ready for YAML serialization.
+
+    Rows keep the order of ``df``; values are rounded to four significant
+    figures and missing values are dropped from each row.
+    """
+
+    slugs = df["slug"].tolist()
+    if len(set(slugs)) != len(slugs):
+        raise ValueError("slugs must be unique within a benchmark")
 
-    out_df = df.copy()
+    columns = {col: df[col].to_numpy(dtype=float) for col in df.columns if col != "slug"}
     if factor is not None:
-        out_df["normalized_cost"] = out_df["cost"] * factor
+        columns["normalized_cost"] = columns["cost"] * factor
+    if "pareto_depth" in columns:
+        # Keep the depth after the costs, as an integer.
+        columns["pareto_depth"] = columns.pop("pareto_depth")
 
     for col in ["score", "normalized_score", "cost", "normalized_cost"]:
-        if col in out_df.columns:
-            out_df[col] = out_df[col].apply(
-                lambda x: round_sig(float(x), 4) if pd.notna(x) else x
-            )
+        if col in columns:
+            columns[col] = round_sig_array(columns[col], 4)
 
-    records = out_df.set_index("slug").to_dict(orient="index")
-    # remove NaN entries
-    cleaned = {
-        slug: {k: v for k, v in vals.items() if pd.notna(v)}
-        for slug, vals in records.items()
+    names = list(columns)
+    lists = [
+        depth_list(columns[name]) if name == "pareto_depth" else columns[name].tolist()
+        for name in names
+    ]
+    rows = zip(*lists)
+    # ``v == v`` is False only for NaN, which is dropped from the output.
+    return {
+        slug: {k: v for k, v in zip(names, values) if v == v}
+        for slug, values in zip(slugs, rows)
     }
-    return cleaned
 
-def main() -> None:
+def build_long_output(out_df: pd.DataFrame, factors: Dict[str, float]) -> pd.DataFrame:
+    """Return all benchmarks' output rows as one long-format table.
+
+    ``out_df`` holds ``benchmark``, ``slug``, ``score``, ``normalized_score``
+    and ``cost`` in output order. Values are rounded exactly like
+    :func:`build_output`, so the table agrees with the YAML files.
+    """
+
+    df = out_df[["benchmark", "slug", "score", "normalized_score", "cost"]].astype(
+        {"benchmark": object, "slug": object}
+    )
+    factor = df["benchmark"].map(factors).astype(float).to_numpy()
+    df["normalized_cost"] = df["cost"].to_numpy(dtype=float) * factor
+    for col in ["score", "normalized_score", "cost", "normalized_cost"]:
+        df[col] = round_sig_array(df[col].to_numpy(dtype=float), 4)
+    return df.reset_index(drop=True)
+
+
+def cost_inputs(
+    benchmarks_df: pd.DataFrame, meta: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Return the observed costs and per-benchmark weights for the ALS solve.
+
+    ``meta`` is the :attr:`BenchmarkTable.meta` the rows came from.
+    """
+    costs = benchmarks_df.dropna(subset=["cost"]).drop_duplicates(
+        subset=["benchmark", "slug"]
+    )
+    return costs[["benchmark", "slug", "cost"]], meta["cost_weight"]
+
+
+def sort_outputs(benchmarks_df: pd.DataFrame) -> pd.DataFrame:
+    """Return output columns sorted by benchmark, then in processed-file order.
+
+    ``pareto_depth`` ranks each model's (cost, score) point within its
+    benchmark (see :mod:`pareto`); it is NaN without a cost.
+    """
+    out_df = benchmarks_df.sort_values(
+        by=["benchmark", "score", "cost", "slug"],
+        ascending=[True, False, True, True],
+    )[["benchmark", "slug", "score", "normalized_score", "cost"]]
+    return out_df.assign(
+        pareto_depth=pareto_depth(
+            out_df["cost"].to_numpy(dtype=float),
+            out_df["score"].to_numpy(dtype=float),
+            pd.factorize(out_df["benchmark"])[0],
+        )
+    )
+
+
+def write_benchmark_output(
+    task: tuple[pd.DataFrame, Optional[float], Path, bool],
+) -> bool:
+    """Serialize one benchmark's rows to ``out_path``.
+
+    ``task`` is ``(df, factor, out_path, skip_unchanged)``; bundled into one
+    argument so it can be fanned out with :func:`parallel.parallel_map`.
+    Returns whether the file was written.
+    """
+
+    df, factor, out_path, skip_unchanged = task
+    out_dict = build_output(df, factor)
+    # Always write a file, even if ``out_dict`` is empty, to signal that the
+    # benchmark was processed but lacked model mappings.
+    out_text = dump_yaml(out_dict, sort_keys=False)
+    if skip_unchanged:
+        return write_if_changed(out_path, out_text)
+    out_path.write_text(out_text)
+    return True
+
+
+def _same_output(
+    previous: Optional[tuple[pd.DataFrame, Optional[float]]],
+    rows: pd.DataFrame,
+    factor: Optional[float],
+) -> bool:
+    if previous is None:
+        return False
+    old_rows, old_factor = previous
+    # NaN factors compare unequal to themselves.
+    same_factor = old_factor == factor or (
+        old_factor != old_factor and factor != factor
+    )
+    return same_factor and old_rows.equals(rows)
+
+
+@dataclass
+class ProcessedOutputs:
+    """Result of :func:`write_outputs`.
+
+    ``benchmarks`` maps every benchmark to its output rows and cost factor,
+    ``written`` lists the benchmark files that were written and ``long_df``
+    is the table from :func:`build_long_output`.
+    """
+
+    long_df: pd.DataFrame
+    benchmarks: Dict[str, tuple[pd.DataFrame, Optional[float]]]
+    written: List[Path]
+
+
+def write_outputs(
+    benchmarks_df: pd.DataFrame,
+    factors: Dict[str, float],
+    bench_names: List[str],
+    out_dir: Path,
+    profiler: Optional[Profiler] = None,
+    jobs: int = 1,
+    parquet: bool = False,
+    skip_unchanged: bool = False,
+    previous: Optional[Dict[str, tuple[pd.DataFrame, Optional[float]]]] = None,
+) -> ProcessedOutputs:
+    """Write a YAML file per benchmark to ``out_dir`` and the snapshot next to it.
+
+    ``benchmarks_df`` holds the normalized rows of every benchmark in
+    ``bench_names``. With ``previous``, the ``benchmarks`` of an earlier
+    call, benchmarks whose rows and factor did not change are not serialized
+    again.
+    """
+
+    if profiler is None:
+        profiler = Profiler("process_data")
+
+    with profiler.stage("write_outputs") as stage:
+        # One sort over all rows, then slice per benchmark via the groupby
+        # index, instead of a boolean scan of the whole frame per benchmark.
+        out_df = sort_outputs(benchmarks_df)
+        groups = out_df.groupby("benchmark", sort=False, observed=True).indices
+        empty = out_df.iloc[:0, 1:]
+        benchmarks = {}
+        tasks = []
+        for bench_name in bench_names:
+            rows = empty
+            if bench_name in groups:
+                rows = out_df.iloc[groups[bench_name], 1:].reset_index(drop=True)
+            factor = factors.get(bench_name)
+            benchmarks[bench_name] = (rows, factor)
+            if previous is not None and _same_output(
+                previous.get(bench_name), rows, factor
+            ):
+                continue
+            tasks.append((rows, factor, out_dir / f"{bench_name}.yaml", skip_unchanged))
+        results = parallel_map(write_benchmark_output, tasks, jobs)
+        stage.rows = len(out_df)
+
+    with profiler.stage("write_snapshot") as stage:
+        long_df = build_long_output(out_df, factors)
+        write_snapshot(
+            long_df,
+            bench_names,
+            out_dir.parent,
+            parquet=parquet,
+            skip_unchanged=skip_unchanged,
+        )
+        stage.rows = len(long_df)
+
+    written = [task[2] for task, result in zip(tasks, results) if result]
+    return ProcessedOutputs(long_df, benchmarks, written)
+
+
+def write_rankings(
+    long_df: pd.DataFrame,
+    meta: pd.DataFrame,
+    models: pd.DataFrame,
+    out_dir: Path,
+    profiler: Optional[Profiler] = None,
+    jobs: int = 1,
+    skip_unchanged: bool = False,
+    impute_rank: int = 0,
+    resamples: int = RESAMPLES,
+    history_path: Optional[Path] = None,
+) -> List[Path]:
+    """Write the leaderboard and family rollups to ``out_dir`` from ``long_df``.
+
+    ``meta`` is the :attr:`BenchmarkTable.meta` of the rows and ``models``
+    the :func:`families.model_index`. With ``history_path`` the rows are
+    also appended to that score history. Returns the files written.
+    """
+
+    if profiler is None:
+        profiler = Profiler("process_data")
+    written = []
+
+    with profiler.stage("write_leaderboard") as stage:
+        board = aggregate_leaderboard(
+            long_df,
+            meta["score_weight"],
+            meta["cost_weight"],
+            impute_rank=impute_rank,
+            resamples=resamples,
+            jobs=jobs,
+        )
+        if write_leaderboard(
+            board,
+            out_dir,
+            leaderboard_settings(impute_rank, resamples),
+            skip_unchanged=skip_unchanged,
+        ):
+            written.append(out_dir / "leaderboard.json")
+        stage.rows = len(board)
+
+    with profiler.stage("write_families") as stage:
+        if write_family_rollups(
+            long_df, board, models, out_dir, skip_unchanged=skip_unchanged
+        ):
+            written.append(out_dir / "families.json")
+        stage.rows = len(models)
+
+    if history_path is not None:
+        with profiler.stage("write_history") as stage:
+            with HistoryStore(history_path) as store:
+                stage.rows = store.append(long_df)
+    return written
+
+
+def main(
+    incremental: bool = False,
+    jobs: int = 1,
+    parquet: bool = False,
+    profiler: Optional[Profiler] = None,
+    als_warm_start: bool = False,
+    root: Optional[Path] = None,
+    history: bool = True,
+    impute_rank: int = 0,
+    resamples: Optional[int] = None,
+    history_db: Optional[Path] = None,
+) -> None:
     """Convert raw benchmark YAML files into processed outputs.
 
     For every file under ``data/raw/benchmarks`` a corresponding YAML file is
@@ -127,84 +522,229 @@ def main() -> None:
     mappings—meaning none of its aliases resolve to a model slug—an *empty*
     YAML file is still emitted. This acts as a breadcrumb for maintainers that
     the benchmark exists but lacks mappings, rather than silently skipping it.
+
+    With ``incremental`` set, parsed input frames are cached under
+    ``.cache/process_data`` keyed by content hash, so only raw benchmark and
+    mapping files that changed since the previous run are re-parsed, and
+    outputs whose bytes would not change are left untouched. The manifest
+    also records the options that shape the outputs (see
+    :func:`incremental.output_settings`).
+
+    ``jobs`` spreads file parsing and output serialization over that many
+    worker processes (``0`` for one per CPU). Output bytes do not depend on it.
+
+    All processed rows are also written as one consolidated table to
+    ``data/processed/snapshot.json`` and, with ``parquet``, to
+    ``data/processed/snapshot.parquet`` (see :mod:`snapshot`), and the
+    overall ranking with per-model coverage to
+    ``data/processed/leaderboard.json``. With ``impute_rank`` above 0 the
+    ranking uses scores where missing results are imputed by a rank
+    ``impute_rank`` ALS fit (see :mod:`leaderboard`). Unless ``resamples``
+    is 0, the leaderboard also gets score and rank intervals from that many
+    (default ``bootstrap.RESAMPLES``) bootstrap resamples of the benchmarks
+    (see :mod:`bootstrap`), spread
+    over ``jobs`` processes. Best, cheapest-near-best and effort-to-score
+    slope of every reasoning-effort family in ``data/config/models`` go to
+    ``data/processed/families.json`` (see :mod:`families`).
+
+    By default cost normalization factors come from a fixed 20-iteration cold
+    ALS solve. ``als_warm_start`` instead solves to convergence with a
+    canonical scale (see :func:`compute_normalization_factors_sparse`),
+    starting from the factors cached under ``.cache/process_data`` by the
+    previous such run. This changes the overall scale of ``normalized_cost``.
+
+    Unless ``history`` is off, the same rows are appended to the score history
+    in ``history_db`` (default: ``$HISTORY_DB`` or
+    ``data/history/scores.sqlite``), keeping only values that changed since
+    the previous run (see :mod:`history`).
+
+    ``root`` is the repository checkout to process and defaults to the one
+    this script lives in.
+
+    Stages are timed by ``profiler``, which defaults to one configured from
+    the ``PIPELINE_PROFILE`` environment variables (see :mod:`profiling`).
     """
 
-    root = Path(__file__).resolve().parents[1]
+    if parquet:
+        # Fail before doing any work rather than after writing the YAML files.
+        import pyarrow  # noqa: F401
+
+    if root is None:
+        root = Path(__file__).resolve().parents[1]
     bench_dir = root / "data" / "raw" / "benchmarks"
     mapping_dir = root / "data" / "config" / "mappings"
+    models_dir = root / "data" / "config" / "models"
     out_dir = root / "data" / "processed" / "benchmarks"
     out_dir.mkdir(exist_ok=True)
+    cache = None
+    if incremental:
+        settings = output_settings(impute_rank, resamples, parquet, als_warm_start)
+        cache = FrameCache(root / ".cache" / "process_data", settings)
+    if resamples is None:
+        resamples = RESAMPLES
+    if history_db is None:
+        history_db = default_path(root)
+
+    def load(kind: str, paths: list[Path], loader) -> list:
+        if cache is None:
+            return parallel_map(loader, paths, jobs)
+        return cache.load_many(kind, paths, loader, jobs)
+
+    if profiler is None:
+        profiler = Profiler.create("process_data")
 
     bench_files = list(bench_dir.glob("*.yaml"))
-    bench_frames = [load_benchmark(f) for f in bench_files]
-    bench_frames = [df for df in bench_frames if not df.empty]
-    if bench_frames:
-        benchmarks_df = pd.concat(bench_frames, ignore_index=True)
-    else:
-        benchmarks_df = pd.DataFrame(
-            columns=[
-                "alias",
-                "score",
-                "cost",
-                "benchmark",
-                "cost_weight",
-                "score_weight",
-                "model_name_mapping_file",
-            ]
+    with profiler.stage("load_benchmarks") as stage:
+        table = BenchmarkTable.from_benchmarks(
+            load("benchmarks", bench_files, read_benchmark)
         )
+        stage.rows = len(table)
     bench_names = [f.stem for f in bench_files]
 
-    map_frames = [load_mapping_file(f) for f in mapping_dir.glob("*.yaml")]
-    map_frames = [df for df in map_frames if not df.empty]
-    if map_frames:
-        mapping_df = pd.concat(map_frames, ignore_index=True)
-    else:
-        mapping_df = pd.DataFrame(columns=["alias", "slug", "model_name_mapping_file"])
-    benchmarks_df = benchmarks_df.merge(
-        mapping_df,
-        on=["alias", "model_name_mapping_file"],
-        how="left",
-    )
-    benchmarks_df = benchmarks_df.dropna(subset=["slug"])[
-        [
-            "benchmark",
-            "slug",
-            "score",
-            "cost",
-            "cost_weight",
-            "score_weight",
-        ]
-    ]
-
-    benchmarks_df = normalize_benchmark_scores(benchmarks_df)
+    with profiler.stage("load_mappings") as stage:
+        map_frames = load(
+            "mappings", list(mapping_dir.glob("*.yaml")), load_mapping_file
+        )
+        resolver = AliasResolver.from_frames(map_frames)
+        stage.rows = len(resolver)
 
-    cost_df = (
-        benchmarks_df.dropna(subset=["cost"])
-        .pivot_table(index="benchmark", columns="slug", values="cost", aggfunc="first")
-    )
+    with profiler.stage("load_models") as stage:
+        models = model_index(
+            load("models", sorted(models_dir.glob("*.yaml")), read_model_config)
+        )
+        stage.rows = len(models)
 
-    weights = benchmarks_df.groupby("benchmark")["cost_weight"].first()
+    with profiler.stage("resolve_aliases") as stage:
+        table = table.resolve(resolver)
+        stage.rows = len(table)
 
-    factors = (
-        compute_normalization_factors(cost_df, weights).to_dict() if not cost_df.empty else {}
+    with profiler.stage("normalize_benchmark_scores") as stage:
+        benchmarks_df = normalize_benchmark_scores(
+            table.rows, table.meta["normalization"]
+        )
+        stage.rows = len(benchmarks_df)
+
+    with profiler.stage("compute_normalization_factors") as stage:
+        costs, weights = cost_inputs(benchmarks_df, table.meta)
+        if als_warm_start:
+            state_path = root / ".cache" / "process_data" / "als_factors.pkl"
+            init = AlsFactors.load(state_path)
+            result = compute_normalization_factors_sparse(
+                costs,
+                weights,
+                iterations=ALS_MAX_ITERATIONS,
+                tol=ALS_TOL,
+                init=init,
+                canonical=True,
+            )
+            print(
+                f"ALS {'warm' if init is not None else 'cold'} start: "
+                f"{result.iterations} iterations, "
+                f"{'converged' if result.converged else 'not converged'}"
+            )
+            if result.state is not None:
+                result.state.save(state_path)
+        else:
+            result = compute_normalization_factors_sparse(costs, weights)
+        factors = result.factors.to_dict()
+        stage.rows = len(costs)
+
+    outputs = write_outputs(
+        benchmarks_df,
+        factors,
+        bench_names,
+        out_dir,
+        profiler,
+        jobs=jobs,
+        parquet=parquet,
+        skip_unchanged=cache is not None,
+    )
+    write_rankings(
+        outputs.long_df,
+        table.meta,
+        models,
+        out_dir.parent,
+        profiler,
+        jobs=jobs,
+        skip_unchanged=cache is not None,
+        impute_rank=impute_rank,
+        resamples=resamples,
+        history_path=history_db if history else None,
     )
 
-    for bench_name in bench_names:
-        df = benchmarks_df[benchmarks_df["benchmark"] == bench_name]
-        if not df.empty:
-            df = df.sort_values(
-                by=["score", "cost", "slug"], ascending=[False, True, True]
-            )
-        factor = factors.get(bench_name)
-        out_dict = build_output(
-            df[["slug", "score", "normalized_score", "cost"]],
-            factor,
+    if cache is not None:
+        cache.save()
+        print(
+            f"Re-parsed {len(cache.parsed)} of "
+            f"{len(cache.current)} input files"
         )
-        out_path = out_dir / f"{bench_name}.yaml"
-        # Always write a file, even if ``out_dict`` is empty, to signal that the
-        # benchmark was processed but lacked model mappings.
-        out_path.write_text(yaml.safe_dump(out_dict, sort_keys=False))
+    profiler.write()
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=main.__doc__.splitlines()[0])
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-parse inputs whose content changed since the last run",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for parsing and writing files (0: one per CPU)",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="also write data/processed/snapshot.parquet (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="do not append this run to the score history",
+    )
+    parser.add_argument(
+        "--history-db",
+        type=Path,
+        metavar="PATH",
+        help="score history database (default: $HISTORY_DB or "
+        "data/history/scores.sqlite)",
+    )
+    parser.add_argument(
+        "--als-warm-start",
+        action="store_true",
+        help="solve cost factors to convergence, starting from the cached factors",
+    )
+    parser.add_argument(
+        "--impute-rank",
+        type=int,
+        default=0,
+        metavar="K",
+        help="rank the leaderboard with missing scores imputed by a rank-K fit",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        metavar="N",
+        help="bootstrap resamples for leaderboard intervals, 0 to skip "
+        f"(default {RESAMPLES})",
+    )
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(
+        incremental=args.incremental,
+        jobs=args.jobs,
+        parquet=args.parquet,
+        profiler=profiler_from_args("process_data", args),
+        als_warm_start=args.als_warm_start,
+        history=not args.no_history,
+        history_db=args.history_db,
+        impute_rank=args.impute_rank,
+        resamples=args.bootstrap,
+    )
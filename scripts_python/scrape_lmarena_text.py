@@ -1,41 +1,103 @@
+import argparse
+import asyncio
+import io
 import json
 import re
 import pickle
-import types
-import sys
 from pathlib import Path
-from urllib.request import urlopen
+from typing import IO, Optional
+
+from http_fetch import AsyncFetcher, default_cache_dir
+from profiling import Profiler, add_profile_arguments, profiler_from_args
+from yaml_io import dump_yaml, load_yaml
+
+SPACE = "lmarena-ai/chatbot-arena-leaderboard"
+META_URL = f"https://huggingface.co/api/spaces/{SPACE}?raw=1"
+RESOLVE_URL = f"https://huggingface.co/spaces/{SPACE}/resolve/main/{{filename}}"
+TIMEOUT = 60
+
+# Plot payloads in the results pickle reference these packages. Their objects
+# are replaced by ``Dummy`` stubs so neither package needs to be installed nor
+# any figure be built.
+STUB_MODULES = ("plotly", "matplotlib")
+# Everything else the leaderboard frames need: pandas and numpy internals and
+# the standard containers around them, as packages with all their submodules.
+SAFE_MODULES = (
+    "pandas.core",
+    "pandas._libs",
+    "numpy.core",
+    "numpy._core",
+    "collections",
+    "datetime",
+)
+# Except pandas' expression evaluator, which can call arbitrary code.
+UNSAFE_MODULES = ("pandas.core.computation",)
+# From top-level ``numpy``, which also has loaders and ``numpy.testing``.
+SAFE_NUMPY = {"dtype", "ndarray"}
+SAFE_BUILTINS = {
+    "bool",
+    "bytearray",
+    "bytes",
+    "complex",
+    "dict",
+    "float",
+    "frozenset",
+    "int",
+    "list",
+    "object",
+    "range",
+    "set",
+    "slice",
+    "str",
+    "tuple",
+}
 
-import yaml
 
 class Dummy:
     def __init__(self, *a, **k):
         pass
 
-class DummySubplotRef(Dummy):
-    pass
-
-MODS = [
-    "plotly",
-    "plotly.graph_objs",
-    "plotly.graph_objs._figure",
-    "plotly._subplots",
-    "matplotlib",
-    "matplotlib.pyplot",
-]
-
-
-def fetch(url: str) -> bytes:
-    with urlopen(url) as resp:
-        return resp.read()
+    def __setstate__(self, state):
+        # Drop the figure state instead of attaching it to the stub.
+        pass
 
 
-def fetch_latest_pkl() -> bytes:
-    meta_text = fetch(
-        "https://huggingface.co/api/spaces/lmarena-ai/chatbot-arena-leaderboard?raw=1"
-    ).decode()
-    json_start = meta_text.index("{")
-    meta = json.loads(meta_text[json_start:])
+def _in_package(module: str, packages: tuple[str, ...]) -> bool:
+    return any(module == p or module.startswith(f"{p}.") for p in packages)
+
+
+class RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler that only loads what the leaderboard frames are made of.
+
+    The pickle comes from a third-party host, so every global it references
+    is checked. Any global from :data:`STUB_MODULES` resolves to
+    :class:`Dummy`, so plot payloads are discarded as they are read rather
+    than reconstructed, and ``sys.modules`` is left untouched. Globals from
+    :data:`SAFE_MODULES`, :data:`SAFE_NUMPY` and :data:`SAFE_BUILTINS` load
+    normally, as long as they are plain names rather than dotted attribute
+    paths. Anything else raises :class:`pickle.UnpicklingError`.
+    """
+
+    def find_class(self, module: str, name: str):
+        if module.split(".")[0] in STUB_MODULES:
+            return Dummy
+        if module in ("builtins", "__builtin__"):
+            allowed = name in SAFE_BUILTINS
+        elif module == "_codecs":
+            # Protocol 2 stores bytes as ``_codecs.encode(text, "latin1")``.
+            allowed = name == "encode"
+        elif module == "numpy":
+            allowed = name in SAFE_NUMPY
+        else:
+            allowed = _in_package(module, SAFE_MODULES) and not _in_package(
+                module, UNSAFE_MODULES
+            )
+        if not allowed or "." in name:
+            raise pickle.UnpicklingError(f"refusing to load {module}.{name}")
+        return super().find_class(module, name)
+
+
+def latest_pkl_name(meta: dict) -> str:
     filenames = [
         s["rfilename"]
         for s in meta.get("siblings", [])
@@ -43,29 +105,72 @@ def fetch_latest_pkl() -> bytes:
     ]
     if not filenames:
         raise RuntimeError("Unable to find latest results file")
-    latest = sorted(filenames)[-1]
-    return fetch(
-        f"https://huggingface.co/spaces/lmarena-ai/chatbot-arena-leaderboard/resolve/main/{latest}"
-    )
+    return sorted(filenames)[-1]
 
 
-def parse_pkl(pkl_data: bytes) -> dict[str, float]:
-    for m in MODS:
-        mod = types.ModuleType(m)
-        mod.Figure = Dummy
-        mod.SubplotRef = DummySubplotRef
-        sys.modules[m] = mod
+async def fetch_latest_pkl_async(
+    fetcher: AsyncFetcher,
+    meta_url: str = META_URL,
+    resolve_url: str = RESOLVE_URL,
+) -> Path:
+    """Fetch the latest ``elo_results_*.pkl`` into the fetcher's cache.
+
+    The pickle keeps its own name in the cache and is only downloaded again
+    when its ETag changed. Older result files are removed from the cache once
+    the latest one is in.
+    """
+    meta_text = (await fetcher.fetch(meta_url)).text()
+    latest = latest_pkl_name(json.loads(meta_text[meta_text.index("{") :]))
+    resp = await fetcher.fetch(resolve_url.format(filename=latest), name=latest)
+    print(f"{'Using cached' if resp.from_cache else 'Downloaded'} {resp.path}")
+    keep = {path.name for path in fetcher.cache.paths(resp.url, latest)}
+    for stale in resp.path.parent.glob("elo_results_*.pkl*"):
+        if stale.name not in keep:
+            stale.unlink()
+    return resp.path
+
+
+def fetch_latest_pkl(
+    cache_dir: Path,
+    meta_url: str = META_URL,
+    resolve_url: str = RESOLVE_URL,
+) -> Path:
+    """Synchronous :func:`fetch_latest_pkl_async` caching into ``cache_dir``."""
+
+    async def run() -> Path:
+        async with AsyncFetcher(cache_dir, timeout=TIMEOUT) as fetcher:
+            return await fetch_latest_pkl_async(fetcher, meta_url, resolve_url)
 
-    data = pickle.loads(pkl_data)
+    return asyncio.run(run())
+
+
+async def scrape(fetcher: AsyncFetcher) -> dict[str, float]:
+    """Scraper entry point for :mod:`scrape_runner`."""
+    path = await fetch_latest_pkl_async(fetcher)
+    return await asyncio.to_thread(parse_pkl_file, path)
+
+
+def load_ratings(f: IO[bytes]) -> dict[str, float]:
+    data = RestrictedUnpickler(f).load()
     df = data["text"]["full"]["leaderboard_table_df"]
     return {name: float(rating) for name, rating in df["rating"].items()}
 
 
+def parse_pkl(pkl_data: bytes) -> dict[str, float]:
+    return load_ratings(io.BytesIO(pkl_data))
+
+
+def parse_pkl_file(path: Path) -> dict[str, float]:
+    """Like :func:`parse_pkl`, streaming from ``path`` instead of memory."""
+    with path.open("rb") as f:
+        return load_ratings(f)
+
+
 def save_benchmark_results(out_path: Path, results: dict[str, float]) -> None:
     yaml_obj = {}
     if out_path.exists():
         try:
-            yaml_obj = yaml.safe_load(out_path.read_text()) or {}
+            yaml_obj = load_yaml(out_path) or {}
         except Exception:
             yaml_obj = {}
 
@@ -75,17 +180,36 @@ def save_benchmark_results(out_path: Path, results: dict[str, float]) -> None:
         return
 
     yaml_obj["results"] = results
-    out_path.write_text(yaml.safe_dump(yaml_obj, sort_keys=False))
+    out_path.write_text(dump_yaml(yaml_obj, sort_keys=False))
     print(f"Wrote {out_path}")
 
 
-def main() -> None:
-    pkl_data = fetch_latest_pkl()
-    results = parse_pkl(pkl_data)
-    root = Path(__file__).resolve().parents[1]
-    out_path = root / "data" / "raw" / "benchmarks" / "lmarena-text.yaml"
-    save_benchmark_results(out_path, results)
+def main(
+    cache_dir: Optional[Path] = None,
+    profiler: Optional[Profiler] = None,
+    root: Optional[Path] = None,
+) -> None:
+    if root is None:
+        root = Path(__file__).resolve().parents[1]
+    if cache_dir is None:
+        # The cache scrape_runner uses, so the pickle is stored only once.
+        cache_dir = default_cache_dir(root)
+    if profiler is None:
+        profiler = Profiler.create("scrape_lmarena_text")
+
+    with profiler.stage("fetch"):
+        pkl_path = fetch_latest_pkl(cache_dir)
+    with profiler.stage("parse_pkl") as stage:
+        results = parse_pkl_file(pkl_path)
+        stage.rows = len(results)
+    with profiler.stage("save_results"):
+        out_path = root / "data" / "raw" / "benchmarks" / "lmarena-text.yaml"
+        save_benchmark_results(out_path, results)
+    profiler.write()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape LMArena text ratings.")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    main(profiler=profiler_from_args("scrape_lmarena_text", args))
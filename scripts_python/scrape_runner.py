@@ -0,0 +1,109 @@
+"""Run the Python scrapers concurrently.
+
+A scraper is an ``async`` function that takes the shared
+:class:`http_fetch.AsyncFetcher` and returns ``{model name: score}``. Every
+registered scraper runs at the same time, so their network round-trips
+overlap, while the fetcher bounds the connections per host and keeps one
+HTTP cache under ``.cache/http`` (:func:`http_fetch.default_cache_dir`).
+Each result is written to ``data/raw/benchmarks/<name>.yaml`` through
+:func:`scrape_lmarena_text.save_benchmark_results`. A failing scraper is
+reported without stopping the others.
+
+Usage: ``python scrape_runner.py [NAME ...] [--per-host N]``.
+"""
+
+import argparse
+import asyncio
+import sys
+import traceback
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+import scrape_lmarena_text
+from http_fetch import PER_HOST, AsyncFetcher, default_cache_dir
+from profiling import Profiler, add_profile_arguments, profiler_from_args
+from scrape_lmarena_text import save_benchmark_results
+
+Scraper = Callable[[AsyncFetcher], Awaitable[Dict[str, float]]]
+
+SCRAPERS: Dict[str, Scraper] = {
+    "lmarena-text": scrape_lmarena_text.scrape,
+}
+
+
+async def run_scrapers(
+    scrapers: Dict[str, Scraper], out_dir: Path, fetcher: AsyncFetcher
+) -> Dict[str, Optional[BaseException]]:
+    """Run ``scrapers`` concurrently and save each one's results.
+
+    Returns the exception each scraper failed with, or ``None`` on success.
+    """
+
+    async def run(name: str, scraper: Scraper) -> None:
+        results = await scraper(fetcher)
+        await asyncio.to_thread(
+            save_benchmark_results, out_dir / f"{name}.yaml", results
+        )
+
+    outcomes = await asyncio.gather(
+        *(run(name, scraper) for name, scraper in scrapers.items()),
+        return_exceptions=True,
+    )
+    return dict(zip(scrapers, outcomes))
+
+
+def main(
+    names: Optional[Iterable[str]] = None,
+    per_host: int = PER_HOST,
+    profiler: Optional[Profiler] = None,
+    root: Optional[Path] = None,
+) -> int:
+    """Run the named scrapers (default: all) and return the number that failed."""
+    if root is None:
+        root = Path(__file__).resolve().parents[1]
+    if profiler is None:
+        profiler = Profiler.create("scrape_runner")
+    names = list(SCRAPERS) if names is None else list(names)
+    unknown = [name for name in names if name not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"Unknown scrapers: {', '.join(unknown)}")
+
+    async def run() -> Dict[str, Optional[BaseException]]:
+        async with AsyncFetcher(default_cache_dir(root), per_host=per_host) as f:
+            return await run_scrapers(
+                {name: SCRAPERS[name] for name in names},
+                root / "data" / "raw" / "benchmarks",
+                f,
+            )
+
+    with profiler.stage("scrape") as stage:
+        errors = asyncio.run(run())
+        stage.rows = len(errors)
+    profiler.write()
+
+    failed = {name: e for name, e in errors.items() if e is not None}
+    for name, error in failed.items():
+        print(f"Scraper {name} failed:", file=sys.stderr)
+        traceback.print_exception(error, file=sys.stderr)
+    return len(failed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Python scrapers.")
+    parser.add_argument(
+        "names", nargs="*", metavar="NAME", help=f"scrapers to run: {list(SCRAPERS)}"
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=PER_HOST,
+        help="concurrent requests per host",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    failed = main(
+        args.names or None,
+        per_host=args.per_host,
+        profiler=profiler_from_args("scrape_runner", args),
+    )
+    sys.exit(1 if failed else 0)
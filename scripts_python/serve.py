@@ -0,0 +1,338 @@
+"""Read-only HTTP/JSON query server over the processed benchmark data.
+
+``python serve.py`` loads ``data/processed/benchmarks/*.yaml`` and
+``data/config/models/*.yaml`` once into in-memory indexes by benchmark, by
+slug and by provider, and answers:
+
+``GET /benchmarks``
+    Every benchmark with its number of models.
+``GET /benchmarks/<name>?top=N&max_cost=C&provider=P``
+    The benchmark's results in processed-file order, best score first. Each
+    row keeps its ``rank`` in the full benchmark. ``max_cost`` keeps models
+    with a ``normalized_cost`` of at most ``C``, ``provider`` one provider's
+    models, and ``top`` the first ``N`` of what is left.
+``GET /models/<slug>``
+    The model's config entry and its result on every benchmark.
+``GET /providers/<name>``
+    The provider's models.
+
+Responses are cached per request target until the data changes, so a
+repeated query is one dictionary lookup. Each carries an ``ETag`` hashed from
+its body, and a matching ``If-None-Match`` gets ``304 Not Modified``. A
+watcher thread (see :func:`file_watch.create_watcher`) re-parses only the files
+that changed and then drops the cache. ``bench_serve.py`` measures the
+latency.
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from file_watch import DEBOUNCE, create_watcher
+from yaml_io import load_yaml
+
+HOST = "127.0.0.1"
+PORT = 8765
+# Cached responses are dropped wholesale past this many distinct targets.
+CACHE_SIZE = 4096
+
+Response = tuple[int, bytes, str]
+
+
+def _model_entries(path: Path) -> Dict[str, Dict[str, Any]]:
+    data = load_yaml(path) or {}
+    entries = {}
+    for slug, name in (data.get("reasoning_efforts") or {}).items():
+        entry = {"slug": slug, "name": name, "model": path.stem}
+        if data.get("provider"):
+            entry["provider"] = data["provider"]
+        if data.get("release_date"):
+            entry["release_date"] = str(data["release_date"])
+        if data.get("deprecated"):
+            entry["deprecated"] = True
+        entries[slug] = entry
+    return entries
+
+
+def _benchmark_rows(path: Path) -> List[Dict[str, Any]]:
+    data = load_yaml(path) or {}
+    return [
+        {"slug": slug, "rank": rank, **values}
+        for rank, (slug, values) in enumerate(data.items(), start=1)
+    ]
+
+
+class DataIndex:
+    """Processed results and model configs, indexed for the queries above.
+
+    ``results`` maps each benchmark to its rows in file order, ``by_slug``
+    each slug to its row per benchmark, ``models`` each slug to its config
+    entry and ``by_provider`` each provider to its slugs. All access goes
+    through :meth:`respond` and :meth:`refresh`, which hold ``lock``.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.bench_dir = root / "data" / "processed" / "benchmarks"
+        self.models_dir = root / "data" / "config" / "models"
+        self.lock = threading.RLock()
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_slug: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.model_files: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.by_provider: Dict[str, List[str]] = {}
+        self.responses: Dict[str, Response] = {}
+
+    def load(self) -> None:
+        """Load every processed benchmark and model config."""
+        self.refresh(
+            [*self.bench_dir.glob("*.yaml"), *self.models_dir.glob("*.yaml")]
+        )
+
+    def refresh(self, paths: Iterable[Path]) -> None:
+        """Re-read ``paths``, dropping those that no longer exist."""
+        with self.lock:
+            for path in paths:
+                if path.parent == self.bench_dir:
+                    self._set_benchmark(path)
+                elif path.parent == self.models_dir:
+                    self._set_models(path)
+            self.responses.clear()
+
+    def _set_benchmark(self, path: Path) -> None:
+        name = path.stem
+        for row in self.results.pop(name, []):
+            rows = self.by_slug[row["slug"]]
+            del rows[name]
+            if not rows:
+                del self.by_slug[row["slug"]]
+        if not path.exists():
+            return
+        self.results[name] = _benchmark_rows(path)
+        for row in self.results[name]:
+            self.by_slug.setdefault(row["slug"], {})[name] = row
+
+    def _set_models(self, path: Path) -> None:
+        self.model_files.pop(path.stem, None)
+        if path.exists():
+            self.model_files[path.stem] = _model_entries(path)
+        self.models = {
+            slug: entry
+            for stem in sorted(self.model_files)
+            for slug, entry in self.model_files[stem].items()
+        }
+        by_provider: Dict[str, List[str]] = {}
+        for slug, entry in sorted(self.models.items()):
+            by_provider.setdefault(entry.get("provider", ""), []).append(slug)
+        self.by_provider = by_provider
+
+    def respond(self, target: str) -> Response:
+        """Return ``(status, body, etag)`` for a request target."""
+        with self.lock:
+            response = self.responses.get(target)
+            if response is None:
+                try:
+                    status, data = HTTPStatus.OK, self.query(target)
+                except LookupError as e:
+                    status, data = HTTPStatus.NOT_FOUND, {"error": str(e.args[0])}
+                except ValueError as e:
+                    status, data = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+                body = json.dumps(data, separators=(",", ":")).encode()
+                etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+                response = (status, body, etag)
+                if len(self.responses) >= CACHE_SIZE:
+                    self.responses.clear()
+                self.responses[target] = response
+            return response
+
+    def query(self, target: str) -> Any:
+        """Answer a request target; raise ``LookupError`` or ``ValueError``."""
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        if parts == ["benchmarks"]:
+            return {name: len(rows) for name, rows in sorted(self.results.items())}
+        if len(parts) == 2 and parts[0] == "benchmarks":
+            return self.top(parts[1], **self._top_params(params))
+        if len(parts) == 2 and parts[0] == "models":
+            return self.profile(parts[1])
+        if len(parts) == 2 and parts[0] == "providers":
+            if parts[1] not in self.by_provider:
+                raise LookupError(f"unknown provider {parts[1]!r}")
+            return [self.models[slug] for slug in self.by_provider[parts[1]]]
+        raise LookupError(f"no such resource {url.path!r}")
+
+    @staticmethod
+    def _top_params(params: Dict[str, str]) -> Dict[str, Any]:
+        unknown = set(params) - {"top", "max_cost", "provider"}
+        if unknown:
+            raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+        try:
+            top = int(params["top"]) if "top" in params else None
+            max_cost = float(params["max_cost"]) if "max_cost" in params else None
+        except ValueError:
+            raise ValueError("top must be an integer and max_cost a number") from None
+        if top is not None and top < 0:
+            raise ValueError("top must not be negative")
+        return {"top": top, "max_cost": max_cost, "provider": params.get("provider")}
+
+    def top(
+        self,
+        benchmark: str,
+        top: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        provider: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a benchmark's rows in rank order, filtered as in ``GET``."""
+        if benchmark not in self.results:
+            raise LookupError(f"unknown benchmark {benchmark!r}")
+        rows = self.results[benchmark]
+        if max_cost is not None:
+            rows = [
+                r
+                for r in rows
+                if "normalized_cost" in r and r["normalized_cost"] <= max_cost
+            ]
+        if provider is not None:
+            rows = [
+                r
+                for r in rows
+                if self.models.get(r["slug"], {}).get("provider") == provider
+            ]
+        return rows[:top]
+
+    def profile(self, slug: str) -> Dict[str, Any]:
+        """Return a slug's config entry with its result on every benchmark."""
+        if slug not in self.models and slug not in self.by_slug:
+            raise LookupError(f"unknown model {slug!r}")
+        results = self.by_slug.get(slug, {})
+        return {
+            **self.models.get(slug, {"slug": slug}),
+            "benchmarks": {
+                name: {k: v for k, v in results[name].items() if k != "slug"}
+                for name in sorted(results)
+            },
+        }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Serve :meth:`DataIndex.respond` with keep-alive and ETags."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold one.
+    disable_nagle_algorithm = True
+    server: "QueryServer"
+
+    def do_GET(self) -> None:
+        status, body, etag = self.server.index.respond(self.path)
+        match = self.headers.get("If-None-Match")
+        if status == HTTPStatus.OK and match is not None:
+            tags = {tag.strip() for tag in match.split(",")}
+            if etag in tags or "*" in tags:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering from a :class:`DataIndex`."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        index: DataIndex,
+        host: str = HOST,
+        port: int = PORT,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__((host, port), QueryHandler)
+        self.index = index
+        self.verbose = verbose
+
+
+def reload_changes(
+    index: DataIndex, watcher, stop: threading.Event, debounce: float = DEBOUNCE
+) -> None:
+    """Refresh ``index`` with the files ``watcher`` reports until ``stop``."""
+    while not stop.is_set():
+        changed = watcher.poll(0.5)
+        if not changed:
+            continue
+        while more := watcher.poll(debounce):
+            changed |= more
+        try:
+            index.refresh(changed)
+        except Exception as e:
+            print(f"Failed to reload {sorted(p.name for p in changed)}: {e}")
+
+
+def serve(
+    root: Path,
+    host: str = HOST,
+    port: int = PORT,
+    polling: bool = False,
+    verbose: bool = False,
+) -> None:
+    """Load ``root``'s data and serve it until interrupted."""
+    index = DataIndex(root)
+    # Start watching before loading so no write in between is missed.
+    watcher = create_watcher([index.bench_dir, index.models_dir], polling)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=reload_changes, args=(index, watcher, stop), daemon=True
+    )
+    try:
+        index.load()
+        thread.start()
+        with QueryServer(index, host, port, verbose) as server:
+            print(
+                f"Serving {len(index.results)} benchmarks and {len(index.models)} "
+                f"models on http://{host}:{server.server_address[1]}"
+            )
+            server.serve_forever()
+    finally:
+        stop.set()
+        if thread.is_alive():
+            thread.join()
+        watcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=HOST, help="default %(default)s")
+    parser.add_argument("--port", type=int, default=PORT, help="default %(default)s")
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="poll the directories instead of using inotify",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log requests")
+    args = parser.parse_args()
+    try:
+        serve(
+            Path(__file__).resolve().parents[1],
+            host=args.host,
+            port=args.port,
+            polling=args.polling,
+            verbose=args.verbose,
+        )
+    except KeyboardInterrupt:
+        pass
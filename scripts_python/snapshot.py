@@ -0,0 +1,107 @@
+"""Consolidated snapshot of every processed benchmark.
+
+Alongside the per-benchmark YAML files, ``process_data`` writes the same
+numbers as one long-format table so consumers can load everything with a
+single read. Rows come from :func:`process_data.build_long_output` and are
+rounded exactly like the YAML files; the derived ``pareto_depth`` is left out.
+
+``snapshot.json``
+    Compact, pre-indexed JSON bundle. ``rows`` holds one array per
+    (benchmark, slug) pair in ``columns`` order, with benchmarks and slugs
+    stored as indices into ``benchmarks`` and ``slugs``. ``by_benchmark`` maps
+    each benchmark to its ``[start, stop)`` row range (rows are grouped by
+    benchmark in processed-file order) and ``by_slug`` maps each slug to its
+    row indices.
+
+``snapshot.parquet``
+    The long table itself, written on request when ``pyarrow`` is installed.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from incremental import write_if_changed
+
+VALUE_COLUMNS = ["score", "normalized_score", "cost", "normalized_cost"]
+
+
+def snapshot_bundle(df: pd.DataFrame, bench_names: List[str]) -> Dict[str, Any]:
+    """Return the pre-indexed JSON bundle for ``df``.
+
+    ``bench_names`` lists every processed benchmark, including those without
+    mapped rows, which get an empty range.
+    """
+
+    bench_codes, benchmarks = pd.factorize(df["benchmark"])
+    slug_codes, slugs = pd.factorize(df["slug"], sort=True)
+    values = df[VALUE_COLUMNS].to_numpy(dtype=float)
+    value_lists = np.where(np.isnan(values), None, values).tolist()
+
+    starts = np.searchsorted(bench_codes, np.arange(len(benchmarks)), side="left")
+    stops = np.searchsorted(bench_codes, np.arange(len(benchmarks)), side="right")
+    ranges = {
+        name: [int(start), int(stop)]
+        for name, start, stop in zip(benchmarks, starts, stops)
+    }
+    order = np.argsort(slug_codes, kind="stable")
+    bounds = np.searchsorted(slug_codes[order], np.arange(len(slugs) + 1))
+    by_slug = {
+        slug: order[bounds[i] : bounds[i + 1]].tolist() for i, slug in enumerate(slugs)
+    }
+
+    return {
+        "columns": ["benchmark", "slug", *VALUE_COLUMNS],
+        "benchmarks": list(benchmarks),
+        "slugs": list(slugs),
+        "rows": [
+            [b, s, *vals]
+            for b, s, vals in zip(bench_codes.tolist(), slug_codes.tolist(), value_lists)
+        ],
+        "by_benchmark": {name: ranges.get(name, [0, 0]) for name in bench_names},
+        "by_slug": by_slug,
+    }
+
+
+def write_snapshot(
+    df: pd.DataFrame,
+    bench_names: List[str],
+    out_dir: Path,
+    parquet: bool = False,
+    skip_unchanged: bool = False,
+) -> None:
+    """Write ``snapshot.json`` (and optionally ``snapshot.parquet``) to ``out_dir``."""
+
+    bundle = snapshot_bundle(df, bench_names)
+    text = json.dumps(bundle, separators=(",", ":"), allow_nan=False) + "\n"
+    json_path = out_dir / "snapshot.json"
+    if skip_unchanged:
+        write_if_changed(json_path, text)
+    else:
+        json_path.write_text(text)
+
+    if parquet:
+        df.to_parquet(out_dir / "snapshot.parquet", index=False)
+
+
+def load_snapshot(path: Path, benchmark: Optional[str] = None) -> pd.DataFrame:
+    """Load ``snapshot.json`` back into the long-format table.
+
+    With ``benchmark`` set only that benchmark's rows are materialized, using
+    the precomputed row range.
+    """
+
+    bundle = json.loads(path.read_text())
+    rows = bundle["rows"]
+    if benchmark is not None:
+        start, stop = bundle["by_benchmark"][benchmark]
+        rows = rows[start:stop]
+    df = pd.DataFrame(rows, columns=bundle["columns"], dtype=object)
+    df["benchmark"] = [bundle["benchmarks"][i] for i in df["benchmark"]]
+    df["slug"] = [bundle["slugs"][i] for i in df["slug"]]
+    for col in VALUE_COLUMNS:
+        df[col] = pd.to_numeric(df[col]).astype(float)
+    return df
@@ -0,0 +1,124 @@
+"""Generate synthetic raw-benchmark and mapping trees for benchmarking.
+
+The generated tree mirrors the layout under ``data/``::
+
+    <root>/data/raw/benchmarks/*.yaml
+    <root>/data/config/mappings/*.yaml
+    <root>/data/processed/benchmarks/
+
+Benchmarks share mapping files the way the real matharena and arc-agi
+benchmarks do, carry ``results`` plus a sparse ``cost_per_task`` and use the
+same ``score_weight``/``cost_weight`` keys.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from yaml_io import dump_yaml
+
+
+def generate_corpus(
+    root: Path,
+    n_benchmarks: int,
+    n_aliases: int,
+    benchmarks_per_mapping: int = 4,
+    aliases_per_slug: int = 3,
+    coverage: float = 0.3,
+    cost_fraction: float = 0.5,
+    unmapped_fraction: float = 0.05,
+    seed: int = 0,
+) -> Path:
+    """Write a synthetic corpus under ``root`` and return ``root``.
+
+    ``n_aliases`` raw model names are split evenly across
+    ``ceil(n_benchmarks / benchmarks_per_mapping)`` mapping files. Every
+    benchmark reports scores for a ``coverage`` fraction of its mapping file's
+    aliases, and costs for a ``cost_fraction`` of those. A
+    ``unmapped_fraction`` of aliases map to ``null`` like freshly scraped
+    entries awaiting a slug.
+    """
+
+    rng = np.random.default_rng(seed)
+    bench_dir = root / "data" / "raw" / "benchmarks"
+    mapping_dir = root / "data" / "config" / "mappings"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    mapping_dir.mkdir(parents=True, exist_ok=True)
+    (root / "data" / "processed" / "benchmarks").mkdir(parents=True, exist_ok=True)
+
+    n_mappings = max(1, -(-n_benchmarks // benchmarks_per_mapping))
+    alias_groups = np.array_split(np.arange(n_aliases), n_mappings)
+    # Each mapping file holds a consecutive alias range, so ``alias % n_slugs``
+    # keeps slugs distinct within a file as long as no range exceeds
+    # ``n_slugs``. Otherwise one benchmark would report the same model twice.
+    largest_group = max(len(group) for group in alias_groups)
+    n_slugs = max(1, n_aliases // aliases_per_slug, largest_group)
+    # Latent model quality and per-model cost so the ALS sees rank 1 structure.
+    quality = rng.normal(size=n_slugs)
+    model_cost = rng.lognormal(mean=-1.0, sigma=1.0, size=n_slugs)
+
+    alias_slug: dict[int, Optional[int]] = {}
+    for m, group in enumerate(alias_groups):
+        mapping = {}
+        for a in group:
+            slug = int(a) % n_slugs
+            if rng.random() < unmapped_fraction:
+                slug = None
+            alias_slug[int(a)] = slug
+            mapping[f"model-{a:06d}"] = None if slug is None else f"slug-{slug:06d}"
+        (mapping_dir / f"mapping-{m:04d}.yaml").write_text(
+            dump_yaml(mapping, sort_keys=False)
+        )
+
+    for b in range(n_benchmarks):
+        m = b // benchmarks_per_mapping
+        group = alias_groups[m]
+        size = min(len(group), max(1, int(round(len(group) * coverage))))
+        members = rng.choice(group, size=size, replace=False) if len(group) else []
+        difficulty = rng.lognormal(sigma=0.5)
+        results = {}
+        cost_per_task = {}
+        for a in members:
+            slug = alias_slug[int(a)]
+            latent = quality[slug] if slug is not None else rng.normal()
+            name = f"model-{a:06d}"
+            results[name] = round(float(50 + 15 * latent + rng.normal(scale=3)), 1)
+            if slug is not None and rng.random() < cost_fraction:
+                noise = rng.lognormal(sigma=0.2)
+                cost_per_task[name] = round(
+                    float(model_cost[slug] * difficulty * noise), 4
+                )
+        data = {
+            "benchmark": f"Synthetic Benchmark {b}",
+            "description": "Synthetic benchmark for performance testing",
+            "website": None,
+            "github": None,
+            "score_weight": 1,
+            "cost_weight": 1,
+            "model_name_mapping_file": f"mapping-{m:04d}.yaml",
+            "private_holdout": False,
+            "results": results,
+        }
+        if cost_per_task:
+            data["cost_per_task"] = cost_per_task
+        (bench_dir / f"bench-{b:05d}.yaml").write_text(
+            dump_yaml(data, sort_keys=False)
+        )
+
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", type=Path, help="directory to write the corpus to")
+    parser.add_argument("--benchmarks", type=int, default=100)
+    parser.add_argument("--aliases", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_corpus(args.root, args.benchmarks, args.aliases, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
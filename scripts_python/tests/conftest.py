@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_yaml_cache(monkeypatch) -> None:
+    """Keep tests from adding parse cache entries for their temporary files."""
+    monkeypatch.setenv("YAML_CACHE_DIR", "")
+
+
+@pytest.fixture(autouse=True)
+def no_history_env(monkeypatch) -> None:
+    """Keep ``HISTORY_DB`` from sending test runs to a shared database."""
+    monkeypatch.delenv("HISTORY_DB", raising=False)
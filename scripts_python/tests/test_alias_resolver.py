@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alias_resolver import AliasResolver
+
+
+def _frame(mapping_file: str, mapping: dict) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "alias": list(mapping),
+            "slug": list(mapping.values()),
+            "model_name_mapping_file": mapping_file,
+        }
+    )
+
+
+def test_resolve_matches_merge() -> None:
+    frames = [
+        _frame("a", {"Model X": "slug-x", "Model Y": None, "Shared": "slug-s1"}),
+        _frame("b", {"Shared": "slug-s2", "Model Z": "slug-z"}),
+        _frame("empty", {}),
+    ]
+    resolver = AliasResolver.from_frames(frames)
+    bench = pd.DataFrame(
+        {
+            "alias": ["Shared", "Model X", "Shared", "Model Y", "Unknown", "Model Z"],
+            "model_name_mapping_file": ["b", "a", "a", "a", "a", "a"],
+        }
+    )
+
+    expected = bench.merge(
+        pd.concat(frames), on=["alias", "model_name_mapping_file"], how="left"
+    )["slug"]
+    resolved = resolver.resolve(bench["model_name_mapping_file"], bench["alias"])
+
+    assert len(resolver) == 5
+    assert resolved.tolist() == ["slug-s2", "slug-x", "slug-s1", None, None, None]
+    assert pd.Series(resolved).isna().tolist() == expected.isna().tolist()
+    assert resolver.unmapped(bench["model_name_mapping_file"], bench["alias"]) == {
+        "a": ["Model Y", "Unknown", "Model Z"]
+    }
+
+
+def test_empty_resolver() -> None:
+    resolver = AliasResolver.from_frames([])
+    assert resolver.resolve(["a"], ["Model X"]).tolist() == [None]
+    assert resolver.resolve([], []).tolist() == []
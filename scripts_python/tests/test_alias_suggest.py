@@ -0,0 +1,132 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alias_suggest import SlugIndex, confidence, features
+from update_mappings import update_all_mappings
+
+MODELS = {
+    "claude-sonnet-4.yaml": {
+        "claude-sonnet-4-nothinking": "Claude 4 Sonnet (no thinking)",
+        "claude-sonnet-4-thinking": "Claude 4 Sonnet (thinking)",
+    },
+    "claude-opus-4.yaml": {
+        "claude-opus-4-nothinking": "Claude 4 Opus (no thinking)",
+        "claude-opus-4-thinking": "Claude 4 Opus (thinking)",
+    },
+    "gpt-5.yaml": {"gpt-5-high": "GPT-5 (high)", "gpt-5-low": "GPT-5 (low)"},
+    "gpt-5-mini.yaml": {"gpt-5-mini-high": "GPT-5 mini (high)"},
+}
+
+
+def _write(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def _config(tmp_path: Path) -> Path:
+    for name, efforts in MODELS.items():
+        _write(
+            tmp_path / "config" / "models" / name,
+            {"provider": "Test", "reasoning_efforts": efforts},
+        )
+    return tmp_path / "config"
+
+
+def test_suggests_slugs_for_vendor_aliases(tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    mapped = pd.DataFrame(
+        {
+            "alias": [
+                "claude-sonnet-4-20250514-thinking-16k",
+                "gpt-5-2025-08-07-high",
+            ],
+            "slug": ["claude-sonnet-4-thinking", "gpt-5-high"],
+        }
+    )
+    index = SlugIndex.build(config / "models", [mapped])
+
+    ranked = index.suggest("claude-4-sonnet-20250514-thinking-64k")
+    assert ranked[0][0] == "claude-sonnet-4-thinking"
+    assert index.suggest("gpt-5-mini (high)")[0][0] == "gpt-5-mini-high"
+    assert index.suggest("GPT-5 (high)")[0] == ("gpt-5-high", 1.0)
+    assert index.suggest("???") == []
+    assert confidence(ranked) == ranked[0][1] - ranked[1][1]
+
+
+def test_scores_are_idf_weighted_cosine_similarities(tmp_path: Path) -> None:
+    index = SlugIndex.build(_config(tmp_path) / "models", [])
+    names = [
+        (slug, text)
+        for efforts in MODELS.values()
+        for slug, name in efforts.items()
+        for text in (slug, name)
+    ]
+    vocab = sorted(index.feature_ids, key=index.feature_ids.get)
+
+    def vector(text: str) -> np.ndarray:
+        feats = set(features(text))
+        known = np.array([f in feats for f in vocab]) * index.idf
+        unknown = sum(f not in index.feature_ids for f in feats)
+        return known, np.sqrt(known @ known + unknown * index.unknown_idf**2)
+
+    for alias in ["claude opus 4 thinking 32k", "gpt-5-low-2025", "sonnet"]:
+        q, q_norm = vector(alias)
+        best = {}
+        for slug, name in names:
+            d, d_norm = vector(name)
+            best[slug] = max(best.get(slug, 0.0), q @ d / (q_norm * d_norm))
+        expected = sorted(best.items(), key=lambda item: -item[1])[:3]
+        expected = [(slug, score) for slug, score in expected if score > 0]
+        got = index.suggest(alias)
+        assert [slug for slug, _ in got] == [slug for slug, _ in expected]
+        np.testing.assert_allclose([s for _, s in got], [s for _, s in expected])
+
+
+def test_update_mappings_reports_and_applies_suggestions(tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    bench_dir = tmp_path / "bench"
+    mapping_dir = config / "mappings"
+    results = {"gpt-5-2025-08-07 (high)": 1.0, "Claude 4 Opus (thinking)": 2.0}
+    _write(
+        bench_dir / "bench.yaml",
+        {"model_name_mapping_file": "map.yaml", "results": {**results, "mystery": 3}},
+    )
+    _write(mapping_dir / "map.yaml", {"mystery": None})
+    report_path = config / "mapping-suggestions.yaml"
+
+    update_all_mappings(bench_dir, mapping_dir)
+    report = yaml.safe_load(report_path.read_text())["map.yaml"]
+    assert set(report) == {*results, "mystery"}
+    top = report["Claude 4 Opus (thinking)"]
+    assert top["candidates"][0] == {"slug": "claude-opus-4-thinking", "similarity": 1.0}
+    assert "applied" not in top
+    mapping = yaml.safe_load((mapping_dir / "map.yaml").read_text())
+    assert set(mapping.values()) == {None}
+
+    # Only the exact display name leads its runner-up by enough.
+    assert report["gpt-5-2025-08-07 (high)"]["confidence"] < 0.3 < top["confidence"]
+    update_all_mappings(bench_dir, mapping_dir, min_confidence=0.3)
+    mapping = yaml.safe_load((mapping_dir / "map.yaml").read_text())
+    assert mapping == {
+        "Claude 4 Opus (thinking)": "claude-opus-4-thinking",
+        "gpt-5-2025-08-07 (high)": None,
+        "mystery": None,
+    }
+    report = yaml.safe_load(report_path.read_text())["map.yaml"]
+    assert report["Claude 4 Opus (thinking)"]["applied"] == "claude-opus-4-thinking"
+
+    # Nothing left to suggest: the stale report goes away.
+    results = {"Claude 4 Opus (thinking)": 2.0}
+    _write(
+        bench_dir / "bench.yaml",
+        {"model_name_mapping_file": "map.yaml", "results": results},
+    )
+    update_all_mappings(bench_dir, mapping_dir)
+    assert not report_path.exists()
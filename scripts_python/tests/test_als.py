@@ -0,0 +1,134 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from als import AlsFactors, initial_factors
+from process_data import compute_normalization_factors_sparse
+
+
+def _costs(n_benchmarks: int, n_slugs: int, rank: int = 1, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    u = rng.uniform(0.5, 5.0, (n_benchmarks, rank))
+    v = rng.uniform(0.1, 2.0, (n_slugs, rank))
+    rows, cols = np.nonzero(rng.random((n_benchmarks, n_slugs)) < 0.4)
+    cost = (u[rows] * v[cols]).sum(axis=1) * rng.lognormal(0.0, 0.2, len(rows))
+    return pd.DataFrame(
+        {
+            "benchmark": [f"b{i:02d}" for i in rows],
+            "slug": [f"m{j:03d}" for j in cols],
+            "cost": cost,
+        }
+    )
+
+
+def test_warm_start_matches_cold_start() -> None:
+    costs = _costs(30, 80)
+    weights = pd.Series(1.0, index=costs["benchmark"].unique())
+    weights.iloc[:5] = 3.0
+    previous = compute_normalization_factors_sparse(
+        costs, weights, iterations=5000, tol=1e-10, canonical=True
+    )
+
+    updated = costs.copy()
+    updated.loc[updated.index[::20], "cost"] *= 1.1
+    updated = pd.concat(
+        [
+            updated,
+            pd.DataFrame(
+                {
+                    "benchmark": ["b00", "b01", "new-bench", "new-bench"],
+                    "slug": ["new-model", "new-model", "m000", "m001"],
+                    "cost": [2.0, 3.0, 0.5, 0.7],
+                }
+            ),
+        ],
+        ignore_index=True,
+    )
+    cold = compute_normalization_factors_sparse(
+        updated, weights, iterations=5000, tol=1e-10, canonical=True
+    )
+    warm = compute_normalization_factors_sparse(
+        updated,
+        weights,
+        iterations=5000,
+        tol=1e-10,
+        init=previous.state,
+        canonical=True,
+    )
+
+    assert cold.converged and warm.converged
+    assert warm.iterations < cold.iterations
+    pd.testing.assert_series_equal(warm.factors, cold.factors, rtol=1e-7)
+
+    rerun = compute_normalization_factors_sparse(
+        updated, weights, iterations=5000, tol=1e-10, init=warm.state, canonical=True
+    )
+    assert rerun.iterations == 1
+    pd.testing.assert_series_equal(rerun.factors, cold.factors, rtol=1e-7)
+
+
+def test_initial_factors_seeds_new_entries() -> None:
+    init = AlsFactors(
+        pd.DataFrame({0: [1.0, 2.0]}, index=["b1", "b2"]),
+        pd.DataFrame({0: [3.0, 5.0]}, index=["m1", "m2"]),
+    )
+    row_keys = pd.Index(["b1", "b2", "b3"])
+    col_keys = pd.Index(["m1", "m2", "m3"])
+    # m3 is new and seen by b1; b3 is new and sees m1 and m3.
+    rows = np.array([0, 0, 1, 2, 2])
+    cols = np.array([0, 2, 1, 0, 2])
+    values = np.array([3.0, 7.0, 10.0, 12.0, 28.0])
+
+    u, v = initial_factors(
+        row_keys, col_keys, rows, cols, values, np.ones(3), init=init
+    )
+
+    np.testing.assert_allclose(v[:, 0], [3.0, 5.0, 7.0], rtol=1e-2)
+    np.testing.assert_allclose(u[:, 0], [1.0, 2.0, 4.0], rtol=1e-2)
+
+
+def test_rank_k_fits_low_rank_costs() -> None:
+    costs = _costs(20, 40, rank=2, seed=1)
+
+    rank1 = compute_normalization_factors_sparse(
+        costs, iterations=5000, tol=1e-9, canonical=True
+    )
+    rank2 = compute_normalization_factors_sparse(
+        costs, iterations=5000, tol=1e-7, rank=2, canonical=True
+    )
+    warm = compute_normalization_factors_sparse(
+        costs, iterations=5000, tol=1e-7, rank=2, init=rank2.state, canonical=True
+    )
+
+    assert rank2.converged and warm.converged
+    assert warm.iterations < 10
+    pd.testing.assert_series_equal(warm.factors, rank2.factors, rtol=1e-4)
+    assert rank2.residual < 0.9 * rank1.residual
+    assert rank2.state.rank == 2
+    assert list(rank2.state.slugs.index) == sorted(costs["slug"].unique())
+    assert (rank2.factors > 0).all()
+
+
+def test_invalid_rank_rejected() -> None:
+    with pytest.raises(ValueError):
+        compute_normalization_factors_sparse(_costs(3, 3), rank=0)
+
+
+def test_factors_round_trip(tmp_path: Path) -> None:
+    state = compute_normalization_factors_sparse(_costs(5, 10)).state
+    path = tmp_path / "als" / "factors.pkl"
+
+    assert AlsFactors.load(path) is None
+    state.save(path)
+    loaded = AlsFactors.load(path)
+
+    pd.testing.assert_frame_equal(loaded.benchmarks, state.benchmarks)
+    pd.testing.assert_frame_equal(loaded.slugs, state.slugs)
+    path.write_bytes(b"garbage")
+    assert AlsFactors.load(path) is None
@@ -0,0 +1,68 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_pipeline import run_size
+from process_data import load_benchmark, load_mapping_file
+from synthetic_corpus import generate_corpus
+
+
+def test_generated_corpus_matches_raw_schema(tmp_path: Path) -> None:
+    generate_corpus(tmp_path, n_benchmarks=6, n_aliases=40, seed=1)
+
+    bench_files = sorted((tmp_path / "data" / "raw" / "benchmarks").glob("*.yaml"))
+    mapping_dir = tmp_path / "data" / "config" / "mappings"
+    assert len(bench_files) == 6
+    assert len(list(mapping_dir.glob("*.yaml"))) == 2
+
+    for bench_file in bench_files:
+        data = yaml.safe_load(bench_file.read_text())
+        assert {"benchmark", "score_weight", "cost_weight", "results"} <= set(data)
+        mapping = yaml.safe_load(
+            (mapping_dir / data["model_name_mapping_file"]).read_text()
+        )
+        assert set(data["results"]) <= set(mapping)
+        assert set(data.get("cost_per_task", {})) <= set(data["results"])
+
+        df = load_benchmark(bench_file).merge(
+            load_mapping_file(mapping_dir / data["model_name_mapping_file"]),
+            on=["alias", "model_name_mapping_file"],
+        )
+        assert not df["slug"].dropna().duplicated().any()
+
+
+def test_run_size_reports_every_stage(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "yaml"
+    monkeypatch.setenv("YAML_CACHE_DIR", str(cache_dir))
+    report = run_size(4, 30, trace_memory=True)
+    # The parse cache was off during the run and is back afterwards.
+    assert not cache_dir.exists()
+    assert os.environ["YAML_CACHE_DIR"] == str(cache_dir)
+
+    assert list(report["stages"]) == [
+        "load_benchmarks",
+        "load_mappings",
+        "load_models",
+        "resolve_aliases",
+        "normalize_benchmark_scores",
+        "compute_normalization_factors",
+        "write_outputs",
+        "write_snapshot",
+        "write_leaderboard",
+        "write_families",
+        "write_history",
+        "update_all_mappings",
+    ]
+    for stage in report["stages"].values():
+        assert stage["wall_s"] >= 0
+        assert stage["peak_mb"] >= 0
+    assert report["stages"]["load_benchmarks"]["rows"] > 0
+    assert report["stages"]["write_history"]["rows"] > 0
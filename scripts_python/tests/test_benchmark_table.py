@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alias_resolver import AliasResolver
+from benchmark_table import BenchmarkTable, read_benchmark
+from process_data import load_mapping_file, normalize_benchmark_scores
+
+
+def _write(path: Path, data) -> Path:
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+    return path
+
+
+def test_read_benchmark_aligns_scores_and_costs(tmp_path: Path) -> None:
+    bench = read_benchmark(
+        _write(
+            tmp_path / "b1.yaml",
+            {
+                "model_name_mapping_file": "map.yaml",
+                "cost_weight": 0.5,
+                "results": {"Zed": 1, "Alpha": "n/a", "Mid": "0.25"},
+                "cost_per_task": {"Beta": 2.0, "Zed": 0.1},
+            },
+        )
+    )
+
+    assert bench.name == "b1"
+    assert bench.model_name_mapping_file == "map"
+    assert (bench.score_weight, bench.cost_weight) == (1.0, 0.5)
+    assert bench.alias.tolist() == ["Alpha", "Beta", "Mid", "Zed"]
+    np.testing.assert_array_equal(bench.score, [np.nan, np.nan, 0.25, 1.0])
+    np.testing.assert_array_equal(bench.cost, [np.nan, 2.0, np.nan, 0.1])
+
+    frame = bench.to_frame()
+    assert frame["benchmark"].tolist() == ["b1"] * 4
+    assert frame["cost_weight"].tolist() == [0.5] * 4
+
+
+def test_table_keeps_constants_once_and_resolves_to_codes(tmp_path: Path) -> None:
+    _write(tmp_path / "map.yaml", {"A": "slug-z", "B": None, "C": "slug-a"})
+    _write(tmp_path / "other.yaml", {"A": "slug-m"})
+    resolver = AliasResolver.from_frames(
+        load_mapping_file(tmp_path / name) for name in ("map.yaml", "other.yaml")
+    )
+    benchmarks = [
+        read_benchmark(
+            _write(
+                tmp_path / f"{name}.yaml",
+                {"model_name_mapping_file": mapping, "results": results},
+            )
+        )
+        for name, mapping, results in [
+            ("zeta", "map.yaml", {"A": 1.0, "B": 2.0, "C": 3.0, "D": 4.0}),
+            ("alpha", "other.yaml", {"A": 5.0}),
+        ]
+    ]
+
+    table = BenchmarkTable.from_benchmarks(benchmarks)
+    assert len(table) == 5
+    assert table.meta.index.tolist() == ["alpha", "zeta"]
+    assert table.meta.loc["zeta", "model_name_mapping_file"] == "map"
+    assert isinstance(table.rows["benchmark"].dtype, pd.CategoricalDtype)
+    assert table.rows["benchmark"].tolist() == ["zeta"] * 4 + ["alpha"]
+
+    resolved = table.resolve(resolver)
+    assert resolved.rows["benchmark"].tolist() == ["zeta", "zeta", "alpha"]
+    assert resolved.rows["slug"].tolist() == ["slug-z", "slug-a", "slug-m"]
+    assert resolved.rows["score"].tolist() == [1.0, 3.0, 5.0]
+
+    # Sorting by category codes orders rows like sorting the names.
+    by_codes = resolved.rows.sort_values(["benchmark", "slug"])
+    by_names = resolved.rows.astype(object).sort_values(["benchmark", "slug"])
+    assert by_codes.index.tolist() == by_names.index.tolist()
+
+    normalized = normalize_benchmark_scores(resolved.rows)
+    assert normalized["normalized_score"].tolist() == [0.0, 100.0, 100.0]
+
+
+def test_read_benchmark_picks_normalization(tmp_path: Path) -> None:
+    data = {"model_name_mapping_file": "map.yaml", "results": {"A": 1200.0}}
+    assert read_benchmark(_write(tmp_path / "b1.yaml", data)).normalization == "minmax"
+
+    elo = _write(tmp_path / "b2.yaml", {**data, "normalization": "elo"})
+    table = BenchmarkTable.from_benchmarks([read_benchmark(elo)])
+    assert table.meta["normalization"].tolist() == ["elo"]
+    bad = _write(tmp_path / "b3.yaml", {**data, "normalization": "softmax"})
+    with pytest.raises(ValueError, match="Unknown normalization 'softmax'"):
+        read_benchmark(bad)
@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bootstrap import (
+    ScoreMatrix,
+    bootstrap_intervals,
+    rank_rows,
+    resample_chunk,
+    tail_size,
+)
+from leaderboard import aggregate_leaderboard
+
+
+def _long_frame(rng: np.random.Generator, n_slugs: int, n_benchmarks: int):
+    observed = rng.random((n_slugs, n_benchmarks)) < 0.6
+    s, b = np.nonzero(observed)
+    return pd.DataFrame(
+        {
+            "benchmark": [f"b{i:02d}" for i in b],
+            "slug": [f"m{i:03d}" for i in s],
+            "normalized_score": rng.uniform(0, 100, len(s)).round(1),
+            "normalized_cost": np.nan,
+        }
+    )
+
+
+def test_resamples_match_naive_recomputation() -> None:
+    rng = np.random.default_rng(0)
+    df = _long_frame(rng, 25, 8)
+    benchmarks = sorted(df["benchmark"].unique())
+    weights = pd.Series(rng.choice([0.5, 1.0, 2.0], 8), index=benchmarks)
+    matrix = ScoreMatrix.from_long(df, weights)
+    seed = np.random.SeedSequence(7)
+
+    estimates, ranks = resample_chunk((matrix, seed, 50))
+    counts = np.random.default_rng(seed).multinomial(8, np.full(8, 1 / 8), size=50)
+    for r in range(50):
+        # Rebuild the resampled suite and average the slow way.
+        drawn = np.repeat(weights.index, counts[r])
+        rows = pd.concat([df[df["benchmark"] == b] for b in drawn])
+        w = weights[rows["benchmark"]].to_numpy()
+        sums = (rows["normalized_score"] * w).groupby(rows["slug"].to_numpy()).sum()
+        totals = pd.Series(w).groupby(rows["slug"].to_numpy()).sum()
+        expected = (sums / totals).reindex(matrix.slugs)
+        np.testing.assert_allclose(estimates[r], expected, rtol=1e-12)
+        order = expected.fillna(-np.inf).rank(ascending=False, method="min")
+        assert ranks[r].tolist() == order.astype(int).tolist()
+
+
+def test_rank_rows_shares_ties_and_puts_missing_last() -> None:
+    estimates = np.array([[3.0, 1.0, 3.0, np.nan, 2.0, np.nan]])
+    assert rank_rows(estimates).tolist() == [[1, 4, 1, 5, 3, 5]]
+
+
+def test_intervals_are_reproducible_and_cover_the_estimate() -> None:
+    rng = np.random.default_rng(1)
+    df = _long_frame(rng, 40, 12)
+    weights = pd.Series(1.0, index=sorted(df["benchmark"].unique()))
+    matrix = ScoreMatrix.from_long(df, weights)
+
+    first = bootstrap_intervals(matrix, resamples=1500, seed=3, chunk_size=400)
+    again = bootstrap_intervals(matrix, resamples=1500, seed=3, chunk_size=400, jobs=2)
+    pd.testing.assert_frame_equal(first, again)
+    other = bootstrap_intervals(matrix, resamples=1500, seed=4, chunk_size=400)
+    assert not first.equals(other)
+
+    board = aggregate_leaderboard(df, weights, weights, resamples=1500, seed=3)
+    board = board.set_index("slug")
+    assert (board["score_low"] <= board["average_score"]).all()
+    assert (board["average_score"] <= board["score_high"]).all()
+    assert (board["rank_low"] <= board["rank"]).all()
+    assert (board["rank"] <= board["rank_high"]).all()
+    assert (board["score_low"] < board["score_high"]).all()
+
+    empty = ScoreMatrix.from_long(df.iloc[:0], weights)
+    assert bootstrap_intervals(empty, resamples=10).empty
+
+
+def test_tails_give_the_quantiles_of_all_resamples() -> None:
+    rng = np.random.default_rng(2)
+    df = _long_frame(rng, 30, 4)
+    # Never scored, and scored on a single benchmark.
+    extra = pd.DataFrame(
+        {
+            "benchmark": ["b00", "b01"],
+            "slug": ["zz0", "zz1"],
+            "normalized_score": [np.nan, 50.0],
+        }
+    )
+    df = pd.concat([df, extra], ignore_index=True)
+    weights = pd.Series(1.0, index=sorted(df["benchmark"].unique()))
+    matrix = ScoreMatrix.from_long(df, weights)
+
+    for resamples, chunk_size, confidence in [(1000, 300, 0.95), (40, 7, 0.8)]:
+        assert tail_size(resamples, confidence) < chunk_size
+        got = bootstrap_intervals(
+            matrix, resamples, confidence, seed=5, chunk_size=chunk_size
+        )
+        seeds = np.random.SeedSequence(5).spawn(-(-resamples // chunk_size))
+        chunks = [
+            resample_chunk((matrix, s, min(chunk_size, resamples - i * chunk_size)))
+            for i, s in enumerate(seeds)
+        ]
+        estimates = np.concatenate([c[0] for c in chunks])
+        ranks = np.concatenate([c[1] for c in chunks])
+        alpha = (1 - confidence) / 2
+        with np.errstate(invalid="ignore"), pytest.warns(RuntimeWarning):
+            low, high = np.nanquantile(estimates, [alpha, 1 - alpha], axis=0)
+        np.testing.assert_allclose(got["score_low"], low, rtol=1e-12)
+        np.testing.assert_allclose(got["score_high"], high, rtol=1e-12)
+        assert np.isnan(got.loc["zz0", "score_low"])
+        expected = np.quantile(ranks, alpha, axis=0, method="lower")
+        assert got["rank_low"].tolist() == expected.tolist()
+        expected = np.quantile(ranks, 1 - alpha, axis=0, method="higher")
+        assert got["rank_high"].tolist() == expected.tolist()
@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cli
+from bootstrap import RESAMPLES
+from incremental import output_settings
+
+SCRIPT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _make_root(root: Path) -> Path:
+    bench_dir = root / "data" / "raw" / "benchmarks"
+    mapping_dir = root / "data" / "config" / "mappings"
+    bench_dir.mkdir(parents=True)
+    mapping_dir.mkdir(parents=True)
+    (root / "data" / "processed").mkdir(parents=True)
+    (bench_dir / "b1.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "model_name_mapping_file": "map.yaml",
+                "results": {"Model A": 1.0, "Model B": 0.5},
+                "cost_per_task": {"Model A": 0.1, "Model B": 0.3},
+            },
+            sort_keys=False,
+        )
+    )
+    (mapping_dir / "map.yaml").write_text(
+        yaml.safe_dump({"Model A": "slug-a", "Model B": None}, sort_keys=False)
+    )
+    return root
+
+
+def test_check_tracks_processed_inputs(tmp_path: Path, capsys) -> None:
+    root = _make_root(tmp_path)
+    bench = root / "data" / "raw" / "benchmarks" / "b1.yaml"
+
+    assert cli.main(["--root", str(root), "check"]) == 1
+    assert cli.main(["--root", str(root), "process"]) == 0
+    assert (root / "data" / "processed" / "benchmarks" / "b1.yaml").exists()
+    assert cli.main(["--root", str(root), "check"]) == 0
+
+    # Rewriting identical bytes only changes the stat, not the contents.
+    bench.write_text(bench.read_text())
+    assert cli.main(["--root", str(root), "check"]) == 0
+    capsys.readouterr()
+    assert cli.main(["--root", str(root), "process"]) == 0
+    assert "up to date" in capsys.readouterr().out
+
+    bench.write_text(bench.read_text().replace("0.5", "0.6"))
+    assert cli.main(["--root", str(root), "check"]) == 1
+    assert "stale: benchmarks/b1.yaml" in capsys.readouterr().out
+    assert cli.main(["--root", str(root), "process"]) == 0
+    assert cli.main(["--root", str(root), "check"]) == 0
+
+    (root / "data" / "processed" / "snapshot.json").unlink()
+    assert cli.main(["--root", str(root), "check"]) == 1
+
+
+def test_check_validates_files(tmp_path: Path, capsys) -> None:
+    root = _make_root(tmp_path)
+    bench_dir = root / "data" / "raw" / "benchmarks"
+    good = bench_dir / "b1.yaml"
+    no_mapping = bench_dir / "b2.yaml"
+    no_mapping.write_text(yaml.safe_dump({"results": {"Model A": 1.0}}))
+    bad_score = bench_dir / "b3.yaml"
+    bad_score.write_text(
+        yaml.safe_dump(
+            {"model_name_mapping_file": "missing.yaml", "results": {"Model A": "high"}}
+        )
+    )
+    bad_mapping = root / "data" / "config" / "mappings" / "bad.yaml"
+    bad_mapping.write_text(yaml.safe_dump({"Model A": ["slug-a"]}))
+
+    assert cli.main(["--root", str(root), "check", str(good)]) == 0
+    capsys.readouterr()
+    files = [str(no_mapping), str(bad_score), str(bad_mapping)]
+    assert cli.main(["--root", str(root), "check", *files]) == 1
+    out = capsys.readouterr().out
+    assert "b2.yaml: model_name_mapping_file not found" in out
+    assert "mapping file missing.yaml does not exist" in out
+    assert "non-numeric results for Model A" in out
+    assert "bad.yaml: slugs must be strings or null" in out
+
+
+def test_up_to_date_check_does_not_import_pandas(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    assert cli.main(["--root", str(root), "process"]) == 0
+
+    code = (
+        "import sys, cli\n"
+        f"status = cli.main(['--root', {str(root)!r}, 'process'])\n"
+        "assert 'pandas' not in sys.modules\n"
+        "sys.exit(status)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SCRIPT_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SCRIPT_DIR, env=env, capture_output=True
+    )
+    assert result.returncode == 0, result.stderr.decode()
+    assert b"up to date" in result.stdout
+
+
+def test_process_reruns_when_options_change(tmp_path: Path, capsys) -> None:
+    root = _make_root(tmp_path)
+    leaderboard = root / "data" / "processed" / "leaderboard.json"
+    assert cli.main(["--root", str(root), "process", "--bootstrap", "0"]) == 0
+    capsys.readouterr()
+
+    args = ["--root", str(root), "process", "--bootstrap", "0", "--impute-rank", "1"]
+    assert cli.main(args) == 0
+    assert "settings/impute_rank" in capsys.readouterr().out
+    assert json.loads(leaderboard.read_text())["impute_rank"] == 1
+    assert cli.main(args) == 0
+    assert "up to date" in capsys.readouterr().out
+
+    # The default resample count differs from an explicit 0.
+    assert cli.main(["--root", str(root), "process", "--impute-rank", "1"]) == 0
+    assert "settings/resamples" in capsys.readouterr().out
+    assert json.loads(leaderboard.read_text())["resamples"] == RESAMPLES
+
+    settings = output_settings(impute_rank=1, parquet=True)
+    assert cli.stale_outputs(root, settings) == [
+        "settings/parquet",
+        "processed/snapshot.parquet",
+    ]
+    # ``check`` does not compare options.
+    assert cli.stale_outputs(root) == []
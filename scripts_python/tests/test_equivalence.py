@@ -0,0 +1,119 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from equivalence import (
+    check,
+    compare_outputs,
+    digit_difference,
+    extract_scripts,
+    prepare_inputs,
+    record,
+    run_once,
+)
+from history import HistoryStore
+
+
+def test_digit_difference_counts_last_published_digit() -> None:
+    assert digit_difference(1.23449, 1.2345) == 0
+    assert digit_difference(1.234, 1.235) == pytest.approx(1)
+    # Units follow the larger value's last digit.
+    assert digit_difference(99.99, 100.0) == pytest.approx(0.1)
+    assert digit_difference(0.0, 0.001) == pytest.approx(1000)
+
+
+def test_compare_outputs_reports_each_kind_of_difference() -> None:
+    reference = {
+        "b1": {
+            "a": {"score": 1.0, "cost": 0.1234},
+            "b": {"score": 0.5},
+            "c": {"score": 0.25},
+        },
+        "b2": {"a": {"score": 2.0}},
+    }
+    assert compare_outputs(reference, reference)["equivalent"]
+
+    candidate = {
+        "b1": {
+            "b": {"score": 0.5, "pareto_depth": 1},
+            "a": {"score": 1.0, "cost": 0.1235},
+            "d": {"score": 0.1},
+        },
+        "b3": {},
+    }
+    report = compare_outputs(candidate=candidate, reference=reference)
+    assert not report["equivalent"]
+    assert report["within_tolerance"] == 1
+    assert [(d["kind"], d.get("slug")) for d in report["differences"]] == [
+        ("order", None),
+        ("missing row", "c"),
+        ("extra row", "d"),
+        ("extra value", "b"),
+        ("missing benchmark", None),
+        ("extra benchmark", None),
+    ]
+    assert report["total_differences"] == 6
+
+    strict = compare_outputs(reference, candidate, tolerance=0)
+    assert ("value", "a") in [(d["kind"], d.get("slug")) for d in strict["differences"]]
+
+
+def test_record_then_check_on_a_synthetic_corpus(tmp_path: Path) -> None:
+    corpus = {"benchmarks": 4, "aliases": 40, "seed": 1}
+    baseline = record(tmp_path, corpus=corpus, args=["--bootstrap", "0"], repeat=1)
+    assert baseline["args"] == ["--bootstrap", "0"]
+    assert baseline["wall_s"] > 0 and baseline["max_rss_mb"] > 0
+    outputs = json.loads((tmp_path / "outputs.json").read_text())
+    assert len(outputs) == 4
+
+    report = check(tmp_path, max_slowdown=100, max_memory_growth=100, repeat=1)
+    assert report["outputs"]["equivalent"]
+    assert report["outputs"]["rows"] > 0
+    assert report["passed"]
+
+    # A recorded output that no longer matches fails the check.
+    name = next(iter(outputs))
+    slug = next(iter(outputs[name]))
+    outputs[name][slug]["score"] += 1
+    (tmp_path / "outputs.json").write_text(json.dumps(outputs))
+    report = check(tmp_path, max_slowdown=100, max_memory_growth=100, repeat=1)
+    assert not report["passed"]
+    assert report["outputs"]["differences"][0]["slug"] == slug
+
+
+def test_run_once_leaves_the_callers_history_alone(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db = tmp_path / "scores.sqlite"
+    rows = pd.DataFrame(
+        {
+            "benchmark": ["real"],
+            "slug": ["model-a"],
+            "score": [1.0],
+            "normalized_score": [100.0],
+            "cost": [np.nan],
+            "normalized_cost": [np.nan],
+        }
+    )
+    with HistoryStore(db) as store:
+        store.append(rows)
+    before = db.read_bytes()
+    monkeypatch.setenv("HISTORY_DB", str(db))
+    monkeypatch.setenv("PIPELINE_PROFILE", str(tmp_path / "profile.json"))
+
+    prepare_inputs(tmp_path / "inputs", {"benchmarks": 3, "aliases": 20, "seed": 2})
+    extract_scripts(tmp_path / "scripts")
+    _, _, outputs = run_once(
+        tmp_path / "inputs", tmp_path / "scripts", ["--bootstrap", "0"]
+    )
+
+    assert len(outputs) == 3
+    assert db.read_bytes() == before
+    assert not (tmp_path / "profile.json").exists()
@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from families import families_bundle, family_rollups, model_index, read_model_config
+
+
+def _config(path: Path, efforts, provider="Acme") -> pd.DataFrame:
+    path.write_text(
+        yaml.safe_dump(
+            {"provider": provider, "reasoning_efforts": {e: e for e in efforts}},
+            sort_keys=False,
+        )
+    )
+    return read_model_config(path)
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> pd.DataFrame:
+    return model_index(
+        [
+            _config(tmp_path / "m.yaml", ["m-high", "m-low", "m-medium"]),
+            _config(tmp_path / "t.yaml", ["t-thinking", "t"], provider="Other"),
+            _config(tmp_path / "x.yaml", ["x-fast", "x-slow"]),
+            _config(tmp_path / "solo.yaml", ["solo"]),
+        ]
+    )
+
+
+def test_effort_ranks_follow_suffix_levels(index: pd.DataFrame) -> None:
+    ranks = index.set_index("slug")["effort_rank"].to_dict()
+    assert ranks == {
+        "m-low": 0,
+        "m-medium": 1,
+        "m-high": 2,
+        "t": 0,
+        "t-thinking": 1,
+        # Unknown suffixes keep the file order.
+        "x-fast": 0,
+        "x-slow": 1,
+        "solo": 0,
+    }
+    assert index.set_index("slug").loc["t", "effort"] == ""
+
+
+def test_family_rollups(index: pd.DataFrame) -> None:
+    df = pd.DataFrame(
+        {
+            "benchmark": ["b1"] * 5 + ["b2"] * 2,
+            "slug": ["m-low", "m-medium", "m-high", "t", "solo", "m-low", "t"],
+            "normalized_score": [60.0, 96.0, 100.0, 40.0, 90.0, 50.0, np.nan],
+            "normalized_cost": [1.0, 2.0, 5.0, np.nan, 1.0, np.nan, 3.0],
+        }
+    )
+    rollups = family_rollups(df, index)
+
+    assert rollups.index.tolist() == [("m", "b1"), ("m", "b2"), ("t", "b1")]
+    m = rollups.loc[("m", "b1")]
+    assert (m["best"], m["best_score"]) == ("m-high", 100.0)
+    # m-medium is within 95% of the best and cheaper.
+    assert (m["cheapest"], m["cheapest_cost"]) == ("m-medium", 2.0)
+    assert m["effort_slope"] == pytest.approx(20.0)
+    assert m["variants"] == 3
+    # One scored variant: no slope; no variant with a cost: no cheapest.
+    assert np.isnan(rollups.loc[("m", "b2"), "effort_slope"])
+    assert pd.isna(rollups.loc[("t", "b1"), "cheapest"])
+
+    overall = family_rollups(
+        df.groupby("slug", as_index=False).mean(numeric_only=True), index, by=()
+    )
+    bundle = families_bundle(index, rollups, overall)
+    assert list(bundle["families"]) == ["m", "t", "x"]
+    family = bundle["families"]["m"]
+    assert family["variants"] == {
+        "m-low": "low",
+        "m-medium": "medium",
+        "m-high": "high",
+    }
+    assert family["overall"]["best"] == "m-high"
+    assert family["benchmarks"]["b2"] == {
+        "best": "m-low",
+        "best_score": 50.0,
+        "variants": 1,
+    }
+    assert bundle["families"]["x"]["benchmarks"] == {}
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from file_watch import (
+    _EVENT,
+    IN_CLOSE_WRITE,
+    IN_Q_OVERFLOW,
+    InotifyWatcher,
+    PollingWatcher,
+)
+
+
+def test_polling_watcher_reports_changes(tmp_path: Path) -> None:
+    path = tmp_path / "a.yaml"
+    path.write_text("a: 1\n")
+    watcher = PollingWatcher([tmp_path], interval=0.01)
+
+    assert watcher.poll(0.05) == set()
+    path.write_text("a: 22\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+    assert watcher.poll(1.0) == {path}
+    path.unlink()
+    assert watcher.poll(1.0) == {path}
+
+
+def test_inotify_watcher_reports_changes(tmp_path: Path) -> None:
+    try:
+        watcher = InotifyWatcher([tmp_path])
+    except (OSError, AttributeError):
+        pytest.skip("inotify not available")
+    try:
+        path = tmp_path / "a.yaml"
+        path.write_text("a: 1\n")
+        (tmp_path / "notes.txt").write_text("ignored")
+        assert watcher.poll(1.0) == {path}
+        tmp = tmp_path / "b.tmp"
+        tmp.write_text("b: 1\n")
+        tmp.rename(tmp_path / "b.yaml")
+        path.unlink()
+        changed = set()
+        while more := watcher.poll(0.2):
+            changed |= more
+        assert changed == {path, tmp_path / "b.yaml"}
+    finally:
+        watcher.close()
+
+
+def test_inotify_overflow_reports_every_file(tmp_path: Path) -> None:
+    try:
+        watcher = InotifyWatcher([tmp_path])
+    except (OSError, AttributeError):
+        pytest.skip("inotify not available")
+    try:
+        paths = {tmp_path / "a.yaml", tmp_path / "b.yaml"}
+        for path in paths:
+            path.write_text("a: 1\n")
+        (tmp_path / "notes.txt").write_text("ignored")
+        name = b"c.yaml\0\0"
+        event = _EVENT.pack(next(iter(watcher.dirs)), IN_CLOSE_WRITE, 0, len(name))
+        assert watcher.parse(event + name) == {tmp_path / "c.yaml"}
+        overflow = _EVENT.pack(-1, IN_Q_OVERFLOW, 0, 0)
+        assert watcher.parse(overflow) == paths
+        assert watcher.parse(event + name + overflow) == paths | {tmp_path / "c.yaml"}
+    finally:
+        watcher.close()
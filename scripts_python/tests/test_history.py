@@ -0,0 +1,161 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import process_data
+from history import HistoryStore, default_path, format_timestamp
+
+
+def _rows(values: dict) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "benchmark": benchmark,
+                "slug": slug,
+                "score": score,
+                "normalized_score": score / 2,
+                "cost": np.nan,
+                "normalized_cost": np.nan,
+            }
+            for (benchmark, slug), score in values.items()
+        ]
+    )
+
+
+def test_append_stores_only_changes(tmp_path: Path) -> None:
+    with HistoryStore(tmp_path / "scores.sqlite") as store:
+        day1 = {("b1", "a"): 1.0, ("b1", "b"): 0.5, ("b2", "a"): 2.0}
+        assert store.append(_rows(day1), "2025-01-01") == 3
+        assert store.append(_rows(day1), "2025-01-02") == 0
+
+        day3 = {("b1", "a"): 1.0, ("b1", "b"): 0.7, ("b1", "c"): 0.1}
+        # b1/b changed, b1/c is new and b2/a is gone.
+        assert store.append(_rows(day3), "2025-01-03") == 3
+        assert store.append(_rows(day3), "2025-01-04") == 0
+
+        latest = store.latest()
+        assert list(zip(latest["benchmark"], latest["slug"], latest["score"])) == [
+            ("b1", "a", 1.0),
+            ("b1", "b", 0.7),
+            ("b1", "c", 0.1),
+        ]
+        assert np.isnan(latest["cost"]).all()
+        as_of = store.latest(as_of="2025-01-02")
+        assert sorted(as_of["slug"] + as_of["benchmark"]) == ["ab1", "ab2", "bb1"]
+        assert store.latest("b2").empty
+
+        # A pair that comes back is live again.
+        assert store.append(_rows({**day3, ("b2", "a"): 2.5}), "2025-01-05") == 1
+        assert store.latest("b2")["score"].tolist() == [2.5]
+
+
+def test_delta_and_trajectory(tmp_path: Path) -> None:
+    with HistoryStore(tmp_path / "scores.sqlite") as store:
+        store.append(_rows({("b1", "a"): 1.0, ("b1", "b"): 0.5}), "2025-01-01")
+        store.append(_rows({("b1", "a"): 1.0, ("b1", "b"): 0.6}), "2025-02-01")
+        store.append(_rows({("b1", "b"): 0.9, ("b2", "b"): 3.0}), "2025-03-01")
+
+        delta = store.delta_since("2025-01-15")
+        assert delta[["benchmark", "slug", "status"]].values.tolist() == [
+            ["b1", "a", "removed"],
+            ["b1", "b", "changed"],
+            ["b2", "b", "added"],
+        ]
+        assert delta["score_delta"].iloc[1] == np.float64(0.9) - np.float64(0.5)
+        assert store.delta_since("2025-03-01").empty
+
+        trajectory = store.trajectory("b", benchmark="b1")
+        assert trajectory["recorded_at"].tolist() == [
+            "2025-01-01T00:00:00.000000Z",
+            "2025-02-01T00:00:00.000000Z",
+            "2025-03-01T00:00:00.000000Z",
+        ]
+        assert trajectory["score"].tolist() == [0.5, 0.6, 0.9]
+        removed = store.trajectory("a")
+        assert removed["removed"].tolist() == [False, True]
+
+
+def test_format_timestamp() -> None:
+    assert format_timestamp("2025-07-01") == "2025-07-01T00:00:00.000000Z"
+    assert (
+        format_timestamp("2025-07-01T02:00:00.5+02:00")
+        == "2025-07-01T00:00:00.500000Z"
+    )
+    assert format_timestamp("2025-07-01T00:00:00Z") == "2025-07-01T00:00:00.000000Z"
+
+
+def test_default_path_follows_env(tmp_path: Path, monkeypatch) -> None:
+    assert default_path(tmp_path) == tmp_path / "data" / "history" / "scores.sqlite"
+    monkeypatch.setenv("HISTORY_DB", str(tmp_path / "ci.sqlite"))
+    assert default_path(tmp_path) == tmp_path / "ci.sqlite"
+
+
+def test_runs_in_the_same_second_keep_their_rows(tmp_path: Path) -> None:
+    with HistoryStore(tmp_path / "scores.sqlite") as store:
+        store.append(_rows({("b1", "a"): 1.0}))
+        store.append(_rows({("b1", "a"): 2.0}))
+        store.append(_rows({("b1", "a"): 3.0}))
+        assert store.trajectory("a")["score"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_whole_second_stamps_are_migrated(tmp_path: Path) -> None:
+    db = tmp_path / "scores.sqlite"
+    with HistoryStore(db) as store:
+        store.append(_rows({("b1", "a"): 1.0}), "2025-01-01T00:00:00.5Z")
+        store.conn.execute("PRAGMA user_version = 0")
+        store.conn.execute(
+            "INSERT INTO scores (benchmark, slug, recorded_at, score) "
+            "VALUES ('b1', 'a', '2025-01-01T00:00:00Z', 0.5)"
+        )
+        store.conn.commit()
+    with HistoryStore(db) as store:
+        trajectory = store.trajectory("a")
+    assert trajectory["recorded_at"].tolist() == [
+        "2025-01-01T00:00:00.000000Z",
+        "2025-01-01T00:00:00.500000Z",
+    ]
+    assert trajectory["score"].tolist() == [0.5, 1.0]
+
+
+def test_process_data_appends_history(tmp_path: Path) -> None:
+    bench_dir = tmp_path / "data" / "raw" / "benchmarks"
+    mapping_dir = tmp_path / "data" / "config" / "mappings"
+    bench_dir.mkdir(parents=True)
+    mapping_dir.mkdir(parents=True)
+    (tmp_path / "data" / "processed").mkdir(parents=True)
+    bench = bench_dir / "b1.yaml"
+    bench.write_text(
+        yaml.safe_dump(
+            {"model_name_mapping_file": "map.yaml", "results": {"A": 1.0, "B": 0.5}}
+        )
+    )
+    (mapping_dir / "map.yaml").write_text(yaml.safe_dump({"A": "slug-a", "B": "slug-b"}))
+
+    process_data.main(root=tmp_path)
+    process_data.main(root=tmp_path)
+    db = tmp_path / "data" / "history" / "scores.sqlite"
+    with HistoryStore(db) as store:
+        assert len(store.trajectory("slug-b")) == 1
+
+    bench.write_text(
+        yaml.safe_dump(
+            {"model_name_mapping_file": "map.yaml", "results": {"A": 1.0, "B": 0.75}}
+        )
+    )
+    process_data.main(root=tmp_path, history=False)
+    with HistoryStore(db) as store:
+        assert len(store.trajectory("slug-b")) == 1
+    process_data.main(root=tmp_path)
+    with HistoryStore(db) as store:
+        assert store.latest()["score"].tolist() == [1.0, 0.75]
+
+    elsewhere = tmp_path / "elsewhere.sqlite"
+    process_data.main(root=tmp_path, history_db=elsewhere)
+    with HistoryStore(elsewhere) as store:
+        assert store.latest()["score"].tolist() == [1.0, 0.75]
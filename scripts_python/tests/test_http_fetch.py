@@ -0,0 +1,169 @@
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from http_fetch import AsyncFetcher, FetchError
+from scrape_runner import run_scrapers
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+@pytest.fixture
+def server():
+    state = {"requests": [], "connections": set(), "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body=b"", headers=()):
+            self.send_response(status)
+            for key, value in headers:
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with lock:
+                state["requests"].append(self.path)
+                state["connections"].add(self.client_address)
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            try:
+                self.route()
+            finally:
+                with lock:
+                    state["active"] -= 1
+
+        def route(self):
+            if self.path == "/etag":
+                if self.headers.get("If-None-Match") == '"v1"':
+                    self._send(304)
+                else:
+                    self._send(200, b"etag body", [("ETag", '"v1"')])
+            elif self.path == "/modified":
+                if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                    self._send(304)
+                else:
+                    headers = [("Last-Modified", LAST_MODIFIED)]
+                    self._send(200, b"modified body", headers)
+            elif self.path.startswith("/slow/"):
+                time.sleep(0.1)
+                self._send(200, self.path.encode())
+            elif self.path == "/flaky":
+                if state["requests"].count("/flaky") < 3:
+                    self._send(503, b"busy")
+                else:
+                    self._send(200, b"recovered")
+            elif self.path == "/down":
+                self._send(503, b"down")
+            elif self.path == "/redirect":
+                self._send(302, headers=[("Location", "/etag")])
+            elif self.path.startswith("/json/"):
+                self._send(200, b'{"score": 1.5}')
+            else:
+                self._send(404, b"missing")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+async def _fetch(cache_dir: Path, *urls: str, **kwargs):
+    async with AsyncFetcher(cache_dir, backoff=0.01, **kwargs) as fetcher:
+        return await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+
+
+def test_revalidates_cached_responses(tmp_path: Path, server) -> None:
+    base, state = server
+    urls = [f"{base}/etag", f"{base}/modified"]
+
+    first = asyncio.run(_fetch(tmp_path, *urls))
+    assert [r.read() for r in first] == [b"etag body", b"modified body"]
+    assert not any(r.from_cache for r in first)
+    mtimes = [r.path.stat().st_mtime_ns for r in first]
+
+    again = asyncio.run(_fetch(tmp_path, *urls))
+    assert all(r.from_cache for r in again)
+    assert [r.read() for r in again] == [b"etag body", b"modified body"]
+    assert [r.path.stat().st_mtime_ns for r in again] == mtimes
+    assert len(state["requests"]) == 4
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_pools_connections_per_host(tmp_path: Path, server) -> None:
+    base, state = server
+    urls = [f"{base}/slow/{i}" for i in range(8)]
+
+    responses = asyncio.run(_fetch(tmp_path, *urls, per_host=2))
+    assert [r.text() for r in responses] == [f"/slow/{i}" for i in range(8)]
+    assert state["peak"] == 2
+    assert len(state["connections"]) == 2
+
+
+def test_retries_and_redirects(tmp_path: Path, server) -> None:
+    base, state = server
+
+    urls = [f"{base}/flaky", f"{base}/redirect"]
+    flaky, redirected = asyncio.run(_fetch(tmp_path, *urls))
+    assert flaky.read() == b"recovered"
+    assert state["requests"].count("/flaky") == 3
+    assert redirected.read() == b"etag body"
+
+    with pytest.raises(FetchError) as excinfo:
+        asyncio.run(_fetch(tmp_path, f"{base}/missing"))
+    assert excinfo.value.status == 404
+    with pytest.raises(FetchError) as excinfo:
+        asyncio.run(_fetch(tmp_path, f"{base}/down", retries=2))
+    assert excinfo.value.status == 503
+    assert state["requests"].count("/down") == 3
+
+
+def test_runner_overlaps_scrapers_and_isolates_failures(tmp_path: Path, server):
+    base, state = server
+    out_dir = tmp_path / "benchmarks"
+    out_dir.mkdir()
+
+    def scraper(name):
+        async def scrape(fetcher):
+            await fetcher.fetch(f"{base}/slow/{name}")
+            data = (await fetcher.fetch(f"{base}/json/{name}")).json()
+            return {f"model-{name}": data["score"]}
+
+        return scrape
+
+    async def broken(fetcher):
+        await fetcher.fetch(f"{base}/missing")
+        return {}
+
+    scrapers = {name: scraper(name) for name in ("a", "b", "c")}
+    scrapers["broken"] = broken
+
+    async def run():
+        async with AsyncFetcher(tmp_path / "cache", retries=0) as fetcher:
+            return await run_scrapers(scrapers, out_dir, fetcher)
+
+    errors = asyncio.run(run())
+    assert state["peak"] > 1
+    assert {name for name, e in errors.items() if e is not None} == {"broken"}
+    assert isinstance(errors["broken"], FetchError)
+    for name in ("a", "b", "c"):
+        saved = yaml.safe_load((out_dir / f"{name}.yaml").read_text())
+        assert saved == {"results": {f"model-{name}": 1.5}}
+    assert not (out_dir / "broken.yaml").exists()
@@ -0,0 +1,112 @@
+import sys
+import importlib
+import shutil
+from pathlib import Path
+
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from incremental import FrameCache, write_if_changed
+
+
+def _load_frame(path: Path):
+    import pandas as pd
+
+    data = yaml.safe_load(path.read_text())
+    return pd.DataFrame(list(data.items()), columns=["alias", "slug"])
+
+
+def test_frame_cache_only_parses_changed_files(tmp_path: Path) -> None:
+    a = tmp_path / "a.yaml"
+    b = tmp_path / "b.yaml"
+    a.write_text(yaml.safe_dump({"A": "slug-a"}))
+    b.write_text(yaml.safe_dump({"B": "slug-b"}))
+    cache_dir = tmp_path / "cache"
+
+    cache = FrameCache(cache_dir)
+    cache.load("mappings", a, _load_frame)
+    cache.load("mappings", b, _load_frame)
+    cache.save()
+    assert cache.parsed == ["mappings/a.yaml", "mappings/b.yaml"]
+
+    b.write_text(yaml.safe_dump({"B": "slug-b2"}))
+    cache = FrameCache(cache_dir)
+    df_a = cache.load("mappings", a, _load_frame)
+    df_b = cache.load("mappings", b, _load_frame)
+    cache.save()
+    assert cache.parsed == ["mappings/b.yaml"]
+    assert cache.changed() == ["mappings/b.yaml"]
+    assert df_a["slug"].tolist() == ["slug-a"]
+    assert df_b["slug"].tolist() == ["slug-b2"]
+    assert len(list((cache_dir / "frames").glob("*.pkl"))) == 2
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    out = tmp_path / "out.yaml"
+    assert write_if_changed(out, "a: 1\n")
+    assert not write_if_changed(out, "a: 1\n")
+    assert write_if_changed(out, "a: 2\n")
+    assert out.read_text() == "a: 2\n"
+
+
+def test_incremental_main_matches_full_rebuild(tmp_path: Path) -> None:
+    root = tmp_path
+    bench_dir = root / "data" / "raw" / "benchmarks"
+    mapping_dir = root / "data" / "config" / "mappings"
+    bench_dir.mkdir(parents=True)
+    mapping_dir.mkdir(parents=True)
+    (root / "data" / "processed").mkdir(parents=True)
+    script_dir = root / "scripts_python"
+    script_dir.mkdir()
+    src_script = Path(__file__).resolve().parents[1] / "process_data.py"
+    shutil.copy(src_script, script_dir / "temp_incremental_process_data.py")
+
+    for name, score in [("b1", 0.5), ("b2", 0.7)]:
+        (bench_dir / f"{name}.yaml").write_text(
+            yaml.safe_dump(
+                {
+                    "model_name_mapping_file": "map.yaml",
+                    "results": {"Model A": 1.0, "Model B": score},
+                    "cost_per_task": {"Model A": 0.1, "Model B": 0.3},
+                },
+                sort_keys=False,
+            )
+        )
+    (mapping_dir / "map.yaml").write_text(
+        yaml.safe_dump({"Model A": "slug-a", "Model B": "slug-b"}, sort_keys=False)
+    )
+
+    sys.path.insert(0, str(script_dir))
+    try:
+        module = importlib.import_module("temp_incremental_process_data")
+    finally:
+        sys.path.pop(0)
+
+    out_dir = root / "data" / "processed" / "benchmarks"
+    module.main(incremental=True)
+    first = {p.name: p.read_bytes() for p in out_dir.glob("*.yaml")}
+
+    module.main()
+    assert {p.name: p.read_bytes() for p in out_dir.glob("*.yaml")} == first
+
+    untouched = (out_dir / "b1.yaml").stat().st_mtime_ns
+    (bench_dir / "b2.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "model_name_mapping_file": "map.yaml",
+                "results": {"Model A": 1.0, "Model B": 0.9},
+            },
+            sort_keys=False,
+        )
+    )
+    module.main(incremental=True)
+    incremental_out = {p.name: p.read_bytes() for p in out_dir.glob("*.yaml")}
+    assert (out_dir / "b1.yaml").stat().st_mtime_ns == untouched
+
+    module.main()
+    assert {p.name: p.read_bytes() for p in out_dir.glob("*.yaml")} == incremental_out
+
+    module.main(jobs=2)
+    assert {p.name: p.read_bytes() for p in out_dir.glob("*.yaml")} == incremental_out
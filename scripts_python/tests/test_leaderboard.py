@@ -0,0 +1,146 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from leaderboard import aggregate_leaderboard, leaderboard_bundle, write_leaderboard
+
+
+def _long_frame(rng: np.random.Generator, n_slugs: int, n_benchmarks: int):
+    frames = []
+    for b in range(n_benchmarks):
+        slugs = [f"m{s:03d}" for s in range(n_slugs) if rng.random() < 0.6]
+        n = len(slugs)
+        score = rng.uniform(0, 100, n)
+        score[rng.random(n) < 0.1] = np.nan  # cost-only rows
+        cost = np.where(rng.random(n) < 0.7, rng.uniform(1, 50, n), np.nan)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "benchmark": f"b{b:02d}",
+                    "slug": slugs,
+                    "normalized_score": score,
+                    "normalized_cost": cost,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _reference(df: pd.DataFrame, score_w: pd.Series, cost_w: pd.Series) -> dict:
+    """Per-model loop mirroring the site's ``computeAverageScores``."""
+    out = {}
+    total = score_w.sum()
+    for slug, rows in df.groupby("slug"):
+        scored = rows.dropna(subset=["normalized_score"])
+        weights = score_w[scored["benchmark"]].to_numpy()
+        weighted = (scored["normalized_score"].to_numpy() / 100 * weights).sum()
+        costs = rows.dropna(subset=["normalized_cost"])
+        cost_weights = cost_w[costs["benchmark"]].to_numpy()
+        out[slug] = {
+            "average_score": weighted / (weights.sum() or 1) * 100,
+            "benchmarks": len(scored),
+            "coverage": weights.sum() / total,
+            "normalized_cost": (
+                (costs["normalized_cost"].to_numpy() * cost_weights).sum()
+                / (cost_weights.sum() or 1)
+                if len(costs)
+                else np.nan
+            ),
+            "cost_benchmarks": len(costs),
+        }
+    return out
+
+
+def test_matches_per_model_reference() -> None:
+    rng = np.random.default_rng(0)
+    df = _long_frame(rng, 60, 12)
+    names = [f"b{b:02d}" for b in range(12)]
+    score_w = pd.Series(rng.choice([0.5, 1.0, 2.0], 12), index=names)
+    cost_w = pd.Series(rng.choice([0.0, 1.0], 12), index=names)
+    cost_w.iloc[0] = 1.0
+
+    board = aggregate_leaderboard(df, score_w, cost_w)
+    expected = _reference(df, score_w, cost_w)
+    assert sorted(board["slug"]) == sorted(expected)
+    assert board["rank"].tolist() == list(range(1, len(board) + 1))
+    assert board["average_score"].is_monotonic_decreasing
+    for row in board.itertuples():
+        ref = expected[row.slug]
+        for key in ["average_score", "coverage", "normalized_cost"]:
+            np.testing.assert_allclose(getattr(row, key), ref[key], rtol=1e-12)
+        assert (row.benchmarks, row.cost_benchmarks) == (
+            ref["benchmarks"],
+            ref["cost_benchmarks"],
+        )
+
+
+def test_imputation_recovers_low_rank_scores() -> None:
+    rng = np.random.default_rng(1)
+    n_slugs, n_bench = 80, 15
+    skill = rng.uniform(0.2, 1.0, (n_slugs, 2))
+    loading = rng.uniform(20, 60, (n_bench, 2))
+    truth = skill @ loading.T
+    observed = rng.random(truth.shape) < 0.6
+    observed[np.arange(n_slugs), rng.integers(0, n_bench, n_slugs)] = True
+    s, b = np.nonzero(observed)
+    df = pd.DataFrame(
+        {
+            "benchmark": [f"b{i:02d}" for i in b],
+            "slug": [f"m{i:03d}" for i in s],
+            "normalized_score": truth[s, b],
+            "normalized_cost": np.nan,
+        }
+    )
+    weights = pd.Series(1.0, index=[f"b{i:02d}" for i in range(n_bench)])
+
+    board = aggregate_leaderboard(df, weights, weights, impute_rank=2)
+    board = board.set_index("slug").sort_index()
+    expected = np.clip(truth, 0, 100).mean(axis=1)
+    np.testing.assert_allclose(board["imputed_score"], expected, atol=0.5)
+    assert board["imputed_score"].rank(ascending=False).corr(
+        pd.Series(expected, index=board.index).rank(ascending=False)
+    ) > 0.99
+
+
+def test_writes_rounded_json(tmp_path: Path) -> None:
+    df = pd.DataFrame(
+        {
+            "benchmark": ["a", "a", "b"],
+            "slug": ["x", "y", "y"],
+            "normalized_score": [100 / 3, 0.0, 50.0],
+            "normalized_cost": [np.nan, 2.0, 4.0],
+        }
+    )
+    weights = pd.Series({"a": 1.0, "b": 1.0})
+    board = aggregate_leaderboard(df, weights, weights)
+
+    assert write_leaderboard(board, tmp_path, skip_unchanged=True)
+    assert not write_leaderboard(board, tmp_path, skip_unchanged=True)
+    saved = json.loads((tmp_path / "leaderboard.json").read_text())
+    assert saved == leaderboard_bundle(board)
+    assert saved["models"] == [
+        {
+            "slug": "x",
+            "rank": 1,
+            "average_score": 33.33,
+            "benchmarks": 1,
+            "coverage": 0.5,
+            "cost_benchmarks": 0,
+        },
+        {
+            "slug": "y",
+            "rank": 2,
+            "average_score": 25.0,
+            "benchmarks": 2,
+            "coverage": 1.0,
+            "normalized_cost": 3.0,
+            "cost_benchmarks": 2,
+            "pareto_depth": 1,
+        },
+    ]
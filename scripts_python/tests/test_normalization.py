@@ -0,0 +1,104 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from normalization import METHODS, NORMAL_IQR, normal_cdf, normalize_scores
+from process_data import normalize_benchmark_scores
+
+
+def _phi(z: float) -> float:
+    return 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+
+def _reference(scores: pd.Series, method: str) -> pd.Series:
+    """Straightforward per-benchmark implementation of each strategy."""
+    valid = scores.dropna()
+    lo, hi = valid.min(), valid.max()
+    if method == "minmax":
+        if hi == lo:
+            return pd.Series(100.0, index=scores.index)
+        return (scores - lo) / (hi - lo) * 100
+    if len(valid) and hi == lo:
+        return scores.where(scores.isna(), 100.0)
+    if method == "percentile":
+        ranks = scores.rank(method="average")
+        return (ranks - 1) / max(len(valid) - 1, 1) * 100
+    if method == "zscore":
+        z = (scores - valid.mean()) / valid.std(ddof=0)
+        return z.map(lambda v: 100 * _phi(v) if v == v else v)
+    if method == "robust":
+        q1, median, q3 = np.percentile(valid, [25, 50, 75])
+        scale = (q3 - q1) / NORMAL_IQR or valid.std(ddof=0)
+        return ((scores - median) / scale).map(lambda v: 100 * _phi(v) if v == v else v)
+    if method == "elo":
+        median = valid.median()
+        return scores.map(lambda r: 100 / (1 + 10 ** ((median - r) / 400)))
+    raise AssertionError(method)
+
+
+def _random_frame(rng: np.random.Generator, n_benchmarks: int) -> pd.DataFrame:
+    frames = []
+    for b in range(n_benchmarks):
+        n = int(rng.integers(1, 30))
+        scores = rng.normal(1200 if b % 5 == 4 else 50, 20, size=n).round(int(b % 3))
+        if b % 7 == 3:
+            scores[:] = 42.0
+        scores[rng.random(n) < 0.1] = np.nan
+        if n > 3 and b % 4 == 1:
+            scores[0] = scores[1]  # ties
+        frames.append(pd.DataFrame({"benchmark": f"b{b:03d}", "score": scores}))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_matches_reference(method: str) -> None:
+    df = _random_frame(np.random.default_rng(0), 40)
+    codes, names = pd.factorize(df["benchmark"])
+
+    got = normalize_scores(codes, df["score"].to_numpy(), [method] * len(names))
+    expected = df.groupby("benchmark")["score"].transform(
+        lambda s: _reference(s, method)
+    )
+    np.testing.assert_allclose(got, expected.to_numpy(), rtol=0, atol=1e-5)
+
+
+def test_mixed_methods_select_per_benchmark() -> None:
+    df = _random_frame(np.random.default_rng(1), 25)
+    df["cost"] = np.nan
+    methods = pd.Series(
+        {f"b{b:03d}": METHODS[b % len(METHODS)] for b in range(25)}
+    ).iloc[1:]  # b000 is not listed and falls back to min-max
+
+    out = normalize_benchmark_scores(df, methods)
+    for name, group in out.groupby("benchmark"):
+        method = methods.get(name, "minmax")
+        expected = _reference(group["score"], method)
+        np.testing.assert_allclose(
+            group["normalized_score"], expected, rtol=0, atol=1e-5
+        )
+    with pytest.raises(ValueError, match="Unknown normalization"):
+        normalize_benchmark_scores(df, pd.Series({"b001": "softmax"}))
+
+
+def test_minmax_matches_historical_formula_bit_for_bit() -> None:
+    df = _random_frame(np.random.default_rng(2), 30)
+    df["cost"] = np.nan
+    grouped = df.groupby("benchmark")["score"]
+    lo, hi = grouped.transform("min"), grouped.transform("max")
+    expected = np.where(hi != lo, (df["score"] - lo) / (hi - lo) * 100, 100.0)
+
+    got = normalize_benchmark_scores(df)["normalized_score"].to_numpy()
+    assert np.array_equal(got, expected, equal_nan=True)
+
+
+def test_normal_cdf_accuracy() -> None:
+    x = np.linspace(-8, 8, 2001)
+    expected = np.array([_phi(v) for v in x])
+    np.testing.assert_allclose(normal_cdf(x), expected, rtol=0, atol=2e-7)
@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from parallel import parallel_imap, parallel_map, resolve_jobs
+from synthetic_corpus import generate_corpus
+from update_mappings import update_all_mappings
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+def test_parallel_map_preserves_order() -> None:
+    items = list(range(50))
+    assert parallel_map(_square, items, jobs=4) == [x * x for x in items]
+    assert parallel_map(_square, items, jobs=1) == [x * x for x in items]
+    assert parallel_map(_square, [], jobs=4) == []
+    assert list(parallel_imap(_square, items, jobs=4)) == [x * x for x in items]
+
+
+def test_resolve_jobs() -> None:
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs(0) >= 1
+    with pytest.raises(ValueError):
+        resolve_jobs(-1)
+
+
+def test_update_all_mappings_parallel_matches_serial(tmp_path: Path) -> None:
+    outputs = []
+    for jobs in (1, 3):
+        root = tmp_path / f"jobs-{jobs}"
+        generate_corpus(root, n_benchmarks=12, n_aliases=90, seed=3)
+        mapping_dir = root / "data" / "config" / "mappings"
+        # Drop a mapping so the update has new aliases to add.
+        first = sorted(mapping_dir.glob("*.yaml"))[0]
+        first.write_text(yaml.safe_dump({}))
+        update_all_mappings(root / "data" / "raw" / "benchmarks", mapping_dir, jobs)
+        outputs.append(
+            {p.name: p.read_bytes() for p in sorted(mapping_dir.glob("*.yaml"))}
+        )
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pareto import depth_list, pareto_depth
+
+
+def _peel(cost: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """Reference depths by removing the frontier over and over."""
+    depth = np.full(len(cost), np.nan)
+    left = set(np.flatnonzero(~np.isnan(cost) & ~np.isnan(score)).tolist())
+    layer = 0
+    while left:
+        layer += 1
+        front = [
+            i
+            for i in left
+            if not any(
+                cost[j] <= cost[i]
+                and score[j] >= score[i]
+                and (cost[j], score[j]) != (cost[i], score[i])
+                for j in left
+            )
+        ]
+        depth[front] = layer
+        left -= set(front)
+    return depth
+
+
+def test_pareto_depth_matches_peeling() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = int(rng.integers(0, 60))
+        # Few distinct values so ties and duplicates are common.
+        cost = rng.integers(0, 8, n).astype(float)
+        score = rng.integers(0, 8, n).astype(float)
+        cost[rng.random(n) < 0.1] = np.nan
+        score[rng.random(n) < 0.1] = np.nan
+        np.testing.assert_array_equal(pareto_depth(cost, score), _peel(cost, score))
+
+
+def test_pareto_depth_within_groups() -> None:
+    cost = np.array([1.0, 2.0, 3.0, 3.0, 1.0, np.nan])
+    score = np.array([5.0, 4.0, 6.0, 6.0, 1.0, 9.0])
+    groups = np.array([0, 0, 0, 0, 1, 1])
+
+    depth = pareto_depth(cost, score, groups)
+    assert depth_list(depth)[:5] == [1, 2, 1, 1, 1]
+    assert np.isnan(depth[5])
+    assert depth_list(pareto_depth(cost, score))[:5] == [1, 2, 1, 1, 2]
@@ -3,6 +3,7 @@ import importlib
 import shutil
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 import yaml
@@ -16,6 +17,9 @@ from process_data import (
     normalize_benchmark_scores,
     build_output,
     compute_normalization_factors,
+    compute_normalization_factors_sparse,
+    round_sig,
+    round_sig_array,
 )
 
 
@@ -98,6 +102,44 @@ def test_zero_cost_ignored(tmp_path: Path):
     assert df["cost_weight"].iloc[0] == 1.0
 
 
+def test_round_sig_array_matches_scalar() -> None:
+    rng = np.random.default_rng(0)
+    values = np.concatenate(
+        [
+            rng.lognormal(0, 5, 5000) * rng.choice([-1, 1], 5000),
+            np.round(rng.uniform(0, 1000, 5000), 2),
+            [x * 10.0**k for x in (1.2345, 9.9995, 1.0, 5.0) for k in range(-12, 12)],
+            [0.0, -0.0, 1e-310],
+        ]
+    )
+    expected = [round_sig(float(v), 4) for v in values]
+
+    assert round_sig_array(values, 4).tolist() == expected
+    assert np.isnan(round_sig_array(np.array([np.nan]), 4)).all()
+
+
+def test_build_output_keeps_row_order_and_rejects_duplicate_slugs() -> None:
+    df = pd.DataFrame(
+        {
+            "slug": ["b", "a"],
+            "score": [2.0, 1.0],
+            "normalized_score": [100.0, 0.0],
+            "cost": [np.nan, 0.123456],
+        }
+    )
+    output = build_output(df, 2.0)
+    assert list(output) == ["b", "a"]
+    assert output["a"] == {
+        "score": 1.0,
+        "normalized_score": 0.0,
+        "cost": 0.1235,
+        "normalized_cost": 0.2469,
+    }
+
+    with pytest.raises(ValueError):
+        build_output(df.assign(slug=["a", "a"]), None)
+
+
 def test_compute_normalization_factors_weighted() -> None:
     cost_map = {
         "b1": {"m1": 1.0, "m2": 2.0},
@@ -156,6 +198,44 @@ def test_weight_scaling_equivalence() -> None:
     assert f_a["B"] == pytest.approx(f_b["B"], rel=1e-6)
 
 
+def test_sparse_engine_matches_dense() -> None:
+    cost_map = {
+        "b1": {"m1": 1.0, "m2": 2.0, "m3": None},
+        "b2": {"m1": 3.0, "m2": None, "m3": 5.0},
+        "b3": {"m1": None, "m2": 0.5, "m3": 4.0},
+    }
+    cost_df = pd.DataFrame(cost_map).T.astype(float)
+    weights = pd.Series({"b1": 1.0, "b2": 4.0, "b3": 0.0})
+
+    dense = compute_normalization_factors(cost_df, weights)
+    sparse = compute_normalization_factors(cost_df, weights, engine="sparse")
+
+    pd.testing.assert_series_equal(dense, sparse, check_names=False)
+
+
+def test_sparse_engine_reports_convergence() -> None:
+    costs = pd.DataFrame(
+        {
+            "benchmark": ["b1", "b1", "b2", "b2"],
+            "slug": ["m1", "m2", "m1", "m2"],
+            "cost": [1.0, 2.0, 3.0, 6.0],
+        }
+    )
+
+    result = compute_normalization_factors_sparse(costs, iterations=100, tol=1e-12)
+
+    assert result.converged
+    assert result.iterations < 100
+    assert result.residual == pytest.approx(0.0, abs=1e-9)
+    assert result.factors["b1"] / result.factors["b2"] == pytest.approx(3.0)
+
+
+def test_unknown_engine_rejected() -> None:
+    cost_df = pd.DataFrame({"m": {"b": 1.0}})
+    with pytest.raises(ValueError):
+        compute_normalization_factors(cost_df, engine="gpu")
+
+
 def test_creates_empty_processed_file_without_mappings(tmp_path: Path) -> None:
     root = tmp_path
     (root / "data" / "raw" / "benchmarks").mkdir(parents=True)
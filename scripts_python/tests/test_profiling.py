@@ -0,0 +1,69 @@
+import sys
+import json
+from pathlib import Path
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from profiling import Profiler
+from synthetic_corpus import generate_corpus
+from update_mappings import update_all_mappings
+
+
+def test_disabled_profiler_records_nothing(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("PIPELINE_PROFILE", raising=False)
+    monkeypatch.delenv("PIPELINE_PROFILE_PSTATS", raising=False)
+    profiler = Profiler.create("script")
+    with profiler.stage("work") as stage:
+        stage.rows = 3
+    profiler.write()
+    assert not profiler.enabled
+    assert profiler.stages == []
+
+
+def test_stage_report_and_pstats(tmp_path: Path) -> None:
+    report = tmp_path / "report.json"
+    pstats_dir = tmp_path / "pstats"
+    profiler = Profiler("script", report, pstats_dir)
+
+    with profiler.stage("allocate") as stage:
+        data = [0] * 1_000_000
+        stage.rows = len(data)
+    with profiler.stage("idle"):
+        pass
+    profiler.write()
+
+    written = json.loads(report.read_text())
+    assert written["script"] == "script"
+    assert [s["name"] for s in written["stages"]] == ["allocate", "idle"]
+    allocate = written["stages"][0]
+    assert allocate["rows"] == 1_000_000
+    assert allocate["peak_mb"] > 5
+    assert allocate["wall_s"] >= 0 and allocate["cpu_s"] >= 0
+    assert "rows" not in written["stages"][1]
+    assert (pstats_dir / "script.allocate.pstats").exists()
+
+
+def test_env_enables_profiling(tmp_path: Path, monkeypatch) -> None:
+    report = tmp_path / "env.json"
+    monkeypatch.setenv("PIPELINE_PROFILE", str(report))
+    profiler = Profiler.create("script")
+    assert profiler.enabled
+    assert profiler.report_path == report
+
+
+def test_update_all_mappings_stages(tmp_path: Path) -> None:
+    generate_corpus(tmp_path, n_benchmarks=4, n_aliases=20)
+    profiler = Profiler("update_mappings", tmp_path / "report.json")
+    update_all_mappings(
+        tmp_path / "data" / "raw" / "benchmarks",
+        tmp_path / "data" / "config" / "mappings",
+        profiler=profiler,
+    )
+    assert [s["name"] for s in profiler.stages] == [
+        "load_benchmarks",
+        "load_mappings",
+        "resolve_aliases",
+        "suggest_slugs",
+        "write_mappings",
+    ]
@@ -0,0 +1,192 @@
+import sys
+import hashlib
+import io
+import json
+import os
+import pickle
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import scrape_lmarena_text
+from http_fetch import default_cache_dir
+from scrape_lmarena_text import (
+    Dummy,
+    RestrictedUnpickler,
+    fetch_latest_pkl,
+    parse_pkl,
+    parse_pkl_file,
+)
+
+
+def _fixture_pickle() -> bytes:
+    """Pickle shaped like LMArena's results, including a fake plotly figure."""
+    names = ["plotly", "plotly.graph_objs", "plotly.graph_objs._figure"]
+    mod = types.ModuleType(names[-1])
+
+    class Figure:
+        def __init__(self, data):
+            self.data = data
+
+    Figure.__module__ = mod.__name__
+    Figure.__qualname__ = "Figure"
+    mod.Figure = Figure
+    for name in names:
+        sys.modules[name] = mod
+    try:
+        leaderboard = pd.DataFrame(
+            {"rating": [1400.5, 1350.25]}, index=["model-a", "model-b"]
+        )
+        data = {
+            "text": {
+                "full": {
+                    "leaderboard_table_df": leaderboard,
+                    "win_fraction_heatmap": Figure({"z": list(range(1000))}),
+                }
+            }
+        }
+        return pickle.dumps(data)
+    finally:
+        for name in names:
+            del sys.modules[name]
+
+
+@pytest.fixture
+def server():
+    payload = _fixture_pickle()
+    etag = '"' + hashlib.sha256(payload).hexdigest()[:16] + '"'
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            if self.path.startswith("/api"):
+                body = json.dumps(
+                    {
+                        "siblings": [
+                            {"rfilename": "elo_results_20250101.pkl"},
+                            {"rfilename": "elo_results_20250301.pkl"},
+                            {"rfilename": "README.md"},
+                        ]
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield base, payload, requests
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parse_pkl_stubs_plot_objects() -> None:
+    payload = _fixture_pickle()
+    assert parse_pkl(payload) == {"model-a": 1400.5, "model-b": 1350.25}
+
+    data = RestrictedUnpickler(io.BytesIO(payload)).load()
+    figure = data["text"]["full"]["win_fraction_heatmap"]
+    assert type(figure) is Dummy
+    assert figure.__dict__ == {}
+
+
+class _Call:
+    def __init__(self, fn, *args):
+        self.fn, self.args = fn, args
+
+    def __reduce__(self):
+        return self.fn, self.args
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pickle.dumps(_Call(os.system, "true")),
+        pickle.dumps(_Call(eval, "1")),
+        pickle.dumps(_Call(pd.eval, "1 + 1")),
+        pickle.dumps(_Call(pd.read_pickle, "elsewhere.pkl")),
+        pickle.dumps(_Call(np.load, "elsewhere.npy")),
+        # A dotted path out of an allowed class.
+        pickle.dumps(pd.DataFrame.to_pickle, protocol=4),
+    ],
+)
+def test_unpickler_refuses_everything_else(payload: bytes) -> None:
+    with pytest.raises(pickle.UnpicklingError, match="refusing"):
+        RestrictedUnpickler(io.BytesIO(payload)).load()
+
+
+def test_unpickler_loads_frames_at_every_protocol() -> None:
+    frame = pd.DataFrame(
+        {
+            "rating": [1400.5, 1350.25],
+            "date": pd.to_datetime(["2024-01-01", "2024-02-01"]),
+            "license": pd.Categorical(["a", "b"]),
+        },
+        index=pd.Index(["model-a", "model-b"]),
+    )
+    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+        payload = pickle.dumps({"frame": frame, "raw": b"x"}, protocol=protocol)
+        loaded = RestrictedUnpickler(io.BytesIO(payload)).load()
+        pd.testing.assert_frame_equal(loaded["frame"], frame)
+
+
+def test_fetch_latest_pkl_uses_etag_cache(tmp_path: Path, server) -> None:
+    base, payload, requests = server
+    meta_url = f"{base}/api/spaces/x?raw=1"
+    resolve_url = f"{base}/resolve/{{filename}}"
+    cache_dir = tmp_path / "cache"
+    (cache_dir).mkdir()
+    (cache_dir / "elo_results_20240101.pkl").write_bytes(b"stale")
+
+    path = fetch_latest_pkl(cache_dir, meta_url, resolve_url)
+    assert path.name == "elo_results_20250301.pkl"
+    assert path.read_bytes() == payload
+    assert parse_pkl_file(path) == {"model-a": 1400.5, "model-b": 1350.25}
+    assert not (cache_dir / "elo_results_20240101.pkl").exists()
+
+    mtime = path.stat().st_mtime_ns
+    again = fetch_latest_pkl(cache_dir, meta_url, resolve_url)
+    assert again == path
+    assert again.stat().st_mtime_ns == mtime
+    assert requests.count("/resolve/elo_results_20250301.pkl") == 2
+
+
+def test_main_shares_the_runner_http_cache(tmp_path: Path, monkeypatch) -> None:
+    pkl = tmp_path / "elo_results_20250301.pkl"
+    pkl.write_bytes(_fixture_pickle())
+    used = []
+    monkeypatch.setattr(
+        scrape_lmarena_text,
+        "fetch_latest_pkl",
+        lambda cache_dir: used.append(cache_dir) or pkl,
+    )
+    out_dir = tmp_path / "data" / "raw" / "benchmarks"
+    out_dir.mkdir(parents=True)
+
+    scrape_lmarena_text.main(root=tmp_path)
+    assert used == [tmp_path / ".cache" / "http"] == [default_cache_dir(tmp_path)]
+    assert "model-a" in (out_dir / "lmarena-text.yaml").read_text()
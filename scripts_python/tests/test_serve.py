@@ -0,0 +1,149 @@
+import http.client
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_serve import main as bench_main
+from serve import DataIndex, QueryServer
+
+
+def _write_yaml(path: Path, data) -> None:
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def _make_root(root: Path) -> Path:
+    bench_dir = root / "data" / "processed" / "benchmarks"
+    models_dir = root / "data" / "config" / "models"
+    bench_dir.mkdir(parents=True)
+    models_dir.mkdir(parents=True)
+    _write_yaml(
+        bench_dir / "b1.yaml",
+        {
+            "slug-a": {
+                "score": 0.9,
+                "normalized_score": 100.0,
+                "cost": 0.3,
+                "normalized_cost": 30.0,
+                "pareto_depth": 1,
+            },
+            "slug-b": {
+                "score": 0.5,
+                "normalized_score": 50.0,
+                "cost": 0.1,
+                "normalized_cost": 10.0,
+                "pareto_depth": 1,
+            },
+            "slug-c": {"score": 0.1, "normalized_score": 0.0},
+        },
+    )
+    _write_yaml(
+        bench_dir / "b2.yaml", {"slug-c": {"score": 7.0, "normalized_score": 100.0}}
+    )
+    _write_yaml(
+        models_dir / "alpha.yaml",
+        {
+            "provider": "Acme",
+            "reasoning_efforts": {"slug-a": "Alpha", "slug-b": "Alpha Lite"},
+        },
+    )
+    _write_yaml(
+        models_dir / "gamma.yaml",
+        {
+            "provider": "Other",
+            "release_date": "2025-01-02",
+            "reasoning_efforts": {"slug-c": "Gamma"},
+        },
+    )
+    return root
+
+
+@pytest.fixture
+def server(tmp_path: Path):
+    index = DataIndex(_make_root(tmp_path))
+    index.load()
+    server = QueryServer(index, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server: QueryServer, target: str, **headers):
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    try:
+        conn.request("GET", target, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    data = json.loads(body) if body else None
+    return response.status, data, response.getheader("ETag")
+
+
+def test_queries(server: QueryServer) -> None:
+    assert _get(server, "/benchmarks")[1] == {"b1": 3, "b2": 1}
+
+    status, rows, _ = _get(server, "/benchmarks/b1?top=2")
+    assert status == 200
+    assert [(r["slug"], r["rank"]) for r in rows] == [("slug-a", 1), ("slug-b", 2)]
+    rows = _get(server, "/benchmarks/b1?max_cost=20")[1]
+    assert [(r["slug"], r["rank"]) for r in rows] == [("slug-b", 2)]
+    rows = _get(server, "/benchmarks/b1?provider=Other")[1]
+    assert [r["slug"] for r in rows] == ["slug-c"]
+
+    profile = _get(server, "/models/slug-c")[1]
+    assert profile["name"] == "Gamma"
+    assert profile["release_date"] == "2025-01-02"
+    assert profile["benchmarks"] == {
+        "b1": {"rank": 3, "score": 0.1, "normalized_score": 0.0},
+        "b2": {"rank": 1, "score": 7.0, "normalized_score": 100.0},
+    }
+    providers = _get(server, "/providers/Acme")[1]
+    assert [m["slug"] for m in providers] == ["slug-a", "slug-b"]
+
+    assert _get(server, "/benchmarks/missing")[0] == 404
+    assert _get(server, "/models/missing")[0] == 404
+    assert _get(server, "/benchmarks/b1?top=x")[0] == 400
+    assert _get(server, "/benchmarks/b1?sort=cost")[0] == 400
+
+
+def test_etag_and_reload(server: QueryServer) -> None:
+    index = server.index
+    status, _, etag = _get(server, "/models/slug-a")
+    assert status == 200
+    assert _get(server, "/models/slug-a", **{"If-None-Match": etag})[:2] == (304, None)
+
+    bench = index.bench_dir / "b2.yaml"
+    _write_yaml(bench, {"slug-a": {"score": 1.0, "normalized_score": 100.0}})
+    index.refresh([bench])
+    status, profile, new_etag = _get(
+        server, "/models/slug-a", **{"If-None-Match": etag}
+    )
+    assert status == 200 and new_etag != etag
+    assert set(profile["benchmarks"]) == {"b1", "b2"}
+    assert "b2" not in _get(server, "/models/slug-c")[1]["benchmarks"]
+
+    bench.unlink()
+    (index.models_dir / "gamma.yaml").unlink()
+    index.refresh([bench, index.models_dir / "gamma.yaml"])
+    assert _get(server, "/benchmarks")[1] == {"b1": 3}
+    assert _get(server, "/providers/Other")[0] == 404
+    assert "name" not in _get(server, "/models/slug-c")[1]
+
+
+def test_bench_serve_reports_latency(tmp_path: Path, capsys) -> None:
+    root = _make_root(tmp_path)
+
+    argv = ["--root", str(root), "--requests", "50", "--max-p99-ms", "1e9"]
+    assert bench_main(argv) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["queries"] == 8
+    assert report["warm"]["requests"] == 50
+    assert report["warm"]["p50_ms"] <= report["warm"]["p99_ms"]
@@ -0,0 +1,94 @@
+import sys
+import importlib
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from snapshot import load_snapshot
+
+
+def test_snapshot_matches_yaml_outputs(tmp_path: Path) -> None:
+    root = tmp_path
+    bench_dir = root / "data" / "raw" / "benchmarks"
+    mapping_dir = root / "data" / "config" / "mappings"
+    bench_dir.mkdir(parents=True)
+    mapping_dir.mkdir(parents=True)
+    (root / "data" / "processed").mkdir(parents=True)
+    script_dir = root / "scripts_python"
+    script_dir.mkdir()
+    src_script = Path(__file__).resolve().parents[1] / "process_data.py"
+    shutil.copy(src_script, script_dir / "temp_snapshot_process_data.py")
+
+    (bench_dir / "b1.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "model_name_mapping_file": "map.yaml",
+                "results": {"Model A": 0.9, "Model B": 0.51234, "Model C": 0.8},
+                "cost_per_task": {"Model A": 0.1, "Model B": 0.3},
+            },
+            sort_keys=False,
+        )
+    )
+    (bench_dir / "b2.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "model_name_mapping_file": "map.yaml",
+                "results": {"Model B": 40, "Model C": 60},
+                "cost_per_task": {"Model B": 2.0, "Model C": 1.0},
+            },
+            sort_keys=False,
+        )
+    )
+    (bench_dir / "unmapped.yaml").write_text(
+        yaml.safe_dump(
+            {"model_name_mapping_file": "other.yaml", "results": {"X": 1.0}},
+            sort_keys=False,
+        )
+    )
+    (mapping_dir / "map.yaml").write_text(
+        yaml.safe_dump(
+            {"Model A": "slug-a", "Model B": "slug-b", "Model C": "slug-c"},
+            sort_keys=False,
+        )
+    )
+    (mapping_dir / "other.yaml").write_text(yaml.safe_dump({"X": None}))
+
+    sys.path.insert(0, str(script_dir))
+    try:
+        module = importlib.import_module("temp_snapshot_process_data")
+    finally:
+        sys.path.pop(0)
+    module.main()
+
+    snapshot_path = root / "data" / "processed" / "snapshot.json"
+    out_dir = root / "data" / "processed" / "benchmarks"
+    for bench in ["b1", "b2", "unmapped"]:
+        expected = yaml.safe_load((out_dir / f"{bench}.yaml").read_text())
+        # The derived Pareto depth is only in the YAML files.
+        for values in expected.values():
+            values.pop("pareto_depth", None)
+        df = load_snapshot(snapshot_path, bench)
+        actual = {
+            row["slug"]: {
+                k: row[k]
+                for k in ["score", "normalized_score", "cost", "normalized_cost"]
+                if row[k] == row[k]
+            }
+            for row in df.to_dict(orient="records")
+        }
+        assert list(actual) == list(expected)
+        for slug, values in expected.items():
+            assert actual[slug] == pytest.approx(values)
+
+    full = load_snapshot(snapshot_path)
+    assert sorted(full["benchmark"].unique()) == ["b1", "b2"]
+    assert full.groupby("slug").size().to_dict() == {
+        "slug-a": 1,
+        "slug-b": 2,
+        "slug-c": 2,
+    }
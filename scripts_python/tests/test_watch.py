@@ -0,0 +1,217 @@
+import sys
+import importlib
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import update_mappings
+from history import HistoryStore
+from watch import Pipeline, watch
+
+
+def _write_yaml(path: Path, data) -> None:
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def _make_root(root: Path) -> Path:
+    bench_dir = root / "data" / "raw" / "benchmarks"
+    mapping_dir = root / "data" / "config" / "mappings"
+    bench_dir.mkdir(parents=True)
+    mapping_dir.mkdir(parents=True)
+    (root / "data" / "processed" / "benchmarks").mkdir(parents=True)
+    for name, score in [("b1", 0.5), ("b2", 0.7)]:
+        _write_yaml(
+            bench_dir / f"{name}.yaml",
+            {
+                "model_name_mapping_file": "map.yaml",
+                "results": {"Model A": 1.0, "Model B": score},
+                "cost_per_task": {"Model A": 0.1, "Model B": 0.3},
+            },
+        )
+    _write_yaml(
+        bench_dir / "b3.yaml",
+        {"model_name_mapping_file": "other.yaml", "results": {"Model C": 2.0}},
+    )
+    _write_yaml(mapping_dir / "map.yaml", {"Model A": "slug-a", "Model B": "slug-b"})
+    _write_yaml(mapping_dir / "other.yaml", {"Model C": "slug-c"})
+    return root
+
+
+def _run_scripts(root: Path) -> None:
+    """Run update_mappings and then process_data on ``root`` by hand."""
+    update_mappings.update_all_mappings(
+        root / "data" / "raw" / "benchmarks", root / "data" / "config" / "mappings"
+    )
+    script_dir = root / "scripts_python"
+    script_dir.mkdir(exist_ok=True)
+    src_script = Path(__file__).resolve().parents[1] / "process_data.py"
+    module_name = f"temp_watch_process_data_{root.name}"
+    shutil.copy(src_script, script_dir / f"{module_name}.py")
+    sys.path.insert(0, str(script_dir))
+    try:
+        module = importlib.import_module(module_name)
+    finally:
+        sys.path.pop(0)
+    module.main()
+
+
+def _data_files(root: Path) -> dict:
+    # The score history records runs of process_data itself, not outputs.
+    return {
+        str(p.relative_to(root)): p.read_bytes()
+        for p in sorted((root / "data").rglob("*"))
+        if p.is_file() and "history" not in p.parts
+    }
+
+
+def test_pipeline_matches_running_scripts(tmp_path: Path) -> None:
+    watched = _make_root(tmp_path / "watched")
+    manual = _make_root(tmp_path / "manual")
+    out_dir = watched / "data" / "processed" / "benchmarks"
+
+    pipeline = Pipeline(watched)
+    pipeline.build()
+    _run_scripts(manual)
+    assert _data_files(watched) == _data_files(manual)
+
+    # A score-only change rewrites just that benchmark's output.
+    untouched = (out_dir / "b1.yaml").stat().st_mtime_ns
+    for root in (watched, manual):
+        _write_yaml(
+            root / "data" / "raw" / "benchmarks" / "b3.yaml",
+            {"model_name_mapping_file": "other.yaml", "results": {"Model C": 3.0}},
+        )
+    written = pipeline.refresh([watched / "data" / "raw" / "benchmarks" / "b3.yaml"])
+    _run_scripts(manual)
+    assert written == [out_dir / "b3.yaml"]
+    assert (out_dir / "b1.yaml").stat().st_mtime_ns == untouched
+    # The leaderboard, family rollups and history wait for finish().
+    assert pipeline.pending is not None
+    pipeline.finish()
+    assert pipeline.pending is None
+    assert _data_files(watched) == _data_files(manual)
+
+    # A new alias lands in the mapping file; mapping it picks it up.
+    for root in (watched, manual):
+        bench = root / "data" / "raw" / "benchmarks" / "b2.yaml"
+        data = yaml.safe_load(bench.read_text())
+        data["results"]["Model D"] = 0.2
+        _write_yaml(bench, data)
+    mapping = watched / "data" / "config" / "mappings" / "map.yaml"
+    written = pipeline.refresh([watched / "data" / "raw" / "benchmarks" / "b2.yaml"])
+    pipeline.finish()
+    _run_scripts(manual)
+    assert mapping in written
+    assert yaml.safe_load(mapping.read_text())["Model D"] is None
+    assert _data_files(watched) == _data_files(manual)
+    # Events for the pipeline's own writes are ignored.
+    assert pipeline.refresh([mapping]) == []
+
+    for root in (watched, manual):
+        path = root / "data" / "config" / "mappings" / "map.yaml"
+        data = yaml.safe_load(path.read_text())
+        data["Model D"] = "slug-d"
+        _write_yaml(path, data)
+    pipeline.refresh([mapping])
+    pipeline.finish()
+    _run_scripts(manual)
+    assert "slug-d" in yaml.safe_load((out_dir / "b2.yaml").read_text())
+    assert _data_files(watched) == _data_files(manual)
+
+
+def test_pipeline_keeps_state_on_malformed_file(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    pipeline = Pipeline(root)
+    pipeline.build()
+    bench = root / "data" / "raw" / "benchmarks" / "b1.yaml"
+    bench.write_text("results: {Model A: 1.0}\n")
+
+    with pytest.raises(ValueError):
+        pipeline.refresh([bench])
+    assert "b1" in pipeline.benchmarks
+
+
+def _score(out: Path):
+    # The watcher may be halfway through writing the file.
+    try:
+        return (yaml.safe_load(out.read_text()) or {})["slug-c"]["score"]
+    except (FileNotFoundError, KeyError, TypeError, yaml.YAMLError):
+        return None
+
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_watch_regenerates_touched_benchmark(tmp_path: Path, polling: bool) -> None:
+    root = _make_root(tmp_path)
+    out = root / "data" / "processed" / "benchmarks" / "b3.yaml"
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch, args=(root,), kwargs={"polling": polling, "stop": stop}
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while _score(out) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _score(out) == 2.0
+
+        _write_yaml(
+            root / "data" / "raw" / "benchmarks" / "b3.yaml",
+            {"model_name_mapping_file": "other.yaml", "results": {"Model C": 4.0}},
+        )
+        while _score(out) != 4.0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _score(out) == 4.0
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_pipeline_appends_history_on_finish(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    pipeline = Pipeline(root)
+    pipeline.build()
+    with HistoryStore(root / "data" / "history" / "scores.sqlite") as store:
+        assert len(store.latest()) == 5
+
+    bench = root / "data" / "raw" / "benchmarks" / "b3.yaml"
+    _write_yaml(
+        bench, {"model_name_mapping_file": "other.yaml", "results": {"Model C": 5.0}}
+    )
+    pipeline.refresh([bench])
+    pipeline.finish()
+    with HistoryStore(root / "data" / "history" / "scores.sqlite") as store:
+        assert store.trajectory("slug-c")["score"].tolist() == [2.0, 5.0]
+
+
+def test_suggestions_follow_alias_changes_only(tmp_path: Path, monkeypatch) -> None:
+    root = _make_root(tmp_path)
+    pipeline = Pipeline(root, history=False)
+    pipeline.build()
+    calls = []
+    monkeypatch.setattr(
+        update_mappings, "write_suggestions", lambda *args: calls.append(1)
+    )
+    bench = root / "data" / "raw" / "benchmarks" / "b3.yaml"
+
+    _write_yaml(
+        bench, {"model_name_mapping_file": "other.yaml", "results": {"Model C": 6.0}}
+    )
+    pipeline.refresh([bench])
+    assert calls == []
+
+    _write_yaml(
+        bench,
+        {
+            "model_name_mapping_file": "other.yaml",
+            "results": {"Model C": 6.0, "Model E": 1.0},
+        },
+    )
+    pipeline.refresh([bench])
+    assert calls == [1]
@@ -0,0 +1,91 @@
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+# Add scripts_python directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import yaml_io
+from yaml_io import dump_yaml, load_yaml
+
+
+def test_dump_matches_pyyaml_safe_dump() -> None:
+    data = {"Model B": 0.5, "Model A": None, "nested": {"x": [1, 2.5, "y"]}}
+    assert dump_yaml(data) == yaml.safe_dump(data, sort_keys=False)
+    assert yaml.safe_load(dump_yaml(data)) == data
+
+
+def test_cache_skips_parsing_unchanged_files(tmp_path: Path, monkeypatch) -> None:
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "bench.yaml"
+    path.write_text(dump_yaml({"results": {"Model A": 1.0}}))
+
+    calls = []
+    parse = yaml_io.parse_yaml
+    monkeypatch.setattr(yaml_io, "parse_yaml", lambda text: calls.append(1) or parse(text))
+
+    assert load_yaml(path, cache_dir) == {"results": {"Model A": 1.0}}
+    assert load_yaml(path, cache_dir) == {"results": {"Model A": 1.0}}
+    assert len(calls) == 1
+
+    path.write_text(dump_yaml({"results": {"Model A": 2.0, "Model B": 1.0}}))
+    assert load_yaml(path, cache_dir) == {"results": {"Model A": 2.0, "Model B": 1.0}}
+    assert len(calls) == 2
+
+
+def test_cache_invalidated_by_mtime(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "map.yaml"
+    path.write_text("a: 1\n")
+    assert load_yaml(path, cache_dir) == {"a": 1}
+
+    # Same size, different content and mtime.
+    path.write_text("a: 2\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_yaml(path, cache_dir) == {"a": 2}
+
+
+def test_cache_disabled_by_empty_env(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("YAML_CACHE_DIR", "")
+    path = tmp_path / "map.yaml"
+    path.write_text("a: 1\n")
+    assert load_yaml(path) == {"a": 1}
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_prune_drops_orphaned_stale_and_oldest_entries(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"f{i}.yaml"
+        path.write_text(f"a: {i}\n")
+        load_yaml(path, cache_dir)
+        entry = yaml_io._cache_path(cache_dir, path)
+        os.utime(entry, ns=(i * 10**9, i * 10**9))
+        paths.append(path)
+    paths[0].unlink()
+    paths[1].write_text("a: changed\n")
+
+    assert yaml_io.prune_cache(cache_dir, max_entries=1) == 3
+    assert list(cache_dir.iterdir()) == [yaml_io._cache_path(cache_dir, paths[3])]
+    assert load_yaml(paths[3], cache_dir) == {"a": 3}
+
+
+def test_cache_pruned_once_past_max_entries(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(yaml_io, "MAX_ENTRIES", 2)
+    monkeypatch.setattr(yaml_io, "_pruned", set())
+    cache_dir = tmp_path / "cache"
+    for i in range(3):
+        path = tmp_path / f"f{i}.yaml"
+        path.write_text(f"a: {i}\n")
+        load_yaml(path, cache_dir)
+        path.unlink()
+    yaml_io._pruned.clear()
+
+    path = tmp_path / "new.yaml"
+    path.write_text("a: new\n")
+    assert load_yaml(path, cache_dir) == {"a": "new"}
+    assert list(cache_dir.iterdir()) == [yaml_io._cache_path(cache_dir, path)]
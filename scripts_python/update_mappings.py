@@ -1,12 +1,25 @@
+import argparse
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
+import numpy as np
 import pandas as pd
-import yaml
+
+from alias_resolver import AliasResolver
+from alias_suggest import (
+    MIN_CONFIDENCE,
+    SlugIndex,
+    confident,
+    suggest_unmapped,
+    write_report,
+)
+from parallel import parallel_map
+from profiling import Profiler, add_profile_arguments, profiler_from_args
+from yaml_io import dump_yaml, load_yaml
 
 def load_benchmark(bench_file: Path) -> pd.DataFrame:
     """Load benchmark YAML file."""
-    data = yaml.safe_load(bench_file.read_text())
+    data = load_yaml(bench_file)
     model_name_mapping_file = data.get("model_name_mapping_file")
     raw_model_names = set(data.get("results", {}).keys())
     # Include cost data aliases as well so mappings stay in sync
@@ -20,7 +33,7 @@ def load_benchmark(bench_file: Path) -> pd.DataFrame:
 
 def load_mapping(mapping_file: Path) -> pd.DataFrame:
     """Load mapping file."""
-    data = yaml.safe_load(mapping_file.read_text())
+    data = load_yaml(mapping_file)
     df = pd.DataFrame({
         "alias": list(data.keys()),
         "slug": list(data.values()),
@@ -28,42 +41,178 @@ def load_mapping(mapping_file: Path) -> pd.DataFrame:
     })
     return df
 
-def update_all_mappings(bench_dir: Path, mapping_dir: Path) -> None:
-    """Update mapping files for all benchmarks, merging shared files."""
+def write_mapping(task: tuple[Path, Dict[str, Optional[str]]]) -> None:
+    """Write one ``(mapping_file, mapping_dict)`` pair."""
+    mapping_file, mapping_dict = task
+    mapping_file.write_text(dump_yaml(mapping_dict, sort_keys=False))
 
-    bench_df = pd.concat(
-        [load_benchmark(bench_file) for bench_file in bench_dir.glob("*.yaml")]
+def resolve_mappings(bench_df: pd.DataFrame, resolver: AliasResolver) -> pd.DataFrame:
+    """Attach the current slug to every benchmark alias, in output order."""
+    merged_df = bench_df.assign(
+        slug=resolver.resolve(bench_df["model_name_mapping_file"], bench_df["alias"])
     )
-    bench_df = bench_df.drop_duplicates(subset=["alias", "model_name_mapping_file"])
-
-    mapping_df = pd.concat(
-        [load_mapping(mapping_file) for mapping_file in mapping_dir.glob("*.yaml")]
+    # Case-insensitive alias order, ties broken by the alias itself so the
+    # output does not depend on load order.
+    order = np.lexsort(
+        (
+            merged_df["alias"].to_numpy(dtype=str),
+            merged_df["alias"].str.lower().to_numpy(dtype=str),
+        )
     )
-    mapping_df = mapping_df.drop_duplicates(subset=["alias", "model_name_mapping_file"])
+    return merged_df.iloc[order]
 
-    merged_df = pd.merge(bench_df, mapping_df, on=["alias", "model_name_mapping_file"], how="left")
-    merged_df = merged_df.sort_values("alias", key=lambda x: x.str.lower())
-
-    # Write to mapping files
-    for model_name_mapping_file, df in merged_df.groupby("model_name_mapping_file"):
-        mapping_file = mapping_dir / model_name_mapping_file
-        mapping_dict = {
+def mapping_dicts(merged_df: pd.DataFrame) -> Dict[str, Dict[str, Optional[str]]]:
+    """Return the ``alias -> slug`` dict to write for each mapping file."""
+    return {
+        model_name_mapping_file: {
             alias: (None if pd.isna(slug) else slug)
             for alias, slug in zip(df["alias"], df["slug"])
         }
-        mapping_file.write_text(
-            yaml.safe_dump(mapping_dict, sort_keys=False)
+        for model_name_mapping_file, df in merged_df.groupby("model_name_mapping_file")
+    }
+
+def apply_slugs(
+    merged_df: pd.DataFrame, slugs: Dict[str, Dict[str, str]]
+) -> pd.DataFrame:
+    """Set the slug of the aliases in ``slugs`` (keyed by mapping file)."""
+    merged_df = merged_df.copy()
+    for mapping_file, by_alias in slugs.items():
+        in_file = merged_df["model_name_mapping_file"] == mapping_file
+        rows = in_file & merged_df["alias"].isin(list(by_alias))
+        merged_df.loc[rows, "slug"] = merged_df.loc[rows, "alias"].map(by_alias)
+    return merged_df
+
+def write_suggestions(
+    merged_df: pd.DataFrame,
+    mapping_frames: Iterable[pd.DataFrame],
+    mapping_dir: Path,
+    min_confidence: Optional[float] = None,
+) -> Dict[str, Dict[str, str]]:
+    """Write slug suggestions for the unmapped rows of ``merged_df``.
+
+    The report goes to ``mapping-suggestions.yaml`` beside ``mapping_dir``
+    and is removed when every alias is mapped. Returns the suggestions at
+    least ``min_confidence`` confident (none when it is ``None``).
+    """
+    report_path = mapping_dir.parent / "mapping-suggestions.yaml"
+    missing = merged_df[merged_df["slug"].isna()]
+    unmapped = {
+        mapping_file: df["alias"].tolist()
+        for mapping_file, df in missing.groupby("model_name_mapping_file")
+    }
+    if not unmapped:
+        report_path.unlink(missing_ok=True)
+        return {}
+    index = SlugIndex.build(mapping_dir.parent / "models", mapping_frames)
+    suggestions = suggest_unmapped(index, unmapped)
+    applied = {}
+    if min_confidence is not None:
+        applied = confident(suggestions, min_confidence)
+    write_report(report_path, suggestions, applied)
+    return applied
+
+def update_all_mappings(
+    bench_dir: Path,
+    mapping_dir: Path,
+    jobs: int = 1,
+    profiler: Optional[Profiler] = None,
+    min_confidence: Optional[float] = None,
+) -> None:
+    """Update mapping files for all benchmarks, merging shared files.
+
+    ``jobs`` worker processes parse and write files (``0`` for one per CPU).
+    Stages are timed by ``profiler`` when given.
+
+    Candidate slugs for every unmapped alias, from the model configs next to
+    ``mapping_dir`` and the aliases mapped so far (see :mod:`alias_suggest`),
+    are written to ``mapping-suggestions.yaml`` beside ``mapping_dir``. With
+    ``min_confidence`` set, suggestions at least that confident are written
+    to the mapping files instead of ``None``.
+    """
+
+    if profiler is None:
+        profiler = Profiler("update_mappings")
+
+    with profiler.stage("load_benchmarks") as stage:
+        bench_df = pd.concat(
+            parallel_map(load_benchmark, bench_dir.glob("*.yaml"), jobs)
+        )
+        bench_df = bench_df.drop_duplicates(subset=["alias", "model_name_mapping_file"])
+        stage.rows = len(bench_df)
+
+    with profiler.stage("load_mappings") as stage:
+        mapping_frames = parallel_map(load_mapping, mapping_dir.glob("*.yaml"), jobs)
+        resolver = AliasResolver.from_frames(mapping_frames)
+        stage.rows = len(resolver)
+
+    with profiler.stage("resolve_aliases") as stage:
+        merged_df = resolve_mappings(bench_df, resolver)
+        unmapped = resolver.unmapped(
+            merged_df["model_name_mapping_file"], merged_df["alias"]
+        )
+        stage.rows = len(merged_df)
+    for mapping_file, aliases in sorted(unmapped.items()):
+        print(f"{mapping_file}: {len(aliases)} unmapped aliases")
+
+    with profiler.stage("suggest_slugs") as stage:
+        stage.rows = int(merged_df["slug"].isna().sum())
+        applied = write_suggestions(
+            merged_df, mapping_frames, mapping_dir, min_confidence
         )
-    
+        if min_confidence is not None:
+            merged_df = apply_slugs(merged_df, applied)
+            print(f"Applied {sum(map(len, applied.values()))} suggested slugs")
 
+    with profiler.stage("write_mappings") as stage:
+        tasks = [
+            (mapping_dir / model_name_mapping_file, mapping_dict)
+            for model_name_mapping_file, mapping_dict in mapping_dicts(merged_df).items()
+        ]
+        parallel_map(write_mapping, tasks, jobs)
+        stage.rows = len(tasks)
 
-def main() -> None:
-    root = Path(__file__).resolve().parents[1]
+
+def main(
+    jobs: int = 1,
+    profiler: Optional[Profiler] = None,
+    root: Optional[Path] = None,
+    min_confidence: Optional[float] = None,
+) -> None:
+    if root is None:
+        root = Path(__file__).resolve().parents[1]
     bench_dir = root / "data" / "raw" / "benchmarks"
     mapping_dir = root / "data" / "config" / "mappings"
 
-    update_all_mappings(bench_dir, mapping_dir)
+    if profiler is None:
+        profiler = Profiler.create("update_mappings")
+    update_all_mappings(bench_dir, mapping_dir, jobs, profiler, min_confidence)
+    profiler.write()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Sync mapping files with the aliases used by benchmarks."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for parsing and writing files (0: one per CPU)",
+    )
+    parser.add_argument(
+        "--apply-suggestions",
+        type=float,
+        nargs="?",
+        const=MIN_CONFIDENCE,
+        metavar="MIN",
+        help="map unmapped aliases to suggested slugs at least MIN confident "
+        "(default %(const)s)",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    main(
+        jobs=args.jobs,
+        profiler=profiler_from_args("update_mappings", args),
+        min_confidence=args.apply_suggestions,
+    )
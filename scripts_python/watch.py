@@ -0,0 +1,426 @@
+"""Long-running watch mode for ``update_mappings`` and ``process_data``.
+
+``python watch.py`` does one full ``update_mappings`` + ``process_data`` pass,
+then watches ``data/raw/benchmarks``, ``data/config/mappings`` and
+``data/config/models``. Parsed benchmarks, mappings, model configs and (with
+``--als-warm-start``) ALS factors stay in memory. After each debounced burst
+of writes only the changed files are re-parsed, only the mapping files they
+feed are rewritten, and only processed outputs whose rows or cost factor
+changed are rebuilt. The scores are still re-normalized and the ALS solve
+rerun over all rows. The leaderboard with its bootstrap intervals, the
+family rollups and the history entry wait until nothing changed for
+``--settle`` seconds. Once they are written, the files match what running
+both scripts by hand would produce.
+
+The mapping suggestion report is only regenerated when a mapping file, a
+model config or the set of aliases in a benchmark changed. On the
+repository's data, a score change in one benchmark rewrites its processed
+file and the snapshot in about 60 ms. The deferred stages take another
+0.15 s or so.
+
+Changes are picked up with Linux ``inotify`` (through ``ctypes``) or, where
+that is unavailable or ``--polling`` is given, by comparing ``stat`` results
+(see :mod:`file_watch`). If inotify's event queue overflows during a burst,
+every watched file is treated as changed.
+"""
+
+import argparse
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+import process_data
+import update_mappings
+from alias_resolver import AliasResolver
+from als import AlsFactors
+from benchmark_table import BenchmarkData, BenchmarkTable, read_benchmark
+from bootstrap import RESAMPLES
+from families import model_index, read_model_config
+from file_watch import DEBOUNCE, create_watcher
+from history import default_path
+from incremental import write_if_changed
+from yaml_io import dump_yaml
+
+SETTLE = 1.0
+
+
+def _alias_keys(aliases: Optional[pd.DataFrame]) -> Set[tuple[str, str]]:
+    if aliases is None:
+        return set()
+    return set(zip(aliases["alias"], aliases["model_name_mapping_file"]))
+
+
+class Pipeline:
+    """In-memory state of ``update_mappings`` followed by ``process_data``.
+
+    ``refresh`` takes the paths reported by a watcher and brings the mapping
+    files, processed benchmark files and snapshot under ``root`` up to date,
+    returning the files it rewrote. Inputs are re-parsed only when their
+    ``stat`` differs from what was last seen, which also filters out the
+    events caused by the pipeline's own mapping writes. The leaderboard (with
+    its bootstrap), the family rollups and the history append are left
+    pending until ``finish``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        als_warm_start: bool = False,
+        impute_rank: int = 0,
+        resamples: int = RESAMPLES,
+        history: bool = True,
+        history_db: Optional[Path] = None,
+    ) -> None:
+        root = root.resolve()
+        self.bench_dir = root / "data" / "raw" / "benchmarks"
+        self.mapping_dir = root / "data" / "config" / "mappings"
+        self.models_dir = root / "data" / "config" / "models"
+        self.out_dir = root / "data" / "processed" / "benchmarks"
+        self.state_path = root / ".cache" / "process_data" / "als_factors.pkl"
+        self.history_path = None
+        if history:
+            self.history_path = history_db or default_path(root)
+        self.als_warm_start = als_warm_start
+        self.impute_rank = impute_rank
+        self.resamples = resamples
+        self.als_state = AlsFactors.load(self.state_path) if als_warm_start else None
+        # Frames keyed by benchmark stem for process_data and update_mappings,
+        # and by mapping file stem.
+        self.benchmarks: Dict[str, BenchmarkData] = {}
+        self.aliases: Dict[str, pd.DataFrame] = {}
+        self.mappings: Dict[str, pd.DataFrame] = {}
+        self.models: Dict[str, pd.DataFrame] = {}
+        self.stats: Dict[Path, Optional[tuple[int, int]]] = {}
+        self.outputs: Optional[Dict[str, tuple[pd.DataFrame, Optional[float]]]] = None
+        # Long output table and benchmark metadata awaiting ``finish``.
+        self.pending: Optional[tuple[pd.DataFrame, pd.DataFrame]] = None
+
+    def _stat(self, path: Path) -> Optional[tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def build(self) -> List[Path]:
+        """Load every input and run a full pass."""
+        written = self.refresh(
+            [
+                *self.bench_dir.glob("*.yaml"),
+                *self.mapping_dir.glob("*.yaml"),
+                *self.models_dir.glob("*.yaml"),
+            ]
+        )
+        return written + self.finish()
+
+    def refresh(self, paths: Iterable[Path]) -> List[Path]:
+        """Apply changes to ``paths`` and return the files rewritten."""
+        bench_updates = {}
+        mapping_updates = {}
+        model_updates = {}
+        # Parse everything first so a malformed file leaves the state intact.
+        for path in set(paths):
+            stat = self._stat(path)
+            if self.stats.get(path, False) == stat:
+                continue
+            if path.parent == self.bench_dir:
+                bench_updates[path] = (
+                    stat,
+                    read_benchmark(path) if stat else None,
+                    update_mappings.load_benchmark(path) if stat else None,
+                )
+            elif path.parent == self.mapping_dir:
+                mapping_updates[path] = (
+                    stat,
+                    process_data.load_mapping_file(path) if stat else None,
+                )
+            elif path.parent == self.models_dir:
+                model_updates[path] = (stat, read_model_config(path) if stat else None)
+        if not bench_updates and not mapping_updates and not model_updates:
+            return []
+
+        affected = set()
+        # The suggestion report only depends on the aliases, the mapping
+        # files and the model configs, not on scores.
+        suggest = bool(mapping_updates or model_updates)
+        for path, (stat, frame, aliases) in bench_updates.items():
+            old = self.aliases.pop(path.stem, None)
+            if _alias_keys(old) != _alias_keys(aliases):
+                suggest = True
+            if old is not None:
+                affected.update(old["model_name_mapping_file"])
+            self.benchmarks.pop(path.stem, None)
+            if stat is not None:
+                self.benchmarks[path.stem] = frame
+                self.aliases[path.stem] = aliases
+                affected.update(aliases["model_name_mapping_file"])
+            self.stats[path] = stat
+        for path, (stat, frame) in mapping_updates.items():
+            self.mappings.pop(path.stem, None)
+            if stat is not None:
+                self.mappings[path.stem] = frame
+            affected.add(path.name)
+            self.stats[path] = stat
+        for path, (stat, frame) in model_updates.items():
+            self.models.pop(path.stem, None)
+            if stat is not None:
+                self.models[path.stem] = frame
+            self.stats[path] = stat
+
+        written = self._write_mappings(affected)
+        if suggest:
+            self._write_suggestions()
+        return written + self._write_outputs()
+
+    def _write_mappings(self, affected: Set[str]) -> List[Path]:
+        frames = [
+            df[df["model_name_mapping_file"].isin(affected)]
+            for df in self.aliases.values()
+        ]
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            return []
+        bench_df = pd.concat(frames).drop_duplicates(
+            subset=["alias", "model_name_mapping_file"]
+        )
+        # update_mappings keys mapping files by file name, process_data by stem.
+        resolver = AliasResolver.from_frames(
+            self.mappings[Path(name).stem].assign(model_name_mapping_file=name)
+            for name in affected
+            if Path(name).stem in self.mappings
+        )
+        merged_df = update_mappings.resolve_mappings(bench_df, resolver)
+        unmapped = resolver.unmapped(
+            merged_df["model_name_mapping_file"], merged_df["alias"]
+        )
+        for mapping_file, aliases in sorted(unmapped.items()):
+            print(f"{mapping_file}: {len(aliases)} unmapped aliases")
+
+        written = []
+        for name, mapping_dict in update_mappings.mapping_dicts(merged_df).items():
+            path = self.mapping_dir / name
+            if write_if_changed(path, dump_yaml(mapping_dict, sort_keys=False)):
+                written.append(path)
+                self.mappings[path.stem] = process_data.load_mapping_file(path)
+            self.stats[path] = self._stat(path)
+        return written
+
+    def _write_suggestions(self) -> None:
+        frames = [df for df in self.aliases.values() if not df.empty]
+        if not frames:
+            return
+        bench_df = pd.concat(frames).drop_duplicates(
+            subset=["alias", "model_name_mapping_file"]
+        )
+        mapping_frames = [
+            df.assign(model_name_mapping_file=f"{stem}.yaml")
+            for stem, df in self.mappings.items()
+        ]
+        merged_df = update_mappings.resolve_mappings(
+            bench_df, AliasResolver.from_frames(mapping_frames)
+        )
+        update_mappings.write_suggestions(merged_df, mapping_frames, self.mapping_dir)
+
+    def _write_outputs(self) -> List[Path]:
+        # Same order as process_data: the snapshot index follows it, and the
+        # ALS sums (hence the last bits of every factor) depend on row order.
+        bench_names = [path.stem for path in self.bench_dir.glob("*.yaml")]
+        resolver = AliasResolver.from_frames(self.mappings.values())
+        table = BenchmarkTable.from_benchmarks(
+            self.benchmarks[name] for name in bench_names if name in self.benchmarks
+        ).resolve(resolver)
+        benchmarks_df = process_data.normalize_benchmark_scores(
+            table.rows, table.meta["normalization"]
+        )
+        costs, weights = process_data.cost_inputs(benchmarks_df, table.meta)
+        if self.als_warm_start:
+            result = process_data.compute_normalization_factors_sparse(
+                costs,
+                weights,
+                iterations=process_data.ALS_MAX_ITERATIONS,
+                tol=process_data.ALS_TOL,
+                init=self.als_state,
+                canonical=True,
+            )
+            self.als_state = result.state
+        else:
+            result = process_data.compute_normalization_factors_sparse(costs, weights)
+
+        outputs = process_data.write_outputs(
+            benchmarks_df,
+            result.factors.to_dict(),
+            bench_names,
+            self.out_dir,
+            skip_unchanged=True,
+            previous=self.outputs,
+        )
+        self.outputs = outputs.benchmarks
+        self.pending = (outputs.long_df, table.meta)
+        return outputs.written
+
+    def finish(self) -> List[Path]:
+        """Write the pending leaderboard, family rollups and history entry."""
+        if self.pending is None:
+            return []
+        long_df, meta = self.pending
+        models = model_index([self.models[stem] for stem in sorted(self.models)])
+        written = process_data.write_rankings(
+            long_df,
+            meta,
+            models,
+            self.out_dir.parent,
+            skip_unchanged=True,
+            impute_rank=self.impute_rank,
+            resamples=self.resamples,
+            history_path=self.history_path,
+        )
+        self.pending = None
+        return written
+
+    def close(self) -> None:
+        if self.als_warm_start and self.als_state is not None:
+            self.als_state.save(self.state_path)
+
+
+def _report(written: List[Path], start: float) -> None:
+    if written:
+        print(
+            f"Rewrote {len(written)} files in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms: "
+            + ", ".join(p.name for p in written)
+        )
+
+
+def watch(
+    root: Path,
+    polling: bool = False,
+    debounce: float = DEBOUNCE,
+    als_warm_start: bool = False,
+    stop: Optional[threading.Event] = None,
+    impute_rank: int = 0,
+    resamples: int = RESAMPLES,
+    settle: float = SETTLE,
+    history: bool = True,
+    history_db: Optional[Path] = None,
+) -> None:
+    """Run a full pass over ``root``, then keep it up to date until ``stop``.
+
+    Each burst of changes is refreshed right away; the pending leaderboard,
+    family rollups and history entry follow once nothing changed for
+    ``settle`` seconds, so a run of edits pays for the bootstrap once.
+    """
+
+    pipeline = Pipeline(
+        root, als_warm_start, impute_rank, resamples, history, history_db
+    )
+    pipeline.out_dir.mkdir(exist_ok=True)
+    # Start watching before the first pass so no write in between is missed.
+    dirs = [pipeline.bench_dir, pipeline.mapping_dir]
+    if pipeline.models_dir.is_dir():
+        dirs.append(pipeline.models_dir)
+    watcher = create_watcher(dirs, polling)
+    try:
+        start = time.perf_counter()
+        pipeline.build()
+        print(
+            f"Watching {pipeline.bench_dir.parent.parent} with "
+            f"{type(watcher).__name__} (initial pass "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms)"
+        )
+        while stop is None or not stop.is_set():
+            changed = watcher.poll(settle if pipeline.pending else 0.5)
+            if not changed:
+                if pipeline.pending:
+                    start = time.perf_counter()
+                    _report(pipeline.finish(), start)
+                continue
+            # Debounce: keep collecting until the directory goes quiet.
+            while more := watcher.poll(debounce):
+                changed |= more
+            start = time.perf_counter()
+            try:
+                written = pipeline.refresh(changed)
+            except Exception as e:
+                print(f"Failed to process {sorted(p.name for p in changed)}: {e}")
+                continue
+            _report(written, start)
+    finally:
+        watcher.close()
+        try:
+            pipeline.finish()
+        finally:
+            pipeline.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keep mapping files and processed outputs up to date."
+    )
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="poll the directories instead of using inotify",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEBOUNCE,
+        help="seconds without writes that end a burst (default %(default)s)",
+    )
+    parser.add_argument(
+        "--als-warm-start",
+        action="store_true",
+        help="solve cost factors to convergence, warm-started in memory",
+    )
+    parser.add_argument(
+        "--impute-rank",
+        type=int,
+        default=0,
+        metavar="K",
+        help="rank the leaderboard with missing scores imputed by a rank-K fit",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=RESAMPLES,
+        metavar="N",
+        help="bootstrap resamples for leaderboard intervals, 0 to skip "
+        "(default %(default)s)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=SETTLE,
+        help="seconds without changes before the leaderboard, family rollups "
+        "and history are updated (default %(default)s)",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="do not append to the score history",
+    )
+    parser.add_argument(
+        "--history-db",
+        type=Path,
+        metavar="PATH",
+        help="score history database (default: $HISTORY_DB or "
+        "data/history/scores.sqlite)",
+    )
+    args = parser.parse_args()
+    try:
+        watch(
+            Path(__file__).resolve().parents[1],
+            polling=args.polling,
+            debounce=args.debounce,
+            als_warm_start=args.als_warm_start,
+            impute_rank=args.impute_rank,
+            resamples=args.bootstrap,
+            settle=args.settle,
+            history=not args.no_history,
+            history_db=args.history_db,
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,127 @@
+"""Shared YAML loading and dumping for the Python scripts.
+
+Uses the libyaml backed ``CSafeLoader``/``CSafeDumper`` when PyYAML was built
+with them and falls back to the pure-Python classes otherwise. Parsed files are
+additionally cached on disk as pickles keyed by path, ``mtime`` and size, so a
+file that has not changed since it was last read is never parsed again.
+
+The cache lives in ``.cache/yaml`` at the repository root. Set
+``YAML_CACHE_DIR`` to move it, or to an empty string to disable it. The first
+time a process adds an entry to a cache holding more than
+:data:`MAX_ENTRIES`, entries whose file is gone or has changed are dropped,
+then the least recently written ones until :data:`MAX_ENTRIES` remain.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+MAX_ENTRIES = 1024
+# Cache directories already pruned by this process.
+_pruned: set = set()
+
+
+def _default_cache_dir() -> Optional[Path]:
+    env = os.environ.get("YAML_CACHE_DIR")
+    if env is not None:
+        return Path(env) if env else None
+    return Path(__file__).resolve().parents[1] / ".cache" / "yaml"
+
+
+def parse_yaml(text: str) -> Any:
+    """Parse ``text`` with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def dump_yaml(data: Any, sort_keys: bool = False) -> str:
+    """Serialize ``data`` with the fastest available safe dumper."""
+    return yaml.dump(data, Dumper=SafeDumper, sort_keys=sort_keys)
+
+
+def _cache_path(cache_dir: Path, path: Path) -> Path:
+    key = hashlib.sha256(str(path.resolve()).encode()).hexdigest()
+    return cache_dir / f"{key}.pkl"
+
+
+def _read_header(f) -> tuple[str, tuple[int, int]]:
+    # Each entry is two pickles: ``(source path, stamp)``, then the data, so
+    # pruning reads only the small header.
+    return pickle.load(f)
+
+
+def prune_cache(cache_dir: Path, max_entries: int = MAX_ENTRIES) -> int:
+    """Trim ``cache_dir`` as described in the module docstring.
+
+    Returns the number of entries removed.
+    """
+
+    entries = []
+    removed = 0
+    for entry_path in cache_dir.glob("*.pkl"):
+        try:
+            with entry_path.open("rb") as f:
+                source, stamp = _read_header(f)
+            stat = os.stat(source)
+            current = stat.st_mtime_ns == stamp[0] and stat.st_size == stamp[1]
+            mtime = entry_path.stat().st_mtime_ns
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            current = False
+        if not current:
+            entry_path.unlink(missing_ok=True)
+            removed += 1
+            continue
+        entries.append((mtime, entry_path))
+    entries.sort()
+    for _, entry_path in entries[: max(0, len(entries) - max_entries)]:
+        entry_path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def load_yaml(path: Path, cache_dir: Optional[Path] = None) -> Any:
+    """Return the parsed contents of ``path``.
+
+    ``cache_dir`` defaults to the directory described in the module docstring.
+    Entries are invalidated whenever the file's ``mtime`` or size changes.
+    """
+
+    if cache_dir is None:
+        cache_dir = _default_cache_dir()
+    if cache_dir is None:
+        return parse_yaml(path.read_text())
+
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry_path = _cache_path(cache_dir, path)
+    try:
+        with entry_path.open("rb") as f:
+            if _read_header(f)[1] == stamp:
+                return pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    data = parse_yaml(path.read_text())
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if cache_dir not in _pruned:
+        _pruned.add(cache_dir)
+        if sum(1 for _ in cache_dir.glob("*.pkl")) > MAX_ENTRIES:
+            prune_cache(cache_dir)
+    # Write through a temporary file so concurrent readers never see a
+    # partially written entry.
+    tmp = entry_path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        header = (str(path.resolve()), stamp)
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, entry_path)
+    return data